@@ -1,5 +1,7 @@
 """Configuration management for Finalyzer."""
 
+import os
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -39,19 +41,19 @@ class Settings(BaseSettings):
         extra="ignore",  # Ignore extra environment variables
     )
 
-    @property
+    @cached_property
     def db_path(self) -> Path:
         """Get the SQLite database path."""
         suffix = "dev" if self.dev_mode else "prod"
         return self.data_dir / f"finalyzer_{suffix}.db"
 
-    @property
+    @cached_property
     def chroma_path(self) -> Path:
         """Get the ChromaDB storage path."""
         suffix = "dev" if self.dev_mode else "prod"
         return self.data_dir / f"chroma_{suffix}"
 
-    @property
+    @cached_property
     def uploads_path(self) -> Path:
         """Get the uploads directory path."""
         return self.data_dir / "uploads"
@@ -64,47 +66,64 @@ class Settings(BaseSettings):
 
     def log_config(self) -> None:
         """Log current configuration with sensitive values redacted."""
-        import os
-
-        print("\n" + "=" * 60)
-        print("📋 CONFIGURATION LOADED")
-        print("=" * 60)
-
+        cwd, env_file_exists, env_file_llm_line = _env_file_info()
         # Check if values come from environment or .env file
         env_llm_provider = os.getenv("LLM_PROVIDER")
-        env_file_path = os.path.join(os.getcwd(), ".env")
-
-        print(f"Working Directory:   {os.getcwd()}")
-        print(f".env file exists:    {os.path.exists(env_file_path)}")
-
-        # Read .env file to show what it contains
-        if os.path.exists(env_file_path):
-            with open(env_file_path) as f:
-                for line in f:
-                    if line.startswith("LLM_PROVIDER"):
-                        print(f".env file contains:  {line.strip()}")
-                        break
 
+        lines = [
+            "",
+            "=" * 60,
+            "📋 CONFIGURATION LOADED",
+            "=" * 60,
+            f"Working Directory:   {cwd}",
+            f".env file exists:    {env_file_exists}",
+        ]
+        if env_file_llm_line:
+            lines.append(f".env file contains:  {env_file_llm_line}")
         if env_llm_provider:
-            print(f"⚠️  ENV VAR override:   LLM_PROVIDER={env_llm_provider}")
-        print("-" * 60)
-
-        print(f"LLM Provider:        {self.llm_provider}")
-        print(
-            f"OpenAI API Key:      {'✓ Set (' + self.openai_api_key[:8] + '...' + self.openai_api_key[-4:] + ')' if self.openai_api_key else '✗ Not set'}"
-        )
-        print(f"OpenAI Model:        {self.openai_model}")
-        print(f"Ollama Host:         {self.ollama_host}")
-        print(f"Ollama Model:        {self.ollama_model}")
-        print(f"Embedding Model:     {self.embedding_model}")
-        print(f"Dev Mode:            {self.dev_mode}")
-        print(f"Use Generic Parser:  {self.use_generic_parser}")
-        print(f"Data Directory:      {self.data_dir}")
-        print(f"Database:            {self.db_path}")
-        print(f"Vector Store:        {self.chroma_path}")
-        print(f"API Host:            {self.api_host}:{self.api_port}")
-        print("=" * 60 + "\n")
+            lines.append(f"⚠️  ENV VAR override:   LLM_PROVIDER={env_llm_provider}")
+        lines += [
+            "-" * 60,
+            f"LLM Provider:        {self.llm_provider}",
+            f"OpenAI API Key:      {'✓ Set (' + self.openai_api_key[:8] + '...' + self.openai_api_key[-4:] + ')' if self.openai_api_key else '✗ Not set'}",
+            f"OpenAI Model:        {self.openai_model}",
+            f"Ollama Host:         {self.ollama_host}",
+            f"Ollama Model:        {self.ollama_model}",
+            f"Embedding Model:     {self.embedding_model}",
+            f"Dev Mode:            {self.dev_mode}",
+            f"Use Generic Parser:  {self.use_generic_parser}",
+            f"Data Directory:      {self.data_dir}",
+            f"Database:            {self.db_path}",
+            f"Vector Store:        {self.chroma_path}",
+            f"API Host:            {self.api_host}:{self.api_port}",
+            "=" * 60,
+            "",
+        ]
+        print("\n".join(lines))
+
+
+@cache
+def _env_file_info() -> tuple[str, bool, str | None]:
+    """Get the working directory, whether it has a .env file, and the file's LLM_PROVIDER line."""
+    cwd = os.getcwd()
+    env_file_path = os.path.join(cwd, ".env")
+    llm_line = None
+    try:
+        with open(env_file_path) as f:
+            for line in f:
+                if line.startswith("LLM_PROVIDER"):
+                    llm_line = line.strip()
+                    break
+    except FileNotFoundError:
+        return cwd, False, None
+    return cwd, True, llm_line
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process; modules share the resulting instance as `settings`."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
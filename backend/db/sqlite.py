@@ -1,14 +1,21 @@
 """SQLite database operations for Finalyzer."""
 
+import atexit
+import json
 import sqlite3
-from collections.abc import Generator
+import threading
+from collections.abc import Generator, Iterator, Sequence
 from contextlib import contextmanager
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from typing import cast
 from uuid import UUID
 
 from backend.config import settings
 from backend.models import (
+    CATEGORIES_BY_VALUE,
+    SOURCES_BY_VALUE,
     Transaction,
     TransactionCategory,
     TransactionSource,
@@ -31,8 +38,14 @@ CREATE TABLE IF NOT EXISTS transactions (
     created_at TEXT DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
-CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
+-- Covers the dashboard aggregations over a date range without reading table rows,
+-- replacing the old date-only index
+DROP INDEX IF EXISTS idx_transactions_date;
+CREATE INDEX IF NOT EXISTS idx_transactions_date_covering ON transactions(date, amount, category, source);
+-- (category, date) also serves category-only lookups, replacing the old single-column index
+DROP INDEX IF EXISTS idx_transactions_category;
+CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions(category, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_untagged ON transactions(date) WHERE tags IS NULL OR tags = '';
 CREATE INDEX IF NOT EXISTS idx_transactions_source ON transactions(source);
 CREATE INDEX IF NOT EXISTS idx_transactions_hash ON transactions(transaction_hash);
 
@@ -46,8 +59,250 @@ CREATE TABLE IF NOT EXISTS uploaded_files (
 );
 
 CREATE INDEX IF NOT EXISTS idx_uploaded_files_hash ON uploaded_files(file_hash);
+
+-- One row per (tag, transaction) so tag lookups are index seeks
+CREATE TABLE IF NOT EXISTS transaction_tags (
+    tag TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    PRIMARY KEY (tag, transaction_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_transaction_tags_txn ON transaction_tags(transaction_id);
+
+-- Embedding vectors keyed by a hash of (model, embed text), stored as packed float32
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    text_hash BLOB PRIMARY KEY,
+    vector BLOB NOT NULL
+) WITHOUT ROWID;
+
+-- Full-text index over description/tags. The trigram tokenizer keeps the
+-- case-insensitive substring semantics of the old LIKE '%term%' search.
+CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+    description, tags, content='transactions', content_rowid='rowid', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+    INSERT INTO transactions_fts(rowid, description, tags) VALUES (new.rowid, new.description, new.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+    INSERT INTO transactions_fts(transactions_fts, rowid, description, tags)
+    VALUES ('delete', old.rowid, old.description, old.tags);
+END;
+
+CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, tags ON transactions BEGIN
+    INSERT INTO transactions_fts(transactions_fts, rowid, description, tags)
+    VALUES ('delete', old.rowid, old.description, old.tags);
+    INSERT INTO transactions_fts(rowid, description, tags) VALUES (new.rowid, new.description, new.tags);
+END;
+"""
+
+# Column order every transaction SELECT uses; _row_to_transaction unpacks rows positionally
+TRANSACTION_COLUMNS = (
+    "id",
+    "source",
+    "source_file_hash",
+    "transaction_hash",
+    "date",
+    "description",
+    "amount",
+    "category",
+    "raw_category",
+    "tags",
+)
+
+# Statements reused across calls. Built once so repeated calls pass identical SQL text
+# and hit the connection's prepared-statement cache.
+SELECT_TRANSACTIONS = f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions"
+INSERT_TRANSACTION = (
+    f"INSERT INTO transactions ({', '.join(TRANSACTION_COLUMNS)}) VALUES ({', '.join('?' * len(TRANSACTION_COLUMNS))})"
+)
+INSERT_TRANSACTION_OR_IGNORE = INSERT_TRANSACTION.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+SELECT_UNTAGGED = f"{SELECT_TRANSACTIONS} WHERE tags IS NULL OR tags = '' LIMIT ?"
+SELECT_UNCATEGORIZED = f"{SELECT_TRANSACTIONS} WHERE category IS NULL LIMIT ?"
+SELECT_BY_ID = f"{SELECT_TRANSACTIONS} WHERE id = ?"
+SELECT_BY_IDS = f"{SELECT_TRANSACTIONS} WHERE id IN (SELECT value FROM json_each(?)) ORDER BY date DESC"
+SELECT_BY_IDS_WITH_DESCRIPTION = SELECT_BY_IDS.replace(" ORDER BY", " AND description LIKE ? ORDER BY", 1)
+YEARLY_SPENDING = """
+    SELECT CAST(substr(date, 1, 4) AS INTEGER) AS year, COUNT(*), COALESCE(-SUM(MIN(amount, 0)), 0.0)
+    FROM transactions
+    WHERE {condition}
+    GROUP BY year
+    ORDER BY year
+"""
+CATEGORY_COUNTS = """
+    SELECT COALESCE(category, 'Uncategorized') AS category, COUNT(*)
+    FROM transactions
+    WHERE {condition}
+    GROUP BY 1
+    ORDER BY 1
+"""
+DESCRIPTION_FTS_CONDITION = "rowid IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)"
+DESCRIPTION_LIKE_CONDITION = "description LIKE ?"
+SELECT_NEWEST_BY_DESCRIPTION_FTS = (
+    f"{SELECT_TRANSACTIONS} WHERE {DESCRIPTION_FTS_CONDITION} ORDER BY date DESC, id DESC LIMIT ?"
+)
+SELECT_NEWEST_BY_DESCRIPTION_LIKE = (
+    f"{SELECT_TRANSACTIONS} WHERE {DESCRIPTION_LIKE_CONDITION} ORDER BY date DESC, id DESC LIMIT ?"
+)
+SELECT_OLDEST_BY_DESCRIPTION_FTS = SELECT_NEWEST_BY_DESCRIPTION_FTS.replace("date DESC, id DESC", "date, id")
+SELECT_OLDEST_BY_DESCRIPTION_LIKE = SELECT_NEWEST_BY_DESCRIPTION_LIKE.replace("date DESC, id DESC", "date, id")
+SELECT_YEARLY_SPENDING_FTS = YEARLY_SPENDING.format(condition=DESCRIPTION_FTS_CONDITION)
+SELECT_YEARLY_SPENDING_LIKE = YEARLY_SPENDING.format(condition=DESCRIPTION_LIKE_CONDITION)
+SELECT_CATEGORY_COUNTS_FTS = CATEGORY_COUNTS.format(condition=DESCRIPTION_FTS_CONDITION)
+SELECT_CATEGORY_COUNTS_LIKE = CATEGORY_COUNTS.format(condition=DESCRIPTION_LIKE_CONDITION)
+INSERT_TAG = "INSERT OR IGNORE INTO transaction_tags (tag, transaction_id) VALUES (?, ?)"
+
+# Dashboard aggregations. Each takes a (start, end) ISO date range; open ends are
+# filled in by _date_bounds so the statement text never changes.
+SELECT_OVERVIEW = """
+    SELECT COUNT(*), COALESCE(-SUM(MIN(amount, 0)), 0.0), COALESCE(SUM(MAX(amount, 0)), 0.0),
+           MIN(date), MAX(date), COUNT(DISTINCT COALESCE(category, 'Uncategorized')), COUNT(DISTINCT source)
+    FROM transactions
+    WHERE date BETWEEN ? AND ?
+"""
+SELECT_MONTHLY_TOTALS = """
+    SELECT substr(date, 1, 7) AS month, COALESCE(-SUM(MIN(amount, 0)), 0.0),
+           COALESCE(SUM(MAX(amount, 0)), 0.0), COUNT(*)
+    FROM transactions
+    WHERE date BETWEEN ? AND ?
+    GROUP BY month
+    ORDER BY month
+"""
+SELECT_MONTHLY_CATEGORY_SPENDING = """
+    SELECT substr(date, 1, 7) AS month, COALESCE(category, 'Uncategorized'), -SUM(amount)
+    FROM transactions
+    WHERE date BETWEEN ? AND ? AND amount < 0
+    GROUP BY month, 2
+    ORDER BY month
+"""
+SELECT_YEARLY_TOTALS = """
+    SELECT CAST(substr(date, 1, 4) AS INTEGER) AS year, COALESCE(-SUM(MIN(amount, 0)), 0.0),
+           COALESCE(SUM(MAX(amount, 0)), 0.0), COUNT(*)
+    FROM transactions
+    GROUP BY year
+    ORDER BY year DESC
+"""
+SELECT_SOURCE_SPENDING = """
+    SELECT source, -SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE date BETWEEN ? AND ? AND amount < 0
+    GROUP BY source
+"""
+SELECT_DAILY_SPENDING = """
+    SELECT date, -SUM(amount)
+    FROM transactions
+    WHERE date BETWEEN ? AND ? AND amount < 0
+    GROUP BY date
 """
 
+SELECT_SPENDING_BY_DESCRIPTION = """
+    SELECT description, -SUM(amount), COUNT(*)
+    FROM transactions
+    WHERE date BETWEEN ? AND ? AND amount < 0
+    GROUP BY description
+"""
+
+
+@lru_cache(maxsize=32)
+def _filtered_transactions_query(has_start: bool, has_end: bool, has_category: bool, has_source: bool) -> str:
+    """Build the get_all_transactions query for one combination of filters."""
+    conditions = []
+    if has_start:
+        conditions.append("date >= ?")
+    if has_end:
+        conditions.append("date <= ?")
+    if has_category:
+        conditions.append("category = ?")
+    if has_source:
+        conditions.append("source = ?")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"{SELECT_TRANSACTIONS}{where} ORDER BY date DESC LIMIT ?"
+
+
+@lru_cache(maxsize=8)
+def _search_transactions_query(use_fts: bool, has_category: bool, has_after: bool = False) -> str:
+    """
+    Build the search query for a trigram or LIKE match, optionally within one category.
+
+    Results are ordered by (date, id) descending; has_after resumes after a given (date, id) key.
+    """
+    if use_fts:
+        where = "rowid IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)"
+    else:
+        where = "(description LIKE ? OR tags LIKE ?)"
+    if has_category:
+        where += " AND category = ?"
+    if has_after:
+        where += " AND (date, id) < (?, ?)"
+    return f"{SELECT_TRANSACTIONS} WHERE {where} ORDER BY date DESC, id DESC LIMIT ?"
+
+
+@lru_cache(maxsize=4)
+def _spending_summary_query(has_start: bool, has_end: bool) -> str:
+    """Build the get_spending_summary query for one combination of date bounds."""
+    conditions = ["amount < 0"]
+    if has_start:
+        conditions.append("date >= ?")
+    if has_end:
+        conditions.append("date <= ?")
+    return f"""
+        SELECT COALESCE(category, 'Uncategorized') AS category, ABS(SUM(amount)) AS total
+        FROM transactions
+        WHERE {" AND ".join(conditions)}
+        GROUP BY 1
+    """
+
+
+@lru_cache(maxsize=16)
+def _search_any_query(has_fts: bool, like_term_count: int) -> str:
+    """Build the search_transactions_any query for one trigram MATCH plus LIKE scans for short terms."""
+    conditions = ["rowid IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)"] if has_fts else []
+    conditions += ["description LIKE ? OR tags LIKE ?"] * like_term_count
+    return f"{SELECT_TRANSACTIONS} WHERE {' OR '.join(conditions)} ORDER BY date DESC, id DESC LIMIT ?"
+
+
+# Bumped whenever _init_db gains a migration step; stored in PRAGMA user_version
+SCHEMA_VERSION = 3
+
+# Trigram FTS can only match terms of at least this many characters
+FTS_MIN_TERM_LENGTH = 3
+
+# Connection tuning applied at startup: WAL lets readers run alongside a
+# writer and needs a single fsync per commit with synchronous=NORMAL.
+PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+
+def _date_bounds(start_date: date | None, end_date: date | None) -> tuple[str, str]:
+    """Get an inclusive ISO date range for BETWEEN, treating missing bounds as unbounded."""
+    return (
+        start_date.isoformat() if start_date else "0000-01-01",
+        end_date.isoformat() if end_date else "9999-12-31",
+    )
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote a search term as a single FTS5 phrase so operators in it are matched literally."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _description_match(search_term: str) -> tuple[bool, str]:
+    """
+    Get (use_fts, parameter) for matching the term anywhere in the description.
+
+    Terms too short for the trigram index use a LIKE pattern instead of a column-filtered phrase.
+    """
+    if len(search_term) < FTS_MIN_TERM_LENGTH:
+        return False, f"%{search_term}%"
+    return True, f"description : {_fts_phrase(search_term)}"
+
 
 class Database:
     """SQLite database manager."""
@@ -55,49 +310,120 @@ class Database:
     def __init__(self, db_path: Path | None = None):
         self.db_path = db_path or settings.db_path
         settings.ensure_directories()
+        # Single long-lived connection shared by all methods. Autocommit mode
+        # (isolation_level=None) so statements never leave an implicit
+        # transaction open; access is serialized with a lock.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, cached_statements=512)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Lazily loaded on first get_transaction_count, then kept current by the insert methods
+        self._transaction_count: int | None = None
+        atexit.register(self.close)
         self._init_db()
 
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            try:
+                # Refresh planner statistics that have drifted during this session
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.ProgrammingError:
+                # Already closed
+                pass
+            self._conn.close()
+
     def _init_db(self) -> None:
-        """Initialize the database schema."""
+        """Initialize the database schema and apply pending migrations."""
         with self._get_connection() as conn:
+            conn.executescript(PRAGMAS)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+            if version < 1:
+                # Migration 1: add tags column to databases created before tagging.
+                # Runs before SCHEMA, whose indexes and triggers reference the column.
+                try:
+                    conn.execute("ALTER TABLE transactions ADD COLUMN tags TEXT")
+                except sqlite3.OperationalError:
+                    # Column already exists, or the table hasn't been created yet
+                    pass
+
+            if version < 3:
+                # Migration 3: tags were stored comma-joined, which split tags containing commas
+                self._convert_tags_to_json(conn)
+
             conn.executescript(SCHEMA)
-            # Migration: add tags column if it doesn't exist
-            try:
-                conn.execute("ALTER TABLE transactions ADD COLUMN tags TEXT")
-                conn.commit()
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
-            conn.commit()
+
+            if version < 2:
+                # Migration 2: index transactions written before the FTS/tag tables existed
+                self._backfill_search_indexes(conn)
+
+            if version < SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            # Collect planner statistics once so the composite/partial indexes get picked
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+                conn.execute("ANALYZE")
+
+    def _backfill_search_indexes(self, conn: sqlite3.Connection) -> None:
+        """Populate the FTS and tag tables from existing transactions."""
+        conn.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+        cursor = conn.execute("SELECT id, tags FROM transactions WHERE tags IS NOT NULL AND tags != ''")
+        conn.executemany(
+            INSERT_TAG,
+            [(tag, row["id"]) for row in cursor.fetchall() for tag in json.loads(row["tags"])],
+        )
+
+    @staticmethod
+    def _convert_tags_to_json(conn: sqlite3.Connection) -> None:
+        """Rewrite comma-joined tag strings as JSON arrays."""
+        try:
+            cursor = conn.execute("SELECT id, tags FROM transactions WHERE tags != '' AND tags NOT LIKE '[%'")
+        except sqlite3.OperationalError:
+            # Table hasn't been created yet
+            return
+        conn.executemany(
+            "UPDATE transactions SET tags = ? WHERE id = ?",
+            [(json.dumps(row["tags"].split(",")), row["id"]) for row in cursor.fetchall()],
+        )
 
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Get the shared database connection, holding the lock for the duration."""
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Get the shared connection inside an explicit transaction, rolled back on error."""
+        with self._get_connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def file_exists(self, file_hash: str) -> bool:
         """Check if a file with this hash has already been uploaded."""
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT 1 FROM uploaded_files WHERE file_hash = ?", (file_hash,))
-            return cursor.fetchone() is not None
+            cursor = conn.execute("SELECT EXISTS (SELECT 1 FROM uploaded_files WHERE file_hash = ?)", (file_hash,))
+            return bool(cursor.fetchone()[0])
 
     def transaction_exists(self, transaction_hash: str) -> bool:
         """Check if a transaction with this hash already exists."""
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT 1 FROM transactions WHERE transaction_hash = ?", (transaction_hash,))
-            return cursor.fetchone() is not None
+            cursor = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM transactions WHERE transaction_hash = ?)", (transaction_hash,)
+            )
+            return bool(cursor.fetchone()[0])
 
-    def add_uploaded_file(self, uploaded_file: UploadedFile) -> None:
-        """Record an uploaded file."""
+    def add_uploaded_file(self, uploaded_file: UploadedFile) -> bool:
+        """Record an uploaded file. Returns True if added, False if the file hash was already recorded."""
         with self._get_connection() as conn:
-            conn.execute(
+            cursor = conn.execute(
                 """
-                INSERT INTO uploaded_files
+                INSERT OR IGNORE INTO uploaded_files
                 (id, filename, file_hash, source, transaction_count, uploaded_at)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
@@ -110,47 +436,44 @@ class Database:
                     uploaded_file.uploaded_at,
                 ),
             )
-            conn.commit()
+            return cursor.rowcount == 1
 
     def add_transaction(self, transaction: Transaction) -> bool:
         """Add a transaction. Returns True if added, False if duplicate."""
-        with self._get_connection() as conn:
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO transactions (id, source, source_file_hash,
-                    transaction_hash, date, description, amount, category,
-                    raw_category, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        str(transaction.id),
-                        transaction.source.value,
-                        transaction.source_file_hash,
-                        transaction.transaction_hash,
-                        transaction.date.isoformat(),
-                        transaction.description,
-                        transaction.amount,
-                        transaction.category.value if transaction.category else None,
-                        transaction.raw_category,
-                        ",".join(transaction.tags) if transaction.tags else None,
-                    ),
-                )
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # Duplicate transaction_hash
-                return False
+        try:
+            with self._transaction() as conn:
+                conn.execute(INSERT_TRANSACTION, self._transaction_to_row(transaction))
+                self._write_tags(conn, str(transaction.id), transaction.tags)
+                # Updated before the lock is released, so a concurrent first count can't include this row twice
+                if self._transaction_count is not None:
+                    self._transaction_count += 1
+        except sqlite3.IntegrityError:
+            # Duplicate transaction_hash
+            return False
+        return True
 
     def add_transactions_batch(self, transactions: list[Transaction]) -> tuple[int, int]:
-        """Add multiple transactions. Returns (added_count, skipped_count)."""
-        added = 0
-        skipped = 0
-        for txn in transactions:
-            if self.add_transaction(txn):
-                added += 1
-            else:
-                skipped += 1
-        return added, skipped
+        """Add multiple transactions in a single transaction. Returns (added_count, skipped_count)."""
+        if not transactions:
+            return 0, 0
+
+        rows = [self._transaction_to_row(txn) for txn in transactions]
+        with self._transaction() as conn:
+            # OR IGNORE skips duplicates on the UNIQUE transaction_hash
+            cursor = conn.executemany(INSERT_TRANSACTION_OR_IGNORE, rows)
+            added = cursor.rowcount
+            # Only rows that were actually inserted get tag entries
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO transaction_tags (tag, transaction_id)
+                SELECT ?, id FROM transactions WHERE id = ?
+                """,
+                [(tag, str(txn.id)) for txn in transactions for tag in txn.tags],
+            )
+            # Updated before the lock is released, so a concurrent first count can't include these rows twice
+            if self._transaction_count is not None:
+                self._transaction_count += added
+        return added, len(rows) - added
 
     def update_transaction_category(self, transaction_id: UUID, category: TransactionCategory) -> None:
         """Update a transaction's category."""
@@ -163,65 +486,74 @@ class Database:
 
     def update_transaction_tags(self, transaction_id: UUID, tags: list[str]) -> None:
         """Update a transaction's tags."""
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 "UPDATE transactions SET tags = ? WHERE id = ?",
-                (",".join(tags) if tags else None, str(transaction_id)),
+                (json.dumps(tags) if tags else None, str(transaction_id)),
             )
-            conn.commit()
+            conn.execute("DELETE FROM transaction_tags WHERE transaction_id = ?", (str(transaction_id),))
+            self._write_tags(conn, str(transaction_id), tags)
+
+    def update_categories_batch(self, transactions: list[Transaction]) -> None:
+        """Write the category of each transaction in a single database transaction."""
+        if not transactions:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE transactions SET category = ? WHERE id = ?",
+                [(txn.category.value if txn.category else None, str(txn.id)) for txn in transactions],
+            )
+
+    def update_tags_batch(self, transactions: list[Transaction]) -> None:
+        """Write the tags of each transaction in a single database transaction."""
+        if not transactions:
+            return
+        ids = [(str(txn.id),) for txn in transactions]
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE transactions SET tags = ? WHERE id = ?",
+                [(json.dumps(txn.tags) if txn.tags else None, str(txn.id)) for txn in transactions],
+            )
+            conn.executemany("DELETE FROM transaction_tags WHERE transaction_id = ?", ids)
+            conn.executemany(INSERT_TAG, [(tag, str(txn.id)) for txn in transactions for tag in txn.tags])
+
+    @staticmethod
+    def _write_tags(conn: sqlite3.Connection, transaction_id: str, tags: list[str]) -> None:
+        """Insert tag rows for a transaction into the tag lookup table."""
+        if tags:
+            conn.executemany(INSERT_TAG, [(tag, transaction_id) for tag in tags])
 
     def get_transactions_without_tags(self, limit: int = 100) -> list[Transaction]:
         """Get transactions that haven't been tagged yet."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions
-                WHERE tags IS NULL OR tags = ''
-                LIMIT ?
-                """,
-                (limit,),
-            )
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            cursor = conn.execute(SELECT_UNTAGGED, (limit,))
+            return list(self._iter_transactions(cursor))
 
     def search_by_tags(self, tags: list[str], limit: int = 100) -> list[Transaction]:
-        """Search transactions by tags."""
+        """Search transactions having any of the given tags."""
         if not tags:
             return []
-        # Build OR conditions for each tag
-        conditions = " OR ".join(["tags LIKE ?" for _ in tags])
-        params: list[str | int] = [f"%{tag}%" for tag in tags]
+        placeholders = ",".join("?" * len(tags))
+        params: list[str | int] = [tag.lower() for tag in tags]
         params.append(limit)
 
         with self._get_connection() as conn:
             cursor = conn.execute(
                 f"""
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions
-                WHERE {conditions}
+                {SELECT_TRANSACTIONS}
+                WHERE id IN (SELECT transaction_id FROM transaction_tags WHERE tag IN ({placeholders}))
                 ORDER BY date DESC
                 LIMIT ?
                 """,
                 params,
             )
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            return list(self._iter_transactions(cursor))
 
     def get_transactions_without_category(self, limit: int = 100) -> list[Transaction]:
         """Get transactions that haven't been categorized yet."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions
-                WHERE category IS NULL
-                LIMIT ?
-                """,
-                (limit,),
-            )
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            cursor = conn.execute(SELECT_UNCATEGORIZED, (limit,))
+            return list(self._iter_transactions(cursor))
 
     def get_all_transactions(
         self,
@@ -232,101 +564,201 @@ class Database:
         limit: int = 1000,
     ) -> list[Transaction]:
         """Get transactions with optional filters."""
-        query = """
-            SELECT id, source, source_file_hash, transaction_hash, date,
-                   description, amount, category, raw_category, tags
-            FROM transactions WHERE 1=1
-        """
+        query = _filtered_transactions_query(bool(start_date), bool(end_date), bool(category), bool(source))
         params: list = []
-
         if start_date:
-            query += " AND date >= ?"
             params.append(start_date.isoformat())
         if end_date:
-            query += " AND date <= ?"
             params.append(end_date.isoformat())
         if category:
-            query += " AND category = ?"
             params.append(category.value)
         if source:
-            query += " AND source = ?"
             params.append(source.value)
-
-        query += " ORDER BY date DESC LIMIT ?"
         params.append(limit)
 
         with self._get_connection() as conn:
             cursor = conn.execute(query, params)
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            return list(self._iter_transactions(cursor))
+
+    def search_transactions(
+        self, search_term: str, limit: int = 100, category: TransactionCategory | None = None
+    ) -> list[Transaction]:
+        """Search transactions by description or tags (case-insensitive substring match)."""
+        # Terms too short for the trigram index fall back to a table scan
+        use_fts = len(search_term) >= FTS_MIN_TERM_LENGTH
+        params: list[str | int] = [_fts_phrase(search_term)] if use_fts else [f"%{search_term}%"] * 2
+        if category:
+            params.append(category.value)
+        params.append(limit)
 
-    def search_transactions(self, search_term: str, limit: int = 100) -> list[Transaction]:
-        """Search transactions by description or tags."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions
-                WHERE description LIKE ? OR tags LIKE ?
-                ORDER BY date DESC
-                LIMIT ?
-                """,
-                (f"%{search_term}%", f"%{search_term}%", limit),
-            )
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            cursor = conn.execute(_search_transactions_query(use_fts, category is not None), params)
+            return list(self._iter_transactions(cursor))
+
+    def search_transactions_any(self, search_terms: Sequence[str], limit: int = 100) -> list[Transaction]:
+        """Search transactions matching any of the terms, each matched like search_transactions."""
+        if not search_terms:
+            return []
+        fts_terms = [term for term in search_terms if len(term) >= FTS_MIN_TERM_LENGTH]
+        like_terms = [term for term in search_terms if len(term) < FTS_MIN_TERM_LENGTH]
+
+        params: list[str | int] = [" OR ".join(map(_fts_phrase, fts_terms))] if fts_terms else []
+        for term in like_terms:
+            params += [f"%{term}%"] * 2
+        params.append(limit)
+
+        with self._get_connection() as conn:
+            cursor = conn.execute(_search_any_query(bool(fts_terms), len(like_terms)), params)
+            return list(self._iter_transactions(cursor))
+
+    def iter_search_transactions(self, search_term: str, page_size: int = 500) -> Iterator[Transaction]:
+        """
+        Yield every transaction matching search_transactions' criteria, newest first.
+
+        Results are read a page at a time, resuming after the last (date, id) seen, so the
+        connection lock is not held while the caller processes each page.
+        """
+        use_fts = len(search_term) >= FTS_MIN_TERM_LENGTH
+        match_params: list[str | int] = [_fts_phrase(search_term)] if use_fts else [f"%{search_term}%"] * 2
+        after: list[str | int] = []
+        while True:
+            with self._get_connection() as conn:
+                cursor = conn.execute(
+                    _search_transactions_query(use_fts, False, bool(after)), [*match_params, *after, page_size]
+                )
+                page = list(self._iter_transactions(cursor))
+            yield from page
+            if len(page) < page_size:
+                return
+            after = [page[-1].date.isoformat(), str(page[-1].id)]
+
+    def get_yearly_spending_by_description(self, search_term: str) -> list[tuple[int, int, float]]:
+        """
+        Get (year, transaction_count, spending) for transactions whose description contains the term.
+
+        Spending is the absolute total of negative amounts, so refunds don't offset it.
+        """
+        use_fts, param = _description_match(search_term)
+        query = SELECT_YEARLY_SPENDING_FTS if use_fts else SELECT_YEARLY_SPENDING_LIKE
+
+        with self._get_connection() as conn:
+            cursor = conn.execute(query, (param,))
+            cursor.row_factory = None
+            return cursor.fetchall()
+
+    def get_description_samples(self, search_term: str, n: int = 5) -> tuple[list[Transaction], list[Transaction]]:
+        """
+        Get the newest and oldest n transactions whose description contains the term.
+
+        Both lists are newest first, matching the head and tail of the full result ordered by date.
+        """
+        use_fts, param = _description_match(search_term)
+        if use_fts:
+            newest_query, oldest_query = SELECT_NEWEST_BY_DESCRIPTION_FTS, SELECT_OLDEST_BY_DESCRIPTION_FTS
+        else:
+            newest_query, oldest_query = SELECT_NEWEST_BY_DESCRIPTION_LIKE, SELECT_OLDEST_BY_DESCRIPTION_LIKE
+
+        with self._get_connection() as conn:
+            newest = list(self._iter_transactions(conn.execute(newest_query, (param, n))))
+            oldest = list(self._iter_transactions(conn.execute(oldest_query, (param, n))))
+        return newest, oldest[::-1]
+
+    def get_category_counts_by_description(self, search_term: str) -> dict[str, int]:
+        """Count transactions whose description contains the term, by category."""
+        use_fts, param = _description_match(search_term)
+        query = SELECT_CATEGORY_COUNTS_FTS if use_fts else SELECT_CATEGORY_COUNTS_LIKE
+
+        with self._get_connection() as conn:
+            cursor = conn.execute(query, (param,))
+            cursor.row_factory = None
+            return dict(cursor.fetchall())
 
     def get_transaction_by_id(self, transaction_id: UUID) -> Transaction | None:
         """Get a single transaction by ID."""
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions WHERE id = ?
-                """,
-                (str(transaction_id),),
-            )
-            row = cursor.fetchone()
-            return self._row_to_transaction(row) if row else None
+            cursor = conn.execute(SELECT_BY_ID, (str(transaction_id),))
+            return next(self._iter_transactions(cursor), None)
 
-    def get_transactions_by_ids(self, transaction_ids: list[str]) -> list[Transaction]:
-        """Get multiple transactions by their IDs."""
+    def get_transactions_by_ids(
+        self, transaction_ids: list[str], description_contains: str | None = None
+    ) -> list[Transaction]:
+        """Get multiple transactions by their IDs, optionally only those whose description contains a term."""
         if not transaction_ids:
             return []
-        placeholders = ",".join("?" * len(transaction_ids))
+        # IDs are passed as one JSON array so any number of them fits in a single bound parameter
+        params = [json.dumps(transaction_ids)]
+        query = SELECT_BY_IDS
+        if description_contains:
+            query = SELECT_BY_IDS_WITH_DESCRIPTION
+            params.append(f"%{description_contains}%")
         with self._get_connection() as conn:
-            cursor = conn.execute(
-                f"""
-                SELECT id, source, source_file_hash, transaction_hash, date,
-                       description, amount, category, raw_category, tags
-                FROM transactions WHERE id IN ({placeholders})
-                ORDER BY date DESC
-                """,
-                transaction_ids,
-            )
-            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+            cursor = conn.execute(query, params)
+            return list(self._iter_transactions(cursor))
 
     def get_spending_summary(self, start_date: date | None = None, end_date: date | None = None) -> dict[str, float]:
         """Get spending totals by category."""
-        query = """
-            SELECT category, SUM(amount) as total
-            FROM transactions
-            WHERE amount < 0
+        params = [d.isoformat() for d in (start_date, end_date) if d]
+        with self._get_connection() as conn:
+            return dict(conn.execute(_spending_summary_query(bool(start_date), bool(end_date)), params).fetchall())
+
+    def get_overview_stats(self, start_date: date | None = None, end_date: date | None = None) -> tuple:
         """
-        params: list = []
+        Get (count, spending, income, first_date, last_date, category_count, source_count).
 
-        if start_date:
-            query += " AND date >= ?"
-            params.append(start_date.isoformat())
-        if end_date:
-            query += " AND date <= ?"
-            params.append(end_date.isoformat())
+        Spending and income are absolute totals; the dates are None when there are no transactions.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_OVERVIEW, _date_bounds(start_date, end_date))
+            cursor.row_factory = None
+            return cursor.fetchone()
+
+    def get_monthly_totals(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[tuple[str, float, float, int]]:
+        """Get (YYYY-MM, spending, income, count) per month, oldest first."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_MONTHLY_TOTALS, _date_bounds(start_date, end_date))
+            cursor.row_factory = None
+            return cursor.fetchall()
+
+    def get_monthly_spending_by_category(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[tuple[str, str, float]]:
+        """Get (YYYY-MM, category, spending) for every month and category with spending, oldest first."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_MONTHLY_CATEGORY_SPENDING, _date_bounds(start_date, end_date))
+            cursor.row_factory = None
+            return cursor.fetchall()
 
-        query += " GROUP BY category"
+    def get_yearly_totals(self) -> list[tuple[int, float, float, int]]:
+        """Get (year, spending, income, count) per year, newest first."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_YEARLY_TOTALS)
+            cursor.row_factory = None
+            return cursor.fetchall()
+
+    def get_spending_by_source(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[tuple[str, float, int]]:
+        """Get (source, spending, count) for each source with spending."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_SOURCE_SPENDING, _date_bounds(start_date, end_date))
+            cursor.row_factory = None
+            return cursor.fetchall()
 
+    def get_daily_spending(self, start_date: date | None = None, end_date: date | None = None) -> dict[str, float]:
+        """Get spending per ISO date, for days with spending."""
         with self._get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return {row["category"] or "Uncategorized": abs(row["total"]) for row in cursor.fetchall()}
+            return dict(conn.execute(SELECT_DAILY_SPENDING, _date_bounds(start_date, end_date)).fetchall())
+
+    def get_spending_by_description(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> list[tuple[str, float, int]]:
+        """Get (description, spending, count) for each distinct description with spending."""
+        with self._get_connection() as conn:
+            cursor = conn.execute(SELECT_SPENDING_BY_DESCRIPTION, _date_bounds(start_date, end_date))
+            cursor.row_factory = None
+            return cursor.fetchall()
 
     def get_uploaded_files(self) -> list[UploadedFile]:
         """Get all uploaded files."""
@@ -342,35 +774,121 @@ class Database:
                     id=UUID(row["id"]),
                     filename=row["filename"],
                     file_hash=row["file_hash"],
-                    source=TransactionSource(row["source"]),
+                    source=SOURCES_BY_VALUE[row["source"]],
                     transaction_count=row["transaction_count"],
                     uploaded_at=row["uploaded_at"],
                 )
                 for row in cursor.fetchall()
             ]
 
+    def get_cached_embeddings(self, text_hashes: list[bytes]) -> dict[bytes, bytes]:
+        """Get cached embedding vectors for the given text hashes."""
+        if not text_hashes:
+            return {}
+        placeholders = ",".join("?" * len(text_hashes))
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT text_hash, vector FROM embedding_cache WHERE text_hash IN ({placeholders})",
+                text_hashes,
+            )
+            return {row["text_hash"]: row["vector"] for row in cursor.fetchall()}
+
+    def cache_embeddings(self, entries: dict[bytes, bytes]) -> None:
+        """Store embedding vectors keyed by text hash."""
+        if not entries:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (text_hash, vector) VALUES (?, ?)",
+                entries.items(),
+            )
+
+    def get_data_version(self) -> tuple[int, int]:
+        """Get a value that changes whenever the database is modified, by this connection or another."""
+        with self._get_connection() as conn:
+            return conn.total_changes, conn.execute("PRAGMA data_version").fetchone()[0]
+
     def get_transaction_count(self) -> int:
-        """Get total number of transactions."""
+        """
+        Get total number of transactions.
+
+        The count is loaded once and then kept current by this connection's inserts;
+        transactions written by other processes are not reflected.
+        """
         with self._get_connection() as conn:
-            cursor = conn.execute("SELECT COUNT(*) as count FROM transactions")
-            return cursor.fetchone()["count"]
-
-    def _row_to_transaction(self, row: sqlite3.Row) -> Transaction:
-        """Convert a database row to a Transaction model."""
-        tags_str = row["tags"] if "tags" in row.keys() else None
-        return Transaction(
-            id=UUID(row["id"]),
-            source=TransactionSource(row["source"]),
-            source_file_hash=row["source_file_hash"],
-            transaction_hash=row["transaction_hash"],
-            date=date.fromisoformat(row["date"]),
-            description=row["description"],
-            amount=row["amount"],
-            category=TransactionCategory(row["category"]) if row["category"] else None,
-            raw_category=row["raw_category"],
-            tags=tags_str.split(",") if tags_str else [],
+            if self._transaction_count is None:
+                self._transaction_count = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+            return self._transaction_count
+
+    @staticmethod
+    def _transaction_to_row(transaction: Transaction) -> tuple:
+        """Convert a Transaction model to a tuple of column values for INSERT."""
+        return (
+            str(transaction.id),
+            transaction.source.value,
+            transaction.source_file_hash,
+            transaction.transaction_hash,
+            transaction.date.isoformat(),
+            transaction.description,
+            transaction.amount,
+            transaction.category.value if transaction.category else None,
+            transaction.raw_category,
+            json.dumps(transaction.tags) if transaction.tags else None,
         )
 
+    def _iter_transactions(self, cursor: sqlite3.Cursor, batch_size: int = 500) -> Iterator[Transaction]:
+        """Yield transactions from a cursor, fetching rows in batches."""
+        # Plain tuples are decoded positionally, skipping sqlite3.Row's by-name lookups
+        cursor.row_factory = None
+        while rows := cursor.fetchmany(batch_size):
+            for row in rows:
+                yield self._row_to_transaction(row)
+
+    def _row_to_transaction(self, row: tuple) -> Transaction:
+        """
+        Convert a database row (selected in TRANSACTION_COLUMNS order) to a Transaction model.
+
+        Rows were validated on the way in and every field is converted to its model
+        type here, so validation is skipped with model_construct.
+        """
+        (
+            txn_id,
+            source,
+            source_file_hash,
+            transaction_hash,
+            txn_date,
+            description,
+            amount,
+            category,
+            raw_category,
+            tags,
+        ) = row
+        return Transaction.model_construct(
+            id=UUID(txn_id),
+            source=SOURCES_BY_VALUE[source],
+            source_file_hash=source_file_hash,
+            transaction_hash=transaction_hash,
+            date=date.fromisoformat(txn_date),
+            description=description,
+            amount=amount,
+            category=CATEGORIES_BY_VALUE[category] if category else None,
+            raw_category=raw_category,
+            tags=json.loads(tags) if tags else [],
+        )
+
+
+@lru_cache(maxsize=1)
+def get_db() -> Database:
+    """Get the global database, opening it on first use."""
+    return Database()
+
+
+class _LazyDatabase:
+    """Stand-in for the global database that defers opening it until first attribute access."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_db(), name)
+
 
-# Global database instance
-db = Database()
+# Global database instance (opened lazily so importing this module has no side effects)
+db = cast(Database, _LazyDatabase())
@@ -1,12 +1,26 @@
 """ChromaDB vector store for semantic search over transactions."""
 
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import cast
+
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 from litellm import aembedding
 
 from backend.config import settings
+from backend.db.sqlite import db
 from backend.models import Transaction
 
+# Texts per embedding request, and how many requests may be in flight at once
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_CONCURRENCY = 8
+
+# Rows per Chroma upsert call
+UPSERT_BATCH_SIZE = 256
+
 
 class VectorStore:
     """ChromaDB-based vector store for transaction embeddings."""
@@ -28,33 +42,17 @@ class VectorStore:
 
     async def add_transaction(self, transaction: Transaction) -> None:
         """Add a transaction to the vector store."""
-        # Create embedding text from transaction details
-        embed_text = self._create_embed_text(transaction)
-
-        # Generate embedding
-        embedding = await self._get_embedding(embed_text)
+        await self.add_transactions_batch([transaction])
 
-        if embedding:
-            self._collection.upsert(
-                ids=[str(transaction.id)],
-                embeddings=[embedding],
-                documents=[embed_text],
-                metadatas=[
-                    {
-                        "date": transaction.date.isoformat(),
-                        "amount": transaction.amount,
-                        "category": transaction.category.value if transaction.category else "Unknown",
-                        "source": transaction.source.value,
-                        "description": transaction.description,
-                        "tags": ",".join(transaction.tags) if transaction.tags else "",
-                    }
-                ],
-            )
+    async def add_transactions_batch(self, transactions: list[Transaction]) -> int:
+        """
+        Add multiple transactions to the vector store.
 
-    async def add_transactions_batch(self, transactions: list[Transaction]) -> None:
-        """Add multiple transactions to the vector store."""
+        Transactions whose embedding failed are skipped; the rest are still stored.
+        Returns the number of transactions stored.
+        """
         if not transactions:
-            return
+            return 0
 
         # Create embedding texts
         embed_texts = [self._create_embed_text(txn) for txn in transactions]
@@ -62,11 +60,21 @@ class VectorStore:
         # Generate embeddings in batch
         embeddings = await self._get_embeddings_batch(embed_texts)
 
-        if embeddings and len(embeddings) == len(transactions):
+        embedded = [
+            (txn, text, embedding)
+            for txn, text, embedding in zip(transactions, embed_texts, embeddings, strict=True)
+            if embedding is not None
+        ]
+        if len(embedded) < len(transactions):
+            print(f"Skipping {len(transactions) - len(embedded)}/{len(transactions)} transactions without embeddings")
+
+        # Upsert in chunks so a large batch doesn't hold the whole payload at once
+        for i in range(0, len(embedded), UPSERT_BATCH_SIZE):
+            chunk = embedded[i : i + UPSERT_BATCH_SIZE]
             self._collection.upsert(
-                ids=[str(txn.id) for txn in transactions],
-                embeddings=embeddings,
-                documents=embed_texts,
+                ids=[str(txn.id) for txn, _, _ in chunk],
+                embeddings=np.stack([embedding for _, _, embedding in chunk]),
+                documents=[text for _, text, _ in chunk],
                 metadatas=[
                     {
                         "date": txn.date.isoformat(),
@@ -76,10 +84,12 @@ class VectorStore:
                         "description": txn.description,
                         "tags": ",".join(txn.tags) if txn.tags else "",
                     }
-                    for txn in transactions
+                    for txn, _, _ in chunk
                 ],
             )
 
+        return len(embedded)
+
     async def search(
         self,
         query: str,
@@ -94,7 +104,7 @@ class VectorStore:
         # Generate query embedding
         query_embedding = await self._get_embedding(query)
 
-        if not query_embedding:
+        if query_embedding is None:
             return []
 
         # Build where filter if category specified
@@ -138,48 +148,87 @@ class VectorStore:
             base += f" | Tags: {tags_str}"
         return base
 
-    async def _get_embedding(self, text: str) -> list[float] | None:
-        """Get embedding for a single text."""
+    async def _get_embedding(self, text: str) -> np.ndarray | None:
+        """Get embedding for a single text as a float32 vector."""
         try:
-            if settings.llm_provider == "openai":
-                response = await aembedding(
-                    model="text-embedding-3-small",
-                    input=[text],
-                    api_key=settings.openai_api_key,
-                )
-            else:
-                response = await aembedding(
-                    model=f"ollama/{settings.embedding_model}",
-                    input=[text],
-                    api_base=settings.ollama_host,
-                )
-
-            return response.data[0]["embedding"]
+            return (await self._embed_texts([text]))[0]
         except Exception as e:
             print(f"Embedding error: {e}")
             return None
 
-    async def _get_embeddings_batch(self, texts: list[str]) -> list[list[float]] | None:
-        """Get embeddings for multiple texts."""
-        try:
-            if settings.llm_provider == "openai":
-                response = await aembedding(
-                    model="text-embedding-3-small",
-                    input=texts,
-                    api_key=settings.openai_api_key,
-                )
-            else:
-                response = await aembedding(
-                    model=f"ollama/{settings.embedding_model}",
-                    input=texts,
-                    api_base=settings.ollama_host,
-                )
+    async def _get_embeddings_batch(self, texts: list[str]) -> list[np.ndarray | None]:
+        """
+        Get float32 embeddings for multiple texts, one entry per text.
 
-            return [item["embedding"] for item in response.data]
-        except Exception as e:
-            print(f"Batch embedding error: {e}")
-            return None
+        Vectors are looked up in the embedding cache first; only unseen texts are
+        sent to the embedding API, in concurrent chunks. Entries are None for texts
+        whose chunk failed to embed.
+        """
+        model = self._get_embedding_model()
+        hashes = [hashlib.blake2b(f"{model}\0{text}".encode(), digest_size=16).digest() for text in texts]
+        # The cache lives in SQLite, so read and write it off the event loop
+        cached = await asyncio.to_thread(db.get_cached_embeddings, list(set(hashes)))
+
+        # Embed each distinct missing text once
+        missing = list({h: text for h, text in zip(hashes, texts, strict=True) if h not in cached}.items())
+        if missing:
+            semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+            async def embed_chunk(chunk: list[tuple[bytes, str]]) -> dict[bytes, bytes]:
+                async with semaphore:
+                    embeddings = await self._embed_texts([text for _, text in chunk])
+                return {h: row.tobytes() for (h, _), row in zip(chunk, embeddings, strict=True)}
+
+            chunks = [missing[i : i + EMBEDDING_BATCH_SIZE] for i in range(0, len(missing), EMBEDDING_BATCH_SIZE)]
+            results = await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+            new_vectors: dict[bytes, bytes] = {}
+            for chunk, result in zip(chunks, results, strict=True):
+                if isinstance(result, BaseException):
+                    print(f"Batch embedding error ({len(chunk)} texts): {result}")
+                else:
+                    new_vectors.update(result)
+            await asyncio.to_thread(db.cache_embeddings, new_vectors)
+            cached.update(new_vectors)
+
+        return [np.frombuffer(cached[h], dtype=np.float32) if h in cached else None for h in hashes]
+
+    def _get_embedding_model(self) -> str:
+        """Get the embedding model name for the current provider."""
+        if settings.llm_provider == "openai":
+            return "text-embedding-3-small"
+        return f"ollama/{settings.embedding_model}"
+
+    async def _embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Request embeddings for a list of texts in a single API call."""
+        if settings.llm_provider == "openai":
+            response = await aembedding(
+                model=self._get_embedding_model(),
+                input=texts,
+                api_key=settings.openai_api_key,
+            )
+        else:
+            response = await aembedding(
+                model=self._get_embedding_model(),
+                input=texts,
+                api_base=settings.ollama_host,
+            )
+
+        return np.asarray([item["embedding"] for item in response.data], dtype=np.float32)
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Get the global vector store, starting the ChromaDB client on first use."""
+    return VectorStore()
+
+
+class _LazyVectorStore:
+    """Stand-in for the global vector store that defers creating it until first attribute access."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_vector_store(), name)
 
 
-# Global vector store instance
-vector_store = VectorStore()
+# Global vector store instance (created lazily so importing this module has no side effects)
+vector_store = cast(VectorStore, _LazyVectorStore())
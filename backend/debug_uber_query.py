@@ -3,6 +3,7 @@
 import asyncio
 
 from backend.db.sqlite import db
+from backend.models import Transaction
 from backend.services.query_engine import (
     _calculate_stats,
     _extract_brand_keywords,
@@ -11,6 +12,11 @@ from backend.services.query_engine import (
 )
 
 
+def _format_sample(txn: Transaction) -> str:
+    """Format a transaction as one sample line."""
+    return f"   {txn.date} | {txn.description[:40]} | ${abs(txn.amount):.2f} | tags: {txn.tags}"
+
+
 def debug_uber_transactions():
     """Debug Uber transactions in the database."""
     print("=" * 60)
@@ -23,24 +29,19 @@ def debug_uber_transactions():
     print(f"   Found {len(uber_txns)} transactions with 'uber' in description/tags")
 
     # Step 2: Filter to only those with UBER in description
-    uber_in_desc = [t for t in uber_txns if "uber" in t.description.lower()]
+    uber_in_desc = [t for t in uber_txns if "uber" in t.description_lower]
     print(f"   Of those, {len(uber_in_desc)} have 'uber' in description")
 
     # Step 3: Show year breakdown
-    print("\n2. Year breakdown of Uber transactions:")
-    year_counts = {}
-    year_amounts = {}
-    for txn in uber_in_desc:
-        year = txn.date.year
-        if year not in year_counts:
-            year_counts[year] = 0
-            year_amounts[year] = 0.0
-        year_counts[year] += 1
-        if txn.amount < 0:
-            year_amounts[year] += abs(txn.amount)
-
-    for year in sorted(year_counts.keys()):
-        print(f"   {year}: {year_counts[year]} transactions, ${year_amounts[year]:.2f}")
+    yearly = db.get_yearly_spending_by_description("uber")
+    print(
+        "\n".join(
+            [
+                "\n2. Year breakdown of Uber transactions:",
+                *(f"   {year}: {count} transactions, ${spending:.2f}" for year, count, spending in yearly),
+            ]
+        )
+    )
 
     # Step 4: Test _calculate_stats
     print("\n3. Testing _calculate_stats on these transactions:")
@@ -50,31 +51,38 @@ def debug_uber_transactions():
     print(f"   By year: {stats.get('by_year', {})}")
 
     # Step 5: Check what brand keywords are extracted
-    print("\n4. Testing _extract_brand_keywords:")
     test_queries = [
         "uber",
         "how much did i spend on uber",
         "compare my uber transactions",
         "uber spending in 2024",
     ]
-    for q in test_queries:
-        keywords = _extract_brand_keywords(q)
-        print(f"   '{q}' -> {keywords}")
+    print(
+        "\n".join(
+            [
+                "\n4. Testing _extract_brand_keywords:",
+                *(f"   '{q}' -> {_extract_brand_keywords(q)}" for q in test_queries),
+            ]
+        )
+    )
 
     # Step 6: Check required tags
-    print("\n5. Testing _get_required_tags:")
-    for q in test_queries:
-        tags = _get_required_tags(q)
-        print(f"   '{q}' -> {tags}")
+    print(
+        "\n".join(["\n5. Testing _get_required_tags:", *(f"   '{q}' -> {_get_required_tags(q)}" for q in test_queries)])
+    )
 
     # Step 7: Sample some transactions
-    print("\n6. Sample Uber transactions (first 5):")
-    for txn in uber_in_desc[:5]:
-        print(f"   {txn.date} | {txn.description[:40]} | ${abs(txn.amount):.2f} | tags: {txn.tags}")
-
-    print("\n7. Sample Uber transactions (last 5):")
-    for txn in uber_in_desc[-5:]:
-        print(f"   {txn.date} | {txn.description[:40]} | ${abs(txn.amount):.2f} | tags: {txn.tags}")
+    newest, oldest = db.get_description_samples("uber", n=5)
+    print(
+        "\n".join(
+            [
+                "\n6. Sample Uber transactions (first 5):",
+                *map(_format_sample, newest),
+                "\n7. Sample Uber transactions (last 5):",
+                *map(_format_sample, oldest),
+            ]
+        )
+    )
 
     return uber_in_desc
 
@@ -95,20 +103,19 @@ async def debug_full_query():
 
     if result.transactions:
         # Check year breakdown of returned transactions
-        year_counts = {}
-        year_amounts = {}
-        for txn in result.transactions:
-            year = txn.date.year
-            if year not in year_counts:
-                year_counts[year] = 0
-                year_amounts[year] = 0.0
-            year_counts[year] += 1
-            if txn.amount < 0:
-                year_amounts[year] += abs(txn.amount)
-
-        print("\n   Year breakdown of returned transactions:")
-        for year in sorted(year_counts.keys()):
-            print(f"      {year}: {year_counts[year]} transactions, ${year_amounts[year]:.2f}")
+        by_year = _calculate_stats(result.transactions)["by_year"]
+
+        print(
+            "\n".join(
+                [
+                    "\n   Year breakdown of returned transactions:",
+                    *(
+                        f"      {year}: {by_year[year]['count']} transactions, ${by_year[year]['spending']:.2f}"
+                        for year in sorted(by_year)
+                    ),
+                ]
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -13,27 +13,29 @@ def debug_filtering():
     print("DEBUGGING FILTERING")
     print("=" * 60)
 
-    # Get all Uber transactions
-    uber_txns = db.search_transactions("uber", limit=1000)
-    uber_in_desc = [t for t in uber_txns if "uber" in t.description.lower()]
-
-    print(f"\nTotal Uber transactions in DB: {len(uber_in_desc)}")
-
     # Test _has_required_tags on each
     required_tags = _get_required_tags("uber")
-    print(f"Required tags for 'uber' query: {required_tags}")
 
-    # Count how many pass the filter
-    passing = []
+    # Stream all Uber transactions, counting how many pass the filter and keeping
+    # only a few failing samples
+    total = passing = failing_count = 0
     failing = []
-    for txn in uber_in_desc:
+    for txn in db.iter_search_transactions("uber"):
+        if "uber" not in txn.description_lower:
+            continue
+        total += 1
         if _has_required_tags(txn, required_tags):
-            passing.append(txn)
+            passing += 1
         else:
-            failing.append(txn)
+            failing_count += 1
+            if len(failing) < 5:
+                failing.append(txn)
+
+    print(f"\nTotal Uber transactions in DB: {total}")
+    print(f"Required tags for 'uber' query: {required_tags}")
 
-    print(f"\nPassing filter: {len(passing)}")
-    print(f"Failing filter: {len(failing)}")
+    print(f"\nPassing filter: {passing}")
+    print(f"Failing filter: {failing_count}")
 
     # Show some failing ones
     if failing:
@@ -41,7 +43,7 @@ def debug_filtering():
         for txn in failing[:5]:
             print(f"  Description: {txn.description}")
             print(f"  Tags: {txn.tags}")
-            print(f"  'uber' in description.lower(): {'uber' in txn.description.lower()}")
+            print(f"  'uber' in description.lower(): {'uber' in txn.description_lower}")
             print()
 
     # Test the _has_required_tags function directly
@@ -53,7 +55,7 @@ def debug_filtering():
         print(f"Required tags: {required_tags}")
 
         # Manual check
-        desc_lower = txn.description.lower()
+        desc_lower = txn.description_lower
         print(f"Description lower: {desc_lower}")
         for tag in required_tags:
             tag_lower = tag.lower()
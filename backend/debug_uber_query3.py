@@ -1,6 +1,7 @@
 """Debug script to trace _get_relevant_transactions."""
 
 import asyncio
+from collections import Counter
 
 from backend.db.sqlite import db
 from backend.db.vector import vector_store
@@ -20,6 +21,10 @@ async def debug_get_relevant():
     query = "how much did i spend on uber"
     query_lower = query.lower()
 
+    # The semantic search doesn't depend on any step below, so start it now and
+    # let it run alongside the intent analysis and brand search
+    semantic_search = asyncio.create_task(vector_store.search(query=query, n_results=200))
+
     # Step 1: Analyze intent
     print("\n1. Analyzing query intent:")
     intent = await _analyze_query_intent(query)
@@ -38,56 +43,43 @@ async def debug_get_relevant():
     # Step 4: Direct database search for brand keywords
     print("\n4. Direct database search for brand keywords:")
     transactions = []
-    seen_ids = set()
 
     if brand_keywords:
-        for keyword in brand_keywords:
-            matches = db.search_transactions(keyword, limit=1000)
-            print(f"   db.search_transactions('{keyword}'): {len(matches)} results")
-
-            for txn in matches:
-                if str(txn.id) not in seen_ids:
-                    # Check if keyword is in description
-                    if keyword.lower() in txn.description.lower():
-                        seen_ids.add(str(txn.id))
-                        transactions.append(txn)
+        # Run the blocking SQLite search off the event loop so the semantic search keeps progressing
+        matches = await asyncio.to_thread(db.search_transactions_any, brand_keywords, limit=1000)
+        print(f"   db.search_transactions_any({list(brand_keywords)}): {len(matches)} results")
 
-            print(f"   After filtering by description: {len(transactions)} transactions")
+        # Check if a keyword is in the description
+        transactions = [txn for txn in matches if any(keyword in txn.description_lower for keyword in brand_keywords)]
+        print(f"   After filtering by description: {len(transactions)} transactions")
 
     print(f"\n   Total after brand search: {len(transactions)}")
 
     # Step 5: Check year breakdown
-    print("\n5. Year breakdown of found transactions:")
-    year_counts = {}
-    for txn in transactions:
-        year = txn.date.year
-        year_counts[year] = year_counts.get(year, 0) + 1
-    for year in sorted(year_counts.keys()):
-        print(f"   {year}: {year_counts[year]} transactions")
+    year_counts = Counter(txn.date.year for txn in transactions)
+    print(
+        "\n".join(
+            [
+                "\n5. Year breakdown of found transactions:",
+                *(f"   {year}: {year_counts[year]} transactions" for year in sorted(year_counts)),
+            ]
+        )
+    )
 
     # Step 6: Check semantic search
     print("\n6. Checking semantic search:")
-    search_results = await vector_store.search(
-        query=query,
-        n_results=200,
-    )
+    search_results = await semantic_search
     print(f"   Semantic search returned: {len(search_results)} results")
 
     if search_results:
         txn_ids = [result["id"] for result in search_results]
-        semantic_matches = db.get_transactions_by_ids(txn_ids)
-        print(f"   After fetching from DB: {len(semantic_matches)} transactions")
-
-        # Check how many have uber in description
-        uber_semantic = [t for t in semantic_matches if "uber" in t.description.lower()]
+        # Fetch only the results with uber in the description
+        uber_semantic = db.get_transactions_by_ids(txn_ids, description_contains="uber")
         print(f"   Of those, {len(uber_semantic)} have 'uber' in description")
 
         # Year breakdown
-        year_counts_semantic = {}
-        for txn in uber_semantic:
-            year = txn.date.year
-            year_counts_semantic[year] = year_counts_semantic.get(year, 0) + 1
-        print(f"   Semantic search year breakdown: {year_counts_semantic}")
+        year_counts_semantic = Counter(txn.date.year for txn in uber_semantic)
+        print(f"   Semantic search year breakdown: {dict(year_counts_semantic)}")
 
 
 if __name__ == "__main__":
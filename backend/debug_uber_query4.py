@@ -1,6 +1,7 @@
 """Debug script to find the category filter issue."""
 
 import asyncio
+from collections import Counter
 
 from backend.db.sqlite import db
 from backend.models import TransactionCategory
@@ -20,49 +21,41 @@ async def debug_category_filter():
     intent = await _analyze_query_intent(query)
     print(f"   Intent category: {intent.get('category')}")
 
-    # Step 2: Get all Uber transactions
+    # Step 2: Count Uber transactions by category
+    cat_counts = db.get_category_counts_by_description("uber")
     print("\n2. Uber transactions in DB:")
-    uber_txns = db.search_transactions("uber", limit=1000)
-    uber_in_desc = [t for t in uber_txns if "uber" in t.description.lower()]
-    print(f"   Total: {len(uber_in_desc)}")
+    print(f"   Total: {sum(cat_counts.values())}")
 
     # Step 3: Check categories of Uber transactions
-    print("\n3. Categories of Uber transactions:")
-    cat_counts = {}
-    for txn in uber_in_desc:
-        cat = txn.category.value if txn.category else "None"
-        cat_counts[cat] = cat_counts.get(cat, 0) + 1
-    for cat, count in sorted(cat_counts.items()):
-        print(f"   {cat}: {count}")
+    print(
+        "\n".join(
+            ["\n3. Categories of Uber transactions:", *(f"   {cat}: {count}" for cat, count in cat_counts.items())]
+        )
+    )
 
     # Step 4: Try to parse the intent category
     print("\n4. Parsing intent category:")
     intent_cat_str = intent.get("category")
     print(f"   Intent category string: '{intent_cat_str}'")
 
-    try:
-        intent_cat = TransactionCategory(intent_cat_str)
+    intent_cat = TransactionCategory.try_from(intent_cat_str)
+    if intent_cat:
         print(f"   Parsed as: {intent_cat}")
         print(f"   Enum value: {intent_cat.value}")
-    except Exception as e:
-        print(f"   Failed to parse: {e}")
+    else:
+        print(f"   Failed to parse: {intent_cat_str!r} is not a valid TransactionCategory")
 
     # Step 5: Filter by category
     print("\n5. Filtering by category:")
-    if intent_cat_str:
-        try:
-            category = TransactionCategory(intent_cat_str)
-            filtered = [t for t in uber_in_desc if t.category == category]
-            print(f"   Transactions matching '{category.value}': {len(filtered)}")
-
-            # Year breakdown
-            year_counts = {}
-            for txn in filtered:
-                year = txn.date.year
-                year_counts[year] = year_counts.get(year, 0) + 1
-            print(f"   Year breakdown: {year_counts}")
-        except Exception as e:
-            print(f"   Error: {e}")
+    if intent_cat:
+        filtered = [
+            t for t in db.search_transactions("uber", limit=1000, category=intent_cat) if "uber" in t.description_lower
+        ]
+        print(f"   Transactions matching '{intent_cat.value}': {len(filtered)}")
+
+        # Year breakdown
+        year_counts = Counter(txn.date.year for txn in filtered)
+        print(f"   Year breakdown: {dict(year_counts)}")
 
     # Step 6: Check what Travel category looks like
     print("\n6. Checking Travel vs Transportation:")
@@ -70,10 +63,8 @@ async def debug_category_filter():
     print(f"   TransactionCategory.TRAVEL.value = '{TransactionCategory.TRAVEL.value}'")
 
     # Check which Uber transactions are Travel vs Transportation
-    travel_uber = [t for t in uber_in_desc if t.category == TransactionCategory.TRAVEL]
-    transport_uber = [t for t in uber_in_desc if t.category == TransactionCategory.TRANSPORTATION]
-    print(f"\n   Uber transactions with TRAVEL: {len(travel_uber)}")
-    print(f"   Uber transactions with TRANSPORTATION: {len(transport_uber)}")
+    print(f"\n   Uber transactions with TRAVEL: {cat_counts.get(TransactionCategory.TRAVEL.value, 0)}")
+    print(f"   Uber transactions with TRANSPORTATION: {cat_counts.get(TransactionCategory.TRANSPORTATION.value, 0)}")
 
 
 if __name__ == "__main__":
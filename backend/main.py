@@ -1,10 +1,17 @@
 """FastAPI application for Finalyzer."""
 
 import asyncio
+import functools
+import hashlib
+import re
+from datetime import date
 
+import httpx
+import litellm
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
 
 from backend.config import settings
 from backend.db.sqlite import db
@@ -16,10 +23,20 @@ from backend.models import (
     Transaction,
     UploadResponse,
 )
+from backend.parsers.pdf_pages import shutdown_pool
 from backend.services.progress import get_progress
 from backend.services.query_engine import query_transactions
 from backend.services.upload import process_upload
 
+# Default timeout for requests on the shared LLM connection pool
+LLM_REQUEST_TIMEOUT_SECONDS = 600.0
+
+# Bytes read from an uploaded file per chunk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Serializes transaction lists straight to JSON bytes in pydantic-core, without re-validating them
+_TRANSACTION_LIST_ADAPTER = TypeAdapter(list[Transaction])
+
 app = FastAPI(
     title="FINalyzer",
     description="Personal finance analyzer with LLM-powered categorization",
@@ -42,6 +59,21 @@ async def startup():
     settings.log_config()  # Show loaded configuration
     settings.ensure_directories()
 
+    # One keep-alive connection pool shared by every LLM and embedding call made through litellm
+    litellm.aclient_session = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT_SECONDS),
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release resources on shutdown."""
+    if litellm.aclient_session is not None:
+        await litellm.aclient_session.aclose()
+        litellm.aclient_session = None
+    shutdown_pool()
+
 
 @app.get("/health")
 async def health_check():
@@ -60,13 +92,19 @@ async def upload_file(file: UploadFile = File(...)):
     if not (filename_lower.endswith(".pdf") or filename_lower.endswith(".csv")):
         raise HTTPException(status_code=400, detail="Only PDF and CSV files are supported")
 
-    # Read file contents
-    contents = await file.read()
+    # Hash each chunk as it is read, so the upload isn't hashed in a second pass; the parsers need the
+    # whole document, so the contents are still held in memory
+    hasher = hashlib.sha256()
+    chunks = []
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+        chunks.append(chunk)
+    contents = b"".join(chunks)
     if not contents:
         raise HTTPException(status_code=400, detail="Empty file")
 
     try:
-        result = await process_upload(file.filename, contents)
+        result = await process_upload(file.filename, contents, file_hash=hasher.hexdigest())
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -151,10 +189,15 @@ async def get_transactions(
 
     start = date_type.fromisoformat(start_date) if start_date else None
     end = date_type.fromisoformat(end_date) if end_date else None
-    cat = TransactionCategory(category) if category else None
-    src = TransactionSource(source) if source else None
+    cat = TransactionCategory.try_from(category) if category else None
+    if category and cat is None:
+        raise HTTPException(status_code=400, detail=f"Unknown category: {category}")
+    src = TransactionSource.try_from(source) if source else None
+    if source and src is None:
+        raise HTTPException(status_code=400, detail=f"Unknown source: {source}")
 
-    return db.get_all_transactions(start_date=start, end_date=end, category=cat, source=src, limit=limit)
+    transactions = db.get_all_transactions(start_date=start, end_date=end, category=cat, source=src, limit=limit)
+    return Response(content=_TRANSACTION_LIST_ADAPTER.dump_json(transactions), media_type="application/json")
 
 
 @app.post("/query", response_model=QueryResponse)
@@ -230,18 +273,20 @@ async def recategorize_subscriptions():
     # Get all transactions
     all_transactions = db.get_all_transactions(limit=10000)
 
-    updated = 0
-    for txn in all_transactions:
-        # Check if this should be a subscription
-        if _check_known_subscription(txn.description):
-            if txn.category != TransactionCategory.SUBSCRIPTIONS:
-                db.update_transaction_category(txn.id, TransactionCategory.SUBSCRIPTIONS)
-                updated += 1
+    # Find transactions that should be subscriptions
+    to_fix = [
+        txn
+        for txn in all_transactions
+        if txn.category != TransactionCategory.SUBSCRIPTIONS and _check_known_subscription(txn.description)
+    ]
+    for txn in to_fix:
+        txn.category = TransactionCategory.SUBSCRIPTIONS
+    db.update_categories_batch(to_fix)
 
     return {
         "status": "complete",
         "transactions_checked": len(all_transactions),
-        "subscriptions_fixed": updated,
+        "subscriptions_fixed": len(to_fix),
     }
 
 
@@ -260,41 +305,34 @@ async def retag_transactions(reembed: bool = True):
     from backend.services.tagger import schedule_llm_tagging, tag_transactions_fast
 
     # Get all transactions
-    all_transactions = db.get_all_transactions(limit=10000)
+    all_transactions = await asyncio.to_thread(db.get_all_transactions, limit=10000)
 
     # Fast tag first
     tag_transactions_fast(all_transactions)
 
-    # Update DB with fast tags
-    fast_tagged = 0
-    for txn in all_transactions:
-        if txn.tags:
-            db.update_transaction_tags(txn.id, txn.tags)
-            fast_tagged += 1
+    # Start LLM tagging of the rest right away, so it runs alongside the DB write and re-embedding
+    untagged_ids = [str(txn.id) for txn in all_transactions if not txn.tags]
+    if untagged_ids:
+        asyncio.create_task(schedule_llm_tagging(untagged_ids))
+
+    # The in-memory transactions now hold exactly the tags being written, so they can be
+    # re-embedded directly while the DB write runs in a worker thread
+    tagged_txns = [txn for txn in all_transactions if txn.tags]
+    db_write = asyncio.create_task(asyncio.to_thread(db.update_tags_batch, tagged_txns))
+    fast_tagged = len(tagged_txns)
 
     # Re-embed tagged transactions in vector store for better semantic search
     reembedded = 0
-    if reembed:
-        # Get updated transactions from DB (with tags)
-        updated_transactions = db.get_all_transactions(limit=10000)
-        tagged_txns = [txn for txn in updated_transactions if txn.tags]
-
-        if tagged_txns:
-            # Re-embed in batches
-            batch_size = 50
-            for i in range(0, len(tagged_txns), batch_size):
-                batch = tagged_txns[i : i + batch_size]
-                try:
-                    await vector_store.add_transactions_batch(batch)
-                    reembedded += len(batch)
-                except Exception as e:
-                    print(f"Re-embed batch failed: {e}")
-
-    # Get untagged for LLM
-    untagged_ids = [str(txn.id) for txn in all_transactions if not txn.tags]
+    if reembed and tagged_txns:
+        # One call: the vector store embeds in concurrent chunks and skips chunks that fail
+        try:
+            reembedded = await vector_store.add_transactions_batch(tagged_txns)
+        except Exception as e:
+            print(f"Re-embed failed: {e}")
+
+    await db_write
 
     if untagged_ids:
-        asyncio.create_task(schedule_llm_tagging(untagged_ids))
         return {
             "status": "scheduled",
             "transactions_checked": len(all_transactions),
@@ -313,22 +351,47 @@ async def retag_transactions(reembed: bool = True):
 
 
 # ==================== DASHBOARD ENDPOINTS ====================
+# Dashboard and insights handlers are plain functions: they only do blocking SQLite
+# reads and aggregation, so FastAPI runs them in its threadpool instead of on the event loop.
+
+
+def _json_endpoint(func):
+    """
+    Send a handler's result as a JSONResponse directly.
+
+    The dashboard and insights payloads are plain dicts of JSON-native values, so
+    FastAPI's recursive jsonable_encoder pass over them is skipped. The undecorated
+    function stays reachable as __wrapped__.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return JSONResponse(func(*args, **kwargs))
+
+    return wrapper
+
+
+# Store numbers, long reference codes and payment processor prefixes stripped from merchant names
+_MERCHANT_NOISE_PATTERN = re.compile(r"^\s*(?:SQ|TST|PP)\s*\*|\s*#\d+.*$|\s*\d{5,}.*$")
+
+
+def _year_bounds(year: int | None) -> tuple[date | None, date | None]:
+    """Get the (start, end) dates of a calendar year, or (None, None) for all time."""
+    if not year:
+        return None, None
+    return date(year, 1, 1), date(year, 12, 31)
 
 
 @app.get("/dashboard/overview")
-async def get_dashboard_overview(year: int | None = None):
+@_json_endpoint
+def get_dashboard_overview(year: int | None = None):
     """Get overall dashboard statistics."""
-    from datetime import date as date_type
-
-    # Filter by year if specified
-    if year:
-        start_date = date_type(year, 1, 1)
-        end_date = date_type(year, 12, 31)
-        all_transactions = db.get_all_transactions(start_date=start_date, end_date=end_date, limit=10000)
-    else:
-        all_transactions = db.get_all_transactions(limit=10000)
+    start_date, end_date = _year_bounds(year)
+    count, spending, income, first_date, last_date, categories_count, sources_count = db.get_overview_stats(
+        start_date=start_date, end_date=end_date
+    )
 
-    if not all_transactions:
+    if not count:
         return {
             "total_transactions": 0,
             "total_spending": 0,
@@ -339,45 +402,26 @@ async def get_dashboard_overview(year: int | None = None):
             "year": year,
         }
 
-    total_spending = sum(abs(t.amount) for t in all_transactions if t.amount < 0)
-    total_income = sum(t.amount for t in all_transactions if t.amount > 0)
-    dates = [t.date for t in all_transactions]
-    categories = set(t.category.value if t.category else "Uncategorized" for t in all_transactions)
-    sources = set(t.source.value for t in all_transactions)
-
     return {
-        "total_transactions": len(all_transactions),
-        "total_spending": round(total_spending, 2),
-        "total_income": round(total_income, 2),
+        "total_transactions": count,
+        "total_spending": round(spending, 2),
+        "total_income": round(income, 2),
         "date_range": {
-            "start": min(dates).isoformat(),
-            "end": max(dates).isoformat(),
+            "start": first_date,
+            "end": last_date,
         },
-        "categories_count": len(categories),
-        "sources_count": len(sources),
+        "categories_count": categories_count,
+        "sources_count": sources_count,
         "year": year,
     }
 
 
 @app.get("/dashboard/spending-by-category")
-async def get_spending_by_category(year: int | None = None):
+@_json_endpoint
+def get_spending_by_category(year: int | None = None):
     """Get spending breakdown by category."""
-    from datetime import date as date_type
-
-    # Filter by year if specified
-    if year:
-        start_date = date_type(year, 1, 1)
-        end_date = date_type(year, 12, 31)
-        transactions = db.get_all_transactions(start_date=start_date, end_date=end_date, limit=10000)
-    else:
-        transactions = db.get_all_transactions(limit=10000)
-
-    # Group by category
-    by_category: dict[str, float] = {}
-    for t in transactions:
-        if t.amount < 0:  # Only spending
-            cat = t.category.value if t.category else "Uncategorized"
-            by_category[cat] = by_category.get(cat, 0) + abs(t.amount)
+    start_date, end_date = _year_bounds(year)
+    by_category = db.get_spending_summary(start_date=start_date, end_date=end_date)
 
     # Sort by amount descending
     sorted_categories = sorted(by_category.items(), key=lambda x: x[1], reverse=True)
@@ -389,111 +433,68 @@ async def get_spending_by_category(year: int | None = None):
 
 
 @app.get("/dashboard/monthly-spending")
-async def get_monthly_spending(year: int | None = None):
+@_json_endpoint
+def get_monthly_spending(year: int | None = None):
     """Get monthly spending for trend analysis."""
-    from collections import defaultdict
-
-    transactions = db.get_all_transactions(limit=10000)
-
-    # Group by year-month
-    monthly: dict[str, dict] = defaultdict(lambda: {"spending": 0.0, "income": 0.0, "count": 0})
-
-    for t in transactions:
-        if year and t.date.year != year:
-            continue
-        month_key = t.date.strftime("%Y-%m")
-        monthly[month_key]["count"] += 1
-        if t.amount < 0:
-            monthly[month_key]["spending"] += abs(t.amount)
-        else:
-            monthly[month_key]["income"] += t.amount
-
-    # Sort by month
-    sorted_months = sorted(monthly.items())
+    start_date, end_date = _year_bounds(year)
+    monthly = db.get_monthly_totals(start_date=start_date, end_date=end_date)
 
     return {
         "data": [
             {
                 "month": month,
-                "spending": round(data["spending"], 2),
-                "income": round(data["income"], 2),
-                "net": round(data["income"] - data["spending"], 2),
-                "count": data["count"],
+                "spending": round(spending, 2),
+                "income": round(income, 2),
+                "net": round(income - spending, 2),
+                "count": count,
             }
-            for month, data in sorted_months
+            for month, spending, income, count in monthly
         ]
     }
 
 
 @app.get("/dashboard/monthly-by-category")
-async def get_monthly_by_category(year: int | None = None):
+@_json_endpoint
+def get_monthly_by_category(year: int | None = None):
     """Get monthly spending broken down by category."""
-    from collections import defaultdict
-
-    transactions = db.get_all_transactions(limit=10000)
-
-    # Group by year-month and category
-    monthly_cat: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
-
-    for t in transactions:
-        if year and t.date.year != year:
-            continue
-        if t.amount < 0:  # Only spending
-            month_key = t.date.strftime("%Y-%m")
-            cat = t.category.value if t.category else "Uncategorized"
-            monthly_cat[month_key][cat] += abs(t.amount)
-
-    # Get all categories
-    all_categories: set[str] = set()
-    for cats in monthly_cat.values():
-        all_categories.update(cats.keys())
+    start_date, end_date = _year_bounds(year)
+    rows = db.get_monthly_spending_by_category(start_date=start_date, end_date=end_date)
 
-    # Sort by month
-    sorted_months = sorted(monthly_cat.items())
+    # Group by year-month (rows arrive ordered by month)
+    monthly_cat: dict[str, dict[str, float]] = {}
+    for month, cat, amount in rows:
+        monthly_cat.setdefault(month, {})[cat] = amount
+    all_categories = {cat for _, cat, _ in rows}
 
     return {
         "data": [
             {"month": month, **{cat: round(cats.get(cat, 0), 2) for cat in all_categories}}
-            for month, cats in sorted_months
+            for month, cats in monthly_cat.items()
         ],
         "categories": sorted(all_categories),
     }
 
 
 @app.get("/dashboard/year-comparison")
-async def get_year_comparison():
+@_json_endpoint
+def get_year_comparison():
     """Get year-over-year spending comparison."""
-    from collections import defaultdict
-
-    transactions = db.get_all_transactions(limit=10000)
-
-    # Group by year
-    yearly: dict[int, dict] = defaultdict(lambda: {"spending": 0.0, "income": 0.0, "count": 0})
-
-    for t in transactions:
-        year = t.date.year
-        yearly[year]["count"] += 1
-        if t.amount < 0:
-            yearly[year]["spending"] += abs(t.amount)
-        else:
-            yearly[year]["income"] += t.amount
-
-    # Sort by year
-    sorted_years = sorted(yearly.items(), reverse=True)
+    # Sorted by year, newest first
+    sorted_years = db.get_yearly_totals()
 
     result = []
-    for i, (year, data) in enumerate(sorted_years):
+    for i, (year, spending, income, count) in enumerate(sorted_years):
         entry = {
             "year": year,
-            "spending": round(data["spending"], 2),
-            "income": round(data["income"], 2),
-            "count": data["count"],
+            "spending": round(spending, 2),
+            "income": round(income, 2),
+            "count": count,
         }
         # Calculate YoY change
         if i < len(sorted_years) - 1:
-            prev_year_data = sorted_years[i + 1][1]
-            if prev_year_data["spending"] > 0:
-                change = ((data["spending"] - prev_year_data["spending"]) / prev_year_data["spending"]) * 100
+            prev_year_spending = sorted_years[i + 1][1]
+            if prev_year_spending > 0:
+                change = ((spending - prev_year_spending) / prev_year_spending) * 100
                 entry["yoy_change"] = round(change, 1)
         result.append(entry)
 
@@ -501,39 +502,29 @@ async def get_year_comparison():
 
 
 @app.get("/dashboard/top-merchants")
-async def get_top_merchants(
+@_json_endpoint
+def get_top_merchants(
     limit: int = 10,
     year: int | None = None,
 ):
     """Get top merchants by spending."""
-    import re
     from collections import defaultdict
-    from datetime import date as date_type
 
     # Filter by year if specified
-    if year:
-        start_date = date_type(year, 1, 1)
-        end_date = date_type(year, 12, 31)
-        transactions = db.get_all_transactions(start_date=start_date, end_date=end_date, limit=10000)
-    else:
-        transactions = db.get_all_transactions(limit=10000)
+    start_date, end_date = _year_bounds(year)
 
     # Group by merchant (simplified name)
     merchants: dict[str, dict] = defaultdict(lambda: {"amount": 0.0, "count": 0})
 
-    for t in transactions:
-        if t.amount < 0:  # Only spending
-            # Simplify merchant name (remove numbers, codes, etc.)
-            name = t.description.upper()
-            # Remove common suffixes/prefixes
-            name = re.sub(r"\s*#\d+.*$", "", name)
-            name = re.sub(r"\s*\d{5,}.*$", "", name)
-            name = re.sub(r"^\s*(SQ\s*\*|TST\s*\*|PP\s*\*)", "", name)
-            name = name.strip()[:30]  # Limit length
+    # Spending is summed per exact description in SQL, so each distinct description is cleaned only once
+    for description, amount, count in db.get_spending_by_description(start_date=start_date, end_date=end_date):
+        # Simplify merchant name (remove numbers, codes, etc.)
+        name = _MERCHANT_NOISE_PATTERN.sub("", description.upper())
+        name = name.strip()[:30]  # Limit length
 
-            if name:
-                merchants[name]["amount"] += abs(t.amount)
-                merchants[name]["count"] += 1
+        if name:
+            merchants[name]["amount"] += amount
+            merchants[name]["count"] += count
 
     # Sort by amount and get top N
     sorted_merchants = sorted(merchants.items(), key=lambda x: x[1]["amount"], reverse=True)[:limit]
@@ -547,30 +538,21 @@ async def get_top_merchants(
 
 
 @app.get("/dashboard/spending-by-source")
-async def get_spending_by_source(year: int | None = None):
+@_json_endpoint
+def get_spending_by_source(year: int | None = None):
     """Get spending breakdown by card/source."""
-    from datetime import date as date_type
-
-    # Filter by year if specified
-    if year:
-        start_date = date_type(year, 1, 1)
-        end_date = date_type(year, 12, 31)
-        transactions = db.get_all_transactions(start_date=start_date, end_date=end_date, limit=10000)
-    else:
-        transactions = db.get_all_transactions(limit=10000)
+    start_date, end_date = _year_bounds(year)
 
-    # Group by source
+    # Group by source label
     by_source: dict[str, dict] = {}
     source_labels = {"chase_credit": "Chase", "amex": "Amex", "coinbase": "Coinbase"}
 
-    for t in transactions:
-        if t.amount < 0:  # Only spending
-            src = t.source.value
-            label = source_labels.get(src, src)
-            if label not in by_source:
-                by_source[label] = {"amount": 0.0, "count": 0}
-            by_source[label]["amount"] += abs(t.amount)
-            by_source[label]["count"] += 1
+    for src, amount, count in db.get_spending_by_source(start_date=start_date, end_date=end_date):
+        label = source_labels.get(src, src)
+        if label not in by_source:
+            by_source[label] = {"amount": 0.0, "count": 0}
+        by_source[label]["amount"] += amount
+        by_source[label]["count"] += count
 
     return {
         "data": [
@@ -581,9 +563,9 @@ async def get_spending_by_source(year: int | None = None):
 
 
 @app.get("/dashboard/daily-spending")
-async def get_daily_spending(days: int = 30, year: int | None = None):
+@_json_endpoint
+def get_daily_spending(days: int = 30, year: int | None = None):
     """Get daily spending for the last N days, or for a specific year."""
-    from collections import defaultdict
     from datetime import date as date_type
     from datetime import timedelta
 
@@ -596,37 +578,36 @@ async def get_daily_spending(days: int = 30, year: int | None = None):
         end_date = date_type.today()
         start_date = end_date - timedelta(days=days)
 
-    transactions = db.get_all_transactions(start_date=start_date, end_date=end_date, limit=10000)
+    daily = db.get_daily_spending(start_date=start_date, end_date=end_date)
 
-    # Group by day
-    daily: dict[str, float] = defaultdict(float)
+    # Fill in missing days with 0, walking the range by day ordinal
+    day_keys = [date_type.fromordinal(n).isoformat() for n in range(start_date.toordinal(), end_date.toordinal() + 1)]
 
-    for t in transactions:
-        if t.amount < 0:
-            day_key = t.date.isoformat()
-            daily[day_key] += abs(t.amount)
+    return {"data": [{"date": day_key, "amount": round(daily.get(day_key, 0), 2)} for day_key in day_keys]}
 
-    # Fill in missing days with 0
-    result = []
-    current = start_date
-    while current <= end_date:
-        day_key = current.isoformat()
-        result.append(
-            {
-                "date": day_key,
-                "amount": round(daily.get(day_key, 0), 2),
-            }
-        )
-        current += timedelta(days=1)
 
-    return {"data": result}
+@app.get("/dashboard/all")
+@_json_endpoint
+def get_dashboard_all(year: int | None = None, merchants_limit: int = 10, days: int = 30):
+    """Get every dashboard chart in a single request."""
+    return {
+        "overview": get_dashboard_overview.__wrapped__(year),
+        "spending_by_category": get_spending_by_category.__wrapped__(year),
+        "monthly_spending": get_monthly_spending.__wrapped__(year),
+        "monthly_by_category": get_monthly_by_category.__wrapped__(year),
+        "year_comparison": get_year_comparison.__wrapped__(),
+        "top_merchants": get_top_merchants.__wrapped__(limit=merchants_limit, year=year),
+        "spending_by_source": get_spending_by_source.__wrapped__(year),
+        "daily_spending": get_daily_spending.__wrapped__(days=days, year=year),
+    }
 
 
 # ==================== INSIGHTS ENDPOINTS ====================
 
 
 @app.get("/insights")
-async def get_insights(year: int | None = None):
+@_json_endpoint
+def get_insights(year: int | None = None):
     """
     Get auto-generated spending insights.
 
@@ -660,7 +641,8 @@ async def get_insights(year: int | None = None):
 
 
 @app.get("/insights/monthly")
-async def get_monthly_insights(year: int, month: int):
+@_json_endpoint
+def get_monthly_insights(year: int, month: int):
     """
     Get monthly spending insights compared to previous month.
 
@@ -697,7 +679,8 @@ async def get_monthly_insights(year: int, month: int):
 
 
 @app.get("/insights/quick-stats")
-async def get_quick_stats():
+@_json_endpoint
+def get_quick_stats():
     """
     Get quick stats for dashboard display.
 
@@ -1,7 +1,10 @@
 """Data models for Finalyzer."""
 
+from collections.abc import Mapping
 from datetime import date
 from enum import Enum
+from functools import cached_property
+from typing import Any, Self
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -15,6 +18,16 @@ class TransactionSource(str, Enum):
     COINBASE = "coinbase"
     UNKNOWN = "unknown"  # For unrecognized sources (generic parser)
 
+    @classmethod
+    def try_from(cls, value: object) -> "TransactionSource | None":
+        """Look up a source by its exact value, returning None instead of raising if there's no match."""
+        return SOURCES_BY_VALUE.get(value) if isinstance(value, str) else None
+
+
+# Value <-> member maps; plain dict lookups are cheaper than Enum.__call__ and the .value property in per-row loops
+SOURCES_BY_VALUE = {source.value: source for source in TransactionSource}
+SOURCE_VALUES = {source: source.value for source in TransactionSource}
+
 
 class TransactionCategory(str, Enum):
     """Transaction categories assigned by LLM."""
@@ -33,6 +46,15 @@ class TransactionCategory(str, Enum):
     TRANSFER = "Transfer"
     OTHER = "Other"
 
+    @classmethod
+    def try_from(cls, value: object) -> "TransactionCategory | None":
+        """Look up a category by its exact value, returning None instead of raising if there's no match."""
+        return CATEGORIES_BY_VALUE.get(value) if isinstance(value, str) else None
+
+
+CATEGORIES_BY_VALUE = {category.value: category for category in TransactionCategory}
+CATEGORY_VALUES = {category: category.value for category in TransactionCategory}
+
 
 class Transaction(BaseModel):
     """A financial transaction."""
@@ -50,6 +72,24 @@ class Transaction(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    @cached_property
+    def description_lower(self) -> str:
+        """Lowercased description, computed once for repeated case-insensitive matching."""
+        return self.description.lower()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Drop the cached lowercase copy when the description changes
+        if name == "description":
+            self.__dict__.pop("description_lower", None)
+        super().__setattr__(name, value)
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the transaction, recomputing description_lower if the update changes the description."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update and "description" in update:
+            copied.__dict__.pop("description_lower", None)
+        return copied
+
 
 class TransactionCreate(BaseModel):
     """Transaction data for creation (before ID assignment)."""
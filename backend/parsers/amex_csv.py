@@ -1,13 +1,17 @@
 """Parser for American Express CSV exports."""
 
 import csv
+import re
 from datetime import datetime
+from functools import lru_cache
 from io import StringIO
 
 from backend.models import Transaction, TransactionSource
 from backend.parsers.validation import (
     ParseResult,
     ValidationError,
+    build_date,
+    expand_two_digit_year,
     log_parse_result,
     logger,
     parse_amount_safe,
@@ -17,6 +21,32 @@ from backend.parsers.validation import (
 )
 from backend.services.dedup import compute_transaction_hash
 
+# Description fragments that mark a credit card bill payment rather than spending
+PAYMENT_KEYWORDS = (
+    "payment received",
+    "payment - thank you",
+    "payment thank you",
+    "autopay payment",
+    "automatic payment",
+    "online payment",
+    "ach payment",
+    "mobile payment - thank you",
+)
+
+# Header keywords for each standard field, checked in order; the first field with a matching keyword wins
+_HEADER_KEYWORDS = (
+    ("date", ("date",)),
+    ("description", ("description", "merchant")),
+    ("amount", ("amount",)),
+    ("category", ("category",)),
+    ("reference", ("reference",)),
+    ("card_member", ("card member", "cardholder")),
+    ("account", ("account",)),
+)
+
+# Month/day/year separated by "/" or "-", or ISO year-month-day
+_DATE_PATTERN = re.compile(r"(\d{1,2})([/-])(\d{1,2})\2(\d{4}|\d{2})|(\d{4})-(\d{1,2})-(\d{1,2})")
+
 
 def parse_amex_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     """
@@ -46,10 +76,11 @@ def parse_amex_csv(contents: bytes, file_hash: str) -> list[Transaction]:
         logger.error(f"Amex CSV validation failed: {e}")
         raise
 
-    reader = csv.DictReader(StringIO(text))
+    # Read rows as plain lists and index columns by position, rather than building a dict per row
+    reader = csv.reader(StringIO(text))
 
     # Normalize header names (Amex headers can vary)
-    fieldnames = reader.fieldnames
+    fieldnames = next(reader, None)
     if not fieldnames:
         logger.warning("Amex CSV: No headers found")
         return result.transactions
@@ -57,6 +88,10 @@ def parse_amex_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     # Map common header variations
     header_map = _build_header_map(fieldnames)
 
+    # Column of each mapped field; a repeated header resolves to its last column, as with csv.DictReader
+    positions = {name: index for index, name in enumerate(fieldnames)}
+    columns = {field: positions[header] for field, header in header_map.items()}
+
     # Verify required headers are present
     if "date" not in header_map or "description" not in header_map or "amount" not in header_map:
         missing = []
@@ -68,16 +103,22 @@ def parse_amex_csv(contents: bytes, file_hash: str) -> list[Transaction]:
             missing.append("amount")
         logger.warning(f"Amex CSV: Missing required headers: {missing}")
         result.errors.append(f"Missing required headers: {', '.join(missing)}")
+        # Every row would be skipped for a missing field, so don't scan them
+        log_parse_result(result, "Amex CSV")
+        return result.transactions
 
     for row in reader:
+        # Skip blank lines
+        if not row:
+            continue
         result.total_rows_processed += 1
 
         try:
-            # Extract fields using mapped headers
-            date_str = _get_field(row, header_map, "date")
-            description = _get_field(row, header_map, "description")
-            amount_str = _get_field(row, header_map, "amount")
-            raw_category = _get_field(row, header_map, "category")
+            # Extract fields using mapped columns
+            date_str = _get_field(row, columns, "date")
+            description = _get_field(row, columns, "description")
+            amount_str = _get_field(row, columns, "amount")
+            raw_category = _get_field(row, columns, "category")
 
             # Validate required fields
             if not date_str or not description or not amount_str:
@@ -154,68 +195,57 @@ def _build_header_map(fieldnames: list[str]) -> dict[str, str]:
 
     # Normalize and map headers
     for field in fieldnames:
-        field_lower = field.lower().strip()
-
-        if "date" in field_lower:
-            header_map["date"] = field
-        elif "description" in field_lower or "merchant" in field_lower:
-            header_map["description"] = field
-        elif "amount" in field_lower:
-            header_map["amount"] = field
-        elif "category" in field_lower:
-            header_map["category"] = field
-        elif "reference" in field_lower:
-            header_map["reference"] = field
-        elif "card member" in field_lower or "cardholder" in field_lower:
-            header_map["card_member"] = field
-        elif "account" in field_lower:
-            header_map["account"] = field
+        standard_field = _standard_field(field.lower().strip())
+        if standard_field:
+            header_map[standard_field] = field
 
     return header_map
 
 
-def _get_field(row: dict, header_map: dict[str, str], field: str) -> str:
-    """Get a field value using the header map."""
-    if field in header_map:
-        return row.get(header_map[field], "").strip()
-    return ""
+@lru_cache(maxsize=256)
+def _standard_field(header_lower: str) -> str | None:
+    """Map a normalized header to its standard field name; cached since exports reuse the same headers."""
+    for standard_field, keywords in _HEADER_KEYWORDS:
+        if any(keyword in header_lower for keyword in keywords):
+            return standard_field
+    return None
 
 
+def _get_field(row: list[str], columns: dict[str, int], field: str) -> str:
+    """Get a field value by its mapped column, or "" if the field is unmapped or the row is short."""
+    index = columns.get(field)
+    if index is None or index >= len(row):
+        return ""
+    return row[index].strip()
+
+
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> datetime | None:
     """Parse date string in various formats."""
-    formats = [
-        "%m/%d/%Y",  # 01/15/2024
-        "%m/%d/%y",  # 01/15/24
-        "%Y-%m-%d",  # 2024-01-15
-        "%d/%m/%Y",  # 15/01/2024
-        "%m-%d-%Y",  # 01-15-2024
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
+    # Supported: 01/15/2024, 01/15/24, 2024-01-15, 15/01/2024 and 01-15-2024
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if not match:
+        return None
 
-    return None
+    first, separator, second, year, iso_year, iso_month, iso_day = match.groups()
+    if iso_year:
+        return build_date(int(iso_year), int(iso_month), int(iso_day))
+
+    # Two-digit years are only accepted month first with slashes
+    if len(year) == 2:
+        return build_date(expand_two_digit_year(int(year)), int(first), int(second)) if separator == "/" else None
+
+    # Month first, falling back to day first for slash-separated dates
+    txn_date = build_date(int(year), int(first), int(second))
+    if txn_date is None and separator == "/":
+        txn_date = build_date(int(year), int(second), int(first))
+    return txn_date
 
 
 def _is_payment(description: str) -> bool:
     """Check if this is a credit card payment (not actual spending)."""
     description_lower = description.lower()
-
-    payment_keywords = [
-        "payment received",
-        "payment - thank you",
-        "payment thank you",
-        "autopay payment",
-        "automatic payment",
-        "online payment",
-        "ach payment",
-        "mobile payment - thank you",
-    ]
-
-    for keyword in payment_keywords:
+    for keyword in PAYMENT_KEYWORDS:
         if keyword in description_lower:
             return True
 
@@ -1,13 +1,90 @@
 """Parser for American Express Year-End Summary PDF."""
 
 import re
-from datetime import datetime
+import sys
+from bisect import bisect_right
+from datetime import date, datetime
+from functools import lru_cache
 from io import BytesIO
 
 import pdfplumber
 
 from backend.models import Transaction, TransactionSource
-from backend.services.dedup import compute_transaction_hash
+from backend.parsers.pdf_pages import extract_page_texts
+from backend.parsers.validation import build_date, expand_two_digit_year
+from backend.services.dedup import compute_transaction_hashes
+
+# Fragments of statement headers and labels that never appear in a transaction description
+HEADER_LABEL_KEYWORDS = (
+    "card member",
+    "account number",
+    "subtotal",
+    "total",
+    "charges",
+    "credits",
+    "date",
+    "month billed",
+    "transaction",
+    "xxxx-",
+    "spending",
+    "year-end",
+    "american express",
+    "prepared for",
+    "includes charges",
+)
+
+# Month/day/year with a two- or four-digit year
+_DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})")
+
+# Category section headers, in the order ties between headers at the same offset are resolved
+CATEGORY_HEADERS = (
+    "Entertainment",
+    "Merchandise & Supplies",
+    "Restaurant",
+    "Transportation",
+    "Travel",
+    "Fees & Adjustments",
+    "Other",
+    "Airline",
+    "Travel Agencies",
+    "Taxis & Coach",
+    "Rail Services",
+    "Miscellaneous",
+    "Internet Purchase",
+)
+
+# Pattern to match transaction lines:
+# Date | Month | Description Location | Amount
+# Examples:
+# 01/25/2025 February DELTA AIR LINES ATLANTA $401.97
+# 06/18/2025 July ApPay TST* HONOLULUHONOLULU HI $20.52
+_TRANSACTION_LINE_PATTERN = re.compile(
+    r"(\d{1,2}/\d{1,2}/\d{4})\s+"  # Date (MM/DD/YYYY)
+    r"(\w+)\s+"  # Month billed
+    r"(.+?)\s+"  # Description (non-greedy)
+    r"\$?([\d,]+\.?\d*)\s*$",  # Amount
+    re.MULTILINE,
+)
+
+# Table cells that start with a date, and cells that are entirely an amount once commas are removed
+_TABLE_DATE_PATTERN = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+_TABLE_AMOUNT_PATTERN = re.compile(r"\$?[\d,]+\.?\d*$")
+
+# Pages where the text pattern finds at least this many transactions skip table extraction
+_TEXT_ROWS_TO_SKIP_TABLES = 5
+
+# Where the statement year is printed, in order of preference. The last pattern is a fallback for any year.
+_YEAR_PATTERNS = (
+    re.compile(r"(\d{4})\s*Year-End Summary", re.IGNORECASE),
+    re.compile(r"through December 31,?\s*(\d{4})", re.IGNORECASE),
+    re.compile(r"(20\d{2})"),
+)
+
+# The year is printed in the document header, so only this much leading text is searched for it
+_YEAR_SEARCH_CHARS = 4096
+
+# Merchant descriptions up to this length repeat across a year of statements and are interned
+_INTERN_MAX_LENGTH = 64
 
 
 def is_amex_year_end_summary(text: str) -> bool:
@@ -45,28 +122,30 @@ def parse_amex_year_end_pdf(contents: bytes, file_hash: str) -> list[Transaction
     - Credits amount (optional)
     """
     transactions: list[Transaction] = []
-    seen_hashes: set[str] = set()
+    seen_keys: set[tuple[date, str, str]] = set()
 
     try:
         with pdfplumber.open(BytesIO(contents)) as pdf:
-            all_text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                all_text += page_text + "\n"
+            # Extract each page's text once; it is reused for year detection and parsing
+            page_texts = extract_page_texts(contents, pdf)
 
             # Extract the year from the document
-            year = _extract_year(all_text)
+            year = _extract_year("\n".join(page_texts)[:_YEAR_SEARCH_CHARS])
 
             # Parse transactions from all pages
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                page_transactions = _parse_page_transactions(page_text, year, file_hash, seen_hashes)
+            for page, page_text in zip(pdf.pages, page_texts, strict=True):
+                page_transactions = _parse_page_transactions(page_text, year, file_hash, seen_keys)
                 transactions.extend(page_transactions)
 
+                # Table extraction is by far the slowest step, so only fall back to it
+                # on pages where the text pattern found few transactions
+                if len(page_transactions) >= _TEXT_ROWS_TO_SKIP_TABLES:
+                    continue
+
                 # Also try table extraction for better accuracy
                 tables = page.extract_tables()
                 for table in tables:
-                    table_transactions = _parse_table_transactions(table, year, file_hash, seen_hashes)
+                    table_transactions = _parse_table_transactions(table, year, file_hash, seen_keys)
                     transactions.extend(table_transactions)
 
     except Exception as e:
@@ -75,47 +154,28 @@ def parse_amex_year_end_pdf(contents: bytes, file_hash: str) -> list[Transaction
     return transactions
 
 
-def _extract_year(text: str) -> int:
-    """Extract the year from the document."""
-    # Look for "Year-End Summary" followed by year
-    year_match = re.search(r"(\d{4})\s*Year-End Summary", text, re.IGNORECASE)
-    if year_match:
-        return int(year_match.group(1))
-
-    # Look for "Includes charges from January 1 through December 31, YYYY"
-    year_match = re.search(r"through December 31,?\s*(\d{4})", text, re.IGNORECASE)
-    if year_match:
-        return int(year_match.group(1))
-
-    # Fallback: look for any 4-digit year
-    year_match = re.search(r"20\d{2}", text)
-    if year_match:
-        return int(year_match.group(0))
+def _extract_year(header_text: str) -> int:
+    """Extract the year from the document header."""
+    # e.g. "2025 Year-End Summary", "through December 31, 2024", then any 4-digit year
+    for pattern in _YEAR_PATTERNS:
+        year_match = pattern.search(header_text)
+        if year_match:
+            return int(year_match.group(1))
 
     # Default to current year
     return datetime.now().year
 
 
-def _parse_page_transactions(text: str, year: int, file_hash: str, seen_hashes: set[str]) -> list[Transaction]:
+def _parse_page_transactions(
+    text: str, year: int, file_hash: str, seen_keys: set[tuple[date, str, str]]
+) -> list[Transaction]:
     """Parse transactions from page text using regex patterns."""
-    transactions: list[Transaction] = []
+    candidates: list[tuple[datetime, str, float, str | None]] = []
 
-    # Pattern to match transaction lines:
-    # Date | Month | Description Location | Amount
-    # Examples:
-    # 01/25/2025 February DELTA AIR LINES ATLANTA $401.97
-    # 06/18/2025 July ApPay TST* HONOLULUHONOLULU HI $20.52
-
-    # Pattern for transaction with date, month, description, and amount
-    txn_pattern = re.compile(
-        r"(\d{1,2}/\d{1,2}/\d{4})\s+"  # Date (MM/DD/YYYY)
-        r"(\w+)\s+"  # Month billed
-        r"(.+?)\s+"  # Description (non-greedy)
-        r"\$?([\d,]+\.?\d*)\s*$",  # Amount
-        re.MULTILINE,
-    )
+    # Locate the category headers once per page rather than rescanning the prefix for every transaction
+    category_index = _index_category_headers(text)
 
-    for match in txn_pattern.finditer(text):
+    for match in _TRANSACTION_LINE_PATTERN.finditer(text):
         try:
             date_str = match.group(1)
             # month_billed = match.group(2)  # Not used but available
@@ -145,42 +205,25 @@ def _parse_page_transactions(text: str, year: int, file_hash: str, seen_hashes:
             amount = -abs(amount)
 
             # Extract raw category from context (if available)
-            raw_category = _extract_category_from_context(text, match.start())
-
-            # Create transaction hash
-            txn_hash = compute_transaction_hash(TransactionSource.AMEX, txn_date, description, amount)
+            raw_category = _category_before(category_index, match.start())
 
-            # Skip duplicates
-            if txn_hash in seen_hashes:
-                continue
-            seen_hashes.add(txn_hash)
-
-            transaction = Transaction(
-                source=TransactionSource.AMEX,
-                source_file_hash=file_hash,
-                transaction_hash=txn_hash,
-                date=txn_date,
-                description=description,
-                amount=amount,
-                raw_category=raw_category,
-            )
-            transactions.append(transaction)
+            candidates.append((txn_date, description, amount, raw_category))
 
         except (ValueError, IndexError) as e:
             print(f"Error parsing transaction: {e}")
             continue
 
-    return transactions
+    return _build_transactions(candidates, file_hash, seen_keys)
 
 
 def _parse_table_transactions(
-    table: list[list[str | None]], year: int, file_hash: str, seen_hashes: set[str]
+    table: list[list[str | None]], year: int, file_hash: str, seen_keys: set[tuple[date, str, str]]
 ) -> list[Transaction]:
     """Parse transactions from extracted table data."""
-    transactions: list[Transaction] = []
+    candidates: list[tuple[datetime, str, float, str | None]] = []
 
     if not table or len(table) < 2:
-        return transactions
+        return []
 
     # Find the header row to understand column positions
     header_row = None
@@ -203,7 +246,7 @@ def _parse_table_transactions(
         try:
             # Try to extract date, description, amount from row
             date_str = None
-            description = None
+            description_parts: list[str] = []
             amount_str = None
 
             for cell in row:
@@ -212,21 +255,19 @@ def _parse_table_transactions(
                 cell_str = str(cell).strip()
 
                 # Check if it's a date
-                if re.match(r"\d{1,2}/\d{1,2}/\d{4}", cell_str):
+                if _TABLE_DATE_PATTERN.match(cell_str):
                     date_str = cell_str
                 # Check if it's an amount
-                elif re.match(r"\$?[\d,]+\.?\d*$", cell_str.replace(",", "")):
+                elif _TABLE_AMOUNT_PATTERN.match(cell_str.replace(",", "")):
                     if not amount_str:  # Take first amount (charges, not credits)
                         amount_str = cell_str
                 # Otherwise it might be description
                 elif len(cell_str) > 5 and not _is_header_or_label(cell_str):
-                    if description:
-                        description += " " + cell_str
-                    else:
-                        description = cell_str
+                    description_parts.append(cell_str)
 
-            if not date_str or not description or not amount_str:
+            if not date_str or not description_parts or not amount_str:
                 continue
+            description = " ".join(description_parts)
 
             # Parse date
             txn_date = _parse_date(date_str, year)
@@ -244,14 +285,38 @@ def _parse_table_transactions(
             # Make negative
             amount = -abs(amount)
 
-            # Create hash
-            txn_hash = compute_transaction_hash(TransactionSource.AMEX, txn_date, description, amount)
+            candidates.append((txn_date, description, amount, None))
 
-            # Skip duplicates
-            if txn_hash in seen_hashes:
-                continue
-            seen_hashes.add(txn_hash)
+        except (ValueError, IndexError):
+            continue
+
+    return _build_transactions(candidates, file_hash, seen_keys)
+
+
+def _build_transactions(
+    candidates: list[tuple[datetime, str, float, str | None]],
+    file_hash: str,
+    seen_keys: set[tuple[date, str, str]],
+) -> list[Transaction]:
+    """Drop rows whose (date, lowercased description, amount to the cent) was already seen; hash and build the rest."""
+    fresh: list[tuple[datetime, str, float, str | None]] = []
+    for candidate in candidates:
+        txn_date, description, amount, _ = candidate
+
+        # Skip duplicates, keyed on the same normalized fields the transaction hash covers
+        key = (txn_date, description.strip().lower(), f"{amount:.2f}")
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        fresh.append(candidate)
 
+    transactions: list[Transaction] = []
+    txn_hashes = compute_transaction_hashes(
+        TransactionSource.AMEX, [(txn_date, description, amount) for txn_date, description, amount, _ in fresh]
+    )
+
+    for (txn_date, description, amount, raw_category), txn_hash in zip(fresh, txn_hashes, strict=True):
+        try:
             transaction = Transaction(
                 source=TransactionSource.AMEX,
                 source_file_hash=file_hash,
@@ -259,27 +324,27 @@ def _parse_table_transactions(
                 date=txn_date,
                 description=description,
                 amount=amount,
+                raw_category=raw_category,
             )
-            transactions.append(transaction)
-
-        except (ValueError, IndexError):
+        except ValueError as e:
+            print(f"Error parsing transaction: {e}")
             continue
+        transactions.append(transaction)
 
     return transactions
 
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str, default_year: int) -> datetime | None:
     """Parse date string."""
-    formats = [
-        "%m/%d/%Y",  # 01/25/2025
-        "%m/%d/%y",  # 01/25/25
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
+    # 01/25/2025 or 01/25/25
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if match:
+        month, day, year = match.groups()
+        full_year = int(year) if len(year) == 4 else expand_two_digit_year(int(year))
+        txn_date = build_date(full_year, int(month), int(day))
+        if txn_date:
+            return txn_date
 
     # Try parsing with just month/day and use default year
     try:
@@ -325,68 +390,54 @@ def _clean_description(description: str) -> str:
     # Capitalize properly
     description = description.strip()
 
+    # Share one string object per recurring merchant instead of one per transaction
+    if len(description) <= _INTERN_MAX_LENGTH:
+        description = sys.intern(description)
+
     return description
 
 
 def _is_header_or_label(text: str) -> bool:
     """Check if text is a header or label, not a transaction."""
     text_lower = text.lower()
-
-    skip_patterns = [
-        "card member",
-        "account number",
-        "subtotal",
-        "total",
-        "charges",
-        "credits",
-        "date",
-        "month billed",
-        "transaction",
-        "xxxx-",
-        "spending",
-        "year-end",
-        "american express",
-        "prepared for",
-        "includes charges",
-    ]
-
-    for pattern in skip_patterns:
-        if pattern in text_lower:
+    for keyword in HEADER_LABEL_KEYWORDS:
+        if keyword in text_lower:
             return True
 
     return False
 
 
-def _extract_category_from_context(text: str, position: int) -> str | None:
-    """Try to extract category from surrounding context."""
-    # Look backwards for category headers
-    categories = [
-        "Entertainment",
-        "Merchandise & Supplies",
-        "Restaurant",
-        "Transportation",
-        "Travel",
-        "Fees & Adjustments",
-        "Other",
-        "Airline",
-        "Travel Agencies",
-        "Taxis & Coach",
-        "Rail Services",
-        "Miscellaneous",
-        "Internet Purchase",
-    ]
-
-    # Get text before the transaction
-    context = text[:position]
-
-    # Find the most recent category header
-    last_category = None
-    last_pos = -1
-
-    for category in categories:
-        pos = context.rfind(category)
-        if pos > last_pos:
-            last_pos = pos
-            last_category = category
-
-    return last_category
+def _index_category_headers(text: str) -> tuple[list[int], list[str]]:
+    """
+    Index every category header occurrence in the text.
+
+    Returns the sorted end offsets of the occurrences and, for each one, the most
+    recent header among the occurrences ending at or before it. Occurrences may
+    overlap (e.g. "Travel" inside "Travel Agencies"), so they are found with
+    str.find rather than a single regex scan.
+    """
+    occurrences: list[tuple[int, int, int, str]] = []
+    for priority, category in enumerate(CATEGORY_HEADERS):
+        start = text.find(category)
+        while start != -1:
+            occurrences.append((start + len(category), start, -priority, category))
+            start = text.find(category, start + 1)
+    occurrences.sort()
+
+    ends: list[int] = []
+    latest: list[str] = []
+    best: tuple[int, int, str] | None = None
+    for end, start, neg_priority, category in occurrences:
+        if best is None or (start, neg_priority) > best[:2]:
+            best = (start, neg_priority, category)
+        ends.append(end)
+        latest.append(best[2])
+
+    return ends, latest
+
+
+def _category_before(category_index: tuple[list[int], list[str]], position: int) -> str | None:
+    """Return the most recent category header that ends before the given position."""
+    ends, latest = category_index
+    count = bisect_right(ends, position)
+    return latest[count - 1] if count else None
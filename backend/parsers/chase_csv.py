@@ -1,13 +1,17 @@
 """Parser for Chase credit card CSV exports."""
 
 import csv
+import re
 from datetime import datetime
+from functools import lru_cache
 from io import StringIO
 
 from backend.models import Transaction, TransactionSource
 from backend.parsers.validation import (
     ParseResult,
     ValidationError,
+    build_date,
+    expand_two_digit_year,
     log_parse_result,
     logger,
     parse_amount_safe,
@@ -17,6 +21,21 @@ from backend.parsers.validation import (
 )
 from backend.services.dedup import compute_transaction_hash
 
+# Description fragments that mark a credit card bill payment rather than spending
+PAYMENT_KEYWORDS = (
+    "payment thank you",
+    "automatic payment",
+    "autopay",
+    "online payment",
+    "payment - thank you",
+    "mobile payment",
+    "ach payment",
+    "payment received",
+)
+
+# Month/day/year with a two- or four-digit year
+_DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})")
+
 
 def parse_chase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     """
@@ -38,9 +57,10 @@ def parse_chase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
         logger.error(f"Chase CSV validation failed: {e}")
         raise
 
-    reader = csv.DictReader(StringIO(text))
+    # Read rows as plain lists and index columns by position, rather than building a dict per row
+    reader = csv.reader(StringIO(text))
 
-    fieldnames = reader.fieldnames
+    fieldnames = next(reader, None)
     if not fieldnames:
         logger.warning("Chase CSV: No headers found")
         return result.transactions
@@ -51,17 +71,31 @@ def parse_chase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     if missing_headers:
         logger.warning(f"Chase CSV: Missing expected headers: {missing_headers}")
         result.errors.append(f"Missing headers: {', '.join(missing_headers)}")
+        # Every row would be skipped for a missing field, so don't scan them
+        log_parse_result(result, "Chase CSV")
+        return result.transactions
+
+    # Column of each header; a repeated header resolves to its last column, as with csv.DictReader
+    columns = {name: index for index, name in enumerate(fieldnames)}
+    date_col = columns.get("Transaction Date")
+    description_col = columns.get("Description")
+    amount_col = columns.get("Amount")
+    category_col = columns.get("Category")
+    type_col = columns.get("Type")
 
     for row in reader:
+        # Skip blank lines
+        if not row:
+            continue
         result.total_rows_processed += 1
 
         try:
             # Extract fields - Chase CSV has consistent headers
-            date_str = row.get("Transaction Date", "").strip()
-            description = row.get("Description", "").strip()
-            amount_str = row.get("Amount", "").strip()
-            raw_category = row.get("Category", "").strip()
-            txn_type = row.get("Type", "").strip().lower()
+            date_str = _get_field(row, date_col)
+            description = _get_field(row, description_col)
+            amount_str = _get_field(row, amount_col)
+            raw_category = _get_field(row, category_col)
+            txn_type = _get_field(row, type_col).lower()
 
             # Validate required fields
             if not date_str or not description or not amount_str:
@@ -125,6 +159,13 @@ def parse_chase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     return result.transactions
 
 
+def _get_field(row: list[str], index: int | None) -> str:
+    """Get a field value by column, or "" if the column is missing or the row is short."""
+    if index is None or index >= len(row):
+        return ""
+    return row[index].strip()
+
+
 def _is_payment(txn_type: str, description: str, category: str) -> bool:
     """
     Check if this transaction is a credit card payment (not actual spending).
@@ -133,47 +174,27 @@ def _is_payment(txn_type: str, description: str, category: str) -> bool:
     - They're just transfers from your bank account to pay the CC bill
     - They'd double-count spending (you already tracked the original purchase)
     """
-    description_lower = description.lower()
-    category_lower = category.lower() if category else ""
-
     # Check transaction type - Chase uses "Payment" for bill payments
     if txn_type == "payment":
         return True
 
     # Check description patterns for payments
-    payment_keywords = [
-        "payment thank you",
-        "automatic payment",
-        "autopay",
-        "online payment",
-        "payment - thank you",
-        "mobile payment",
-        "ach payment",
-        "payment received",
-    ]
-
-    for keyword in payment_keywords:
+    description_lower = description.lower()
+    for keyword in PAYMENT_KEYWORDS:
         if keyword in description_lower:
             return True
 
     # Check category
-    if "payment" in category_lower:
-        return True
-
-    return False
+    return bool(category) and "payment" in category.lower()
 
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> datetime | None:
-    """Parse date string in Chase CSV format."""
-    formats = [
-        "%m/%d/%Y",  # 12/30/2024
-        "%m/%d/%y",  # 12/30/24
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
-
-    return None
+    """Parse date string in Chase CSV format (12/30/2024 or 12/30/24)."""
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if not match:
+        return None
+
+    month, day, year = match.groups()
+    full_year = int(year) if len(year) == 4 else expand_two_digit_year(int(year))
+    return build_date(full_year, int(month), int(day))
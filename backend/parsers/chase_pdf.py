@@ -7,6 +7,7 @@ from io import BytesIO
 import pdfplumber
 
 from backend.models import Transaction, TransactionSource
+from backend.parsers.pdf_pages import extract_page_texts
 from backend.parsers.validation import (
     ParseResult,
     ValidationError,
@@ -18,6 +19,49 @@ from backend.parsers.validation import (
 )
 from backend.services.dedup import compute_transaction_hash
 
+# Chase transaction patterns - typically: MM/DD Description Amount
+# The amount can be positive (credits) or negative (charges)
+# Pattern: date, description, amount (with optional minus sign and commas). The second
+# alternative catches lines where the amount follows the description after a wide gap
+# but is not at the end of the line. Where both could match, the first wins, as it
+# would if the patterns were tried one after the other. Whitespace is matched as
+# [^\S\n] so that a match never crosses a line break when scanning the whole text.
+_TRANSACTION_PATTERN = re.compile(
+    r"(\d{2}/\d{2})[^\S\n]+"  # Date MM/DD
+    r"(.+?)[^\S\n]+"  # Description (non-greedy)
+    r"(-?\$?[\d,]+\.\d{2})[^\S\n]*$"  # Amount
+    r"|(\d{2}/\d{2})[^\S\n]+"  # Date MM/DD
+    r"(.+?)[^\S\n]{2,}"  # Description followed by multiple spaces
+    r"(-?[\d,]+\.\d{2})",  # Amount
+    re.MULTILINE,
+)
+
+# Lines containing any of these (in any case) are headers or other non-transaction lines
+HEADER_LINE_KEYWORDS = (
+    "ACCOUNT SUMMARY",
+    "PAYMENT INFORMATION",
+    "ACCOUNT ACTIVITY",
+    "TRANSACTION",
+    "DATE",
+    "DESCRIPTION",
+    "AMOUNT",
+    "PREVIOUS BALANCE",
+    "NEW BALANCE",
+    "PAYMENT DUE",
+    "CREDIT LIMIT",
+    "AVAILABLE CREDIT",
+)
+
+# Section headings that the transaction pattern can mistake for a description
+HEADER_DESCRIPTIONS = frozenset(
+    {
+        "PAYMENTS AND OTHER CREDITS",
+        "PURCHASE",
+        "FEES CHARGED",
+        "INTEREST CHARGED",
+    }
+)
+
 
 def parse_chase_pdf(contents: bytes, file_hash: str) -> list[Transaction]:
     """
@@ -42,11 +86,7 @@ def parse_chase_pdf(contents: bytes, file_hash: str) -> list[Transaction]:
 
     try:
         with pdfplumber.open(BytesIO(contents)) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
+            full_text = "".join(text + "\n" for text in extract_page_texts(contents, pdf) if text)
 
             if not full_text.strip():
                 logger.warning("Chase PDF: No text content extracted")
@@ -91,128 +131,89 @@ def _extract_transactions(text: str, year: int, file_hash: str, result: ParseRes
     """Extract transactions from Chase PDF text."""
     transactions: list[Transaction] = []
 
-    # Chase transaction patterns - typically: MM/DD Description Amount
-    # The amount can be positive (credits) or negative (charges)
-    # Pattern: date, description, amount (with optional minus sign and commas)
-    transaction_pattern = re.compile(
-        r"(\d{2}/\d{2})\s+"  # Date MM/DD
-        r"(.+?)\s+"  # Description (non-greedy)
-        r"(-?\$?[\d,]+\.\d{2})\s*$",  # Amount
-        re.MULTILINE,
-    )
-
-    # Also try alternative pattern where amount might be on same line differently
-    alt_pattern = re.compile(
-        r"(\d{2}/\d{2})\s+"  # Date MM/DD
-        r"(.+?)\s{2,}"  # Description followed by multiple spaces
-        r"(-?[\d,]+\.\d{2})",  # Amount
-        re.MULTILINE,
-    )
-
-    lines = text.split("\n")
-
-    for line in lines:
-        result.total_rows_processed += 1
+    # Every line counts as processed; lines that don't become transactions are counted as skipped
+    line_count = text.count("\n") + 1
+    result.total_rows_processed += line_count
+
+    # Scan the whole text in one pass rather than splitting it and searching line by line
+    previous_line_start = -1
+    for match in _TRANSACTION_PATTERN.finditer(text):
+        # Only the first match on a line counts
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        if line_start == previous_line_start:
+            continue
+        previous_line_start = line_start
 
         # Skip header lines and non-transaction lines
-        if _is_header_line(line):
-            result.rows_skipped += 1
+        line_end = text.find("\n", match.end())
+        if _is_header_line(text[line_start:line_end] if line_end != -1 else text[line_start:]):
             continue
 
-        # Try primary pattern
-        match = transaction_pattern.search(line)
-        if not match:
-            match = alt_pattern.search(line)
+        # Groups 1-3 hold the primary pattern's fields, 4-6 the alternative's
+        date_str, description, amount_str = match.group(1, 2, 3) if match.group(1) else match.group(4, 5, 6)
+        description = description.strip()
 
-        if match:
-            date_str = match.group(1)
-            description = match.group(2).strip()
-            amount_str = match.group(3)
-
-            # Skip if description looks like a header
-            if _is_header_description(description):
-                result.rows_skipped += 1
-                continue
-
-            # Parse date (add year)
-            try:
-                month, day = map(int, date_str.split("/"))
-                txn_date = datetime(year, month, day).date()
-            except ValueError:
-                result.rows_skipped += 1
-                result.warnings.append(f"Invalid date: {date_str}")
-                continue
-
-            # Validate date
-            if not validate_date(txn_date):
-                result.rows_skipped += 1
-                result.warnings.append(f"Date out of range: {txn_date}")
-                continue
-
-            # Parse amount (remove $ and commas, handle negatives)
-            amount = _parse_amount(amount_str)
-
-            # Validate amount
-            if not validate_amount(amount):
-                result.rows_skipped += 1
-                result.warnings.append(f"Invalid amount: {amount_str}")
-                continue
-
-            # Chase statements show charges as positive, payments as negative
-            # We want expenses as negative, credits as positive
-            # So we negate the amount
-            amount = -amount
-
-            # Create transaction
-            txn_hash = compute_transaction_hash(TransactionSource.CHASE_CREDIT, txn_date, description, amount)
-
-            transaction = Transaction(
-                source=TransactionSource.CHASE_CREDIT,
-                source_file_hash=file_hash,
-                transaction_hash=txn_hash,
-                date=txn_date,
-                description=description,
-                amount=amount,
-            )
-            transactions.append(transaction)
-        else:
-            # Line didn't match any pattern
-            result.rows_skipped += 1
+        # Skip if description looks like a header
+        if _is_header_description(description):
+            continue
+
+        # Parse date (add year)
+        try:
+            month, day = map(int, date_str.split("/"))
+            txn_date = datetime(year, month, day).date()
+        except ValueError:
+            result.warnings.append(f"Invalid date: {date_str}")
+            continue
+
+        # Validate date
+        if not validate_date(txn_date):
+            result.warnings.append(f"Date out of range: {txn_date}")
+            continue
+
+        # Parse amount (remove $ and commas, handle negatives)
+        amount = _parse_amount(amount_str)
+
+        # Validate amount
+        if not validate_amount(amount):
+            result.warnings.append(f"Invalid amount: {amount_str}")
+            continue
+
+        # Chase statements show charges as positive, payments as negative
+        # We want expenses as negative, credits as positive
+        # So we negate the amount
+        amount = -amount
+
+        # Create transaction
+        txn_hash = compute_transaction_hash(TransactionSource.CHASE_CREDIT, txn_date, description, amount)
+
+        transaction = Transaction(
+            source=TransactionSource.CHASE_CREDIT,
+            source_file_hash=file_hash,
+            transaction_hash=txn_hash,
+            date=txn_date,
+            description=description,
+            amount=amount,
+        )
+        transactions.append(transaction)
+
+    result.rows_skipped += line_count - len(transactions)
 
     return transactions
 
 
 def _is_header_line(line: str) -> bool:
     """Check if a line is a header or non-transaction line."""
-    header_keywords = [
-        "ACCOUNT SUMMARY",
-        "PAYMENT INFORMATION",
-        "ACCOUNT ACTIVITY",
-        "TRANSACTION",
-        "DATE",
-        "DESCRIPTION",
-        "AMOUNT",
-        "PREVIOUS BALANCE",
-        "NEW BALANCE",
-        "PAYMENT DUE",
-        "CREDIT LIMIT",
-        "AVAILABLE CREDIT",
-        "Page",
-        "continued",
-    ]
     line_upper = line.upper()
-    return any(keyword in line_upper for keyword in header_keywords)
+    for keyword in HEADER_LINE_KEYWORDS:
+        if keyword in line_upper:
+            return True
+
+    return False
 
 
 def _is_header_description(description: str) -> bool:
     """Check if a description is actually a header."""
-    header_descriptions = [
-        "PAYMENTS AND OTHER CREDITS",
-        "PURCHASE",
-        "FEES CHARGED",
-        "INTEREST CHARGED",
-    ]
-    return description.upper() in header_descriptions
+    return description.upper() in HEADER_DESCRIPTIONS
 
 
 def _parse_amount(amount_str: str) -> float:
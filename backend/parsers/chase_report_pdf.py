@@ -2,13 +2,56 @@
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 
 import pdfplumber
 
 from backend.models import Transaction, TransactionSource
+from backend.parsers.pdf_pages import extract_page_tables
 from backend.services.dedup import compute_transaction_hash
 
+# Distinctive text of Chase Spending Reports, which regular statements lack
+REPORT_MARKERS = ("Spending Report", "Spending By Category")
+
+# First-cell fragments of table header rows
+HEADER_ROW_KEYWORDS = (
+    "transaction date",
+    "posted date",
+    "description",
+    "amount",
+    "category",
+    "total amount",
+)
+
+# Chase report category headers and the category each maps to
+CATEGORY_MAPPING = {
+    "AUTOMOTIVE": "Gas",
+    "BILLS_AND_UTILITIES": "Bills & Utilities",
+    "EDUCATION": "Other",
+    "ENTERTAINMENT": "Entertainment",
+    "FEES_AND_ADJUSTMENTS": "Other",
+    "FOOD_AND_DRINK": "Food & Dining",
+    "GAS": "Gas",
+    "GIFTS_AND_DONATIONS": "Shopping",
+    "GROCERIES": "Groceries",
+    "HEALTH_AND_WELLNESS": "Health",
+    "HOME": "Shopping",
+    "PERSONAL": "Other",
+    "PROFESSIONAL_SERVICES": "Other",
+    "SHOPPING": "Shopping",
+    "TRAVEL": "Travel",
+}
+
+# Transaction line in the page text: "Mon DD, YYYY Mon DD, YYYY DESCRIPTION $XX.XX" or similar
+# Example: "Jan 26, 2025 Jan 29, 2025 UNCLE IKES CAR WASH $20.25"
+_TEXT_TRANSACTION_PATTERN = re.compile(
+    r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s+"  # Transaction date
+    r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s+"  # Posted date
+    r"(.+?)\s+"  # Description
+    r"\$?([\d,]+\.?\d*)\s*$"  # Amount
+)
+
 
 def parse_chase_report_pdf(contents: bytes, file_hash: str) -> list[Transaction]:
     """
@@ -21,11 +64,15 @@ def parse_chase_report_pdf(contents: bytes, file_hash: str) -> list[Transaction]
     """
     transactions: list[Transaction] = []
     current_category = None
+    # Hashes of the transactions found so far, kept up to date as they are added
+    existing_hashes: set[str] = set()
 
     with pdfplumber.open(BytesIO(contents)) as pdf:
-        for page in pdf.pages:
-            # Extract tables from the page
-            tables = page.extract_tables()
+        # Extract every page's tables up front; longer reports are extracted in parallel
+        page_tables = extract_page_tables(contents, pdf)
+
+        for page, tables in zip(pdf.pages, page_tables, strict=True):
+            page_start = len(transactions)
 
             for table in tables:
                 if not table:
@@ -53,16 +100,20 @@ def parse_chase_report_pdf(contents: bytes, file_hash: str) -> list[Transaction]
                         txn = _parse_transaction_row(row, current_category, file_hash)
                         if txn:
                             transactions.append(txn)
+                            existing_hashes.add(txn.transaction_hash)
+
+            # Fall back to the page text only for tables that don't parse well; text extraction
+            # is the slow part and only re-finds the same rows when the tables parsed
+            if len(transactions) > page_start:
+                continue
 
-            # Also try to extract from text for tables that don't parse well
             text = page.extract_text()
             if text:
                 text_txns = _parse_transactions_from_text(text, file_hash)
                 # Add only if we didn't get them from tables
-                existing_hashes = {t.transaction_hash for t in transactions}
-                for txn in text_txns:
-                    if txn.transaction_hash not in existing_hashes:
-                        transactions.append(txn)
+                new_txns = [txn for txn in text_txns if txn.transaction_hash not in existing_hashes]
+                transactions.extend(new_txns)
+                existing_hashes.update(txn.transaction_hash for txn in new_txns)
 
     return transactions
 
@@ -70,39 +121,12 @@ def parse_chase_report_pdf(contents: bytes, file_hash: str) -> list[Transaction]
 def _is_header_row(row: list[str]) -> bool:
     """Check if this is a table header row."""
     first_cell = row[0].lower() if row[0] else ""
-    return any(
-        h in first_cell
-        for h in [
-            "transaction date",
-            "posted date",
-            "description",
-            "amount",
-            "category",
-            "total amount",
-        ]
-    )
+    return any(h in first_cell for h in HEADER_ROW_KEYWORDS)
 
 
 def _is_category_header(text: str) -> bool:
     """Check if this text is a category header."""
-    categories = [
-        "AUTOMOTIVE",
-        "BILLS_AND_UTILITIES",
-        "EDUCATION",
-        "ENTERTAINMENT",
-        "FEES_AND_ADJUSTMENTS",
-        "FOOD_AND_DRINK",
-        "GAS",
-        "GIFTS_AND_DONATIONS",
-        "GROCERIES",
-        "HEALTH_AND_WELLNESS",
-        "HOME",
-        "PERSONAL",
-        "PROFESSIONAL_SERVICES",
-        "SHOPPING",
-        "TRAVEL",
-    ]
-    return text.upper() in categories
+    return text.upper() in CATEGORY_MAPPING
 
 
 def _parse_transaction_row(row: list[str], category: str | None, file_hash: str) -> Transaction | None:
@@ -161,34 +185,16 @@ def _parse_transactions_from_text(text: str, file_hash: str) -> list[Transaction
 
     lines = text.split("\n")
 
-    # Category pattern
-    category_pattern = re.compile(
-        r"^(AUTOMOTIVE|BILLS_AND_UTILITIES|EDUCATION|ENTERTAINMENT|"
-        r"FEES_AND_ADJUSTMENTS|FOOD_AND_DRINK|GAS|GIFTS_AND_DONATIONS|"
-        r"GROCERIES|HEALTH_AND_WELLNESS|HOME|PERSONAL|"
-        r"PROFESSIONAL_SERVICES|SHOPPING|TRAVEL)$"
-    )
-
-    # Transaction pattern: "Mon DD, YYYY Mon DD, YYYY DESCRIPTION $XX.XX" or similar
-    # Example: "Jan 26, 2025 Jan 29, 2025 UNCLE IKES CAR WASH $20.25"
-    txn_pattern = re.compile(
-        r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s+"  # Transaction date
-        r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s+"  # Posted date
-        r"(.+?)\s+"  # Description
-        r"\$?([\d,]+\.?\d*)\s*$"  # Amount
-    )
-
     for line in lines:
         line = line.strip()
 
-        # Check for category header
-        cat_match = category_pattern.match(line)
-        if cat_match:
-            current_category = cat_match.group(1)
+        # Check for category header; a dict lookup is cheaper than matching a pattern on every line
+        if line in CATEGORY_MAPPING:
+            current_category = line
             continue
 
         # Try to match transaction
-        txn_match = txn_pattern.match(line)
+        txn_match = _TEXT_TRANSACTION_PATTERN.match(line)
         if txn_match:
             date_str = txn_match.group(1)
             description = txn_match.group(3).strip()
@@ -225,6 +231,7 @@ def _parse_transactions_from_text(text: str, file_hash: str) -> list[Transaction
     return transactions
 
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> datetime | None:
     """Parse date from various formats."""
     if not date_str:
@@ -271,35 +278,21 @@ def _map_chase_category(category: str) -> str:
     if not category:
         return ""
 
-    mapping = {
-        "AUTOMOTIVE": "Gas",
-        "BILLS_AND_UTILITIES": "Bills & Utilities",
-        "EDUCATION": "Other",
-        "ENTERTAINMENT": "Entertainment",
-        "FEES_AND_ADJUSTMENTS": "Other",
-        "FOOD_AND_DRINK": "Food & Dining",
-        "GAS": "Gas",
-        "GIFTS_AND_DONATIONS": "Shopping",
-        "GROCERIES": "Groceries",
-        "HEALTH_AND_WELLNESS": "Health",
-        "HOME": "Shopping",
-        "PERSONAL": "Other",
-        "PROFESSIONAL_SERVICES": "Other",
-        "SHOPPING": "Shopping",
-        "TRAVEL": "Travel",
-    }
-
-    return mapping.get(category.upper(), category)
+    return CATEGORY_MAPPING.get(category.upper(), category)
 
 
 def is_chase_spending_report(contents: bytes) -> bool:
     """Check if this PDF is a Chase Spending Report (vs regular statement)."""
+    # Markers stored uncompressed can be found without parsing the PDF at all
+    if any(marker.encode() in contents for marker in REPORT_MARKERS):
+        return True
+
+    # Otherwise they are in a compressed content stream, so check the first page's text
     try:
         with pdfplumber.open(BytesIO(contents)) as pdf:
             if pdf.pages:
                 text = pdf.pages[0].extract_text() or ""
-                # Chase Spending Reports have these distinctive markers
-                return "Spending Report" in text or "Spending By Category" in text
+                return any(marker in text for marker in REPORT_MARKERS)
     except Exception:
         pass
     return False
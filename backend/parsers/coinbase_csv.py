@@ -1,12 +1,26 @@
 """Parser for Coinbase Card CSV exports."""
 
 import csv
-from datetime import datetime
-from io import StringIO
+from datetime import date, datetime
+from io import BytesIO, TextIOWrapper
 
 from backend.models import Transaction, TransactionSource
 from backend.services.dedup import compute_transaction_hash
 
+# Date formats seen in Coinbase exports, in the order they are tried
+DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%SZ",  # ISO format
+    "%Y-%m-%d %H:%M:%S",  # Standard datetime
+    "%Y-%m-%d",  # Date only
+    "%m/%d/%Y",  # US format
+    "%m/%d/%y",  # Short year
+    "%d/%m/%Y",  # European format
+)
+
+# Formats that no earlier entry in DATE_FORMATS can also parse, so trying one of them first gives the same
+# date as trying the list in order. Day-first dates can also read as US dates, so they are never carried over.
+_CARRY_FORWARD_FORMATS = frozenset(DATE_FORMATS) - {"%d/%m/%Y"}
+
 
 def parse_coinbase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     """
@@ -22,9 +36,8 @@ def parse_coinbase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     """
     transactions: list[Transaction] = []
 
-    # Decode and parse CSV
-    text = contents.decode("utf-8", errors="ignore")
-    reader = csv.DictReader(StringIO(text))
+    # Decode while parsing, rather than holding a decoded copy of the whole file
+    reader = csv.DictReader(TextIOWrapper(BytesIO(contents), encoding="utf-8", errors="ignore", newline=""))
 
     fieldnames = reader.fieldnames
     if not fieldnames:
@@ -33,6 +46,11 @@ def parse_coinbase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
     # Map headers
     header_map = _build_header_map(fieldnames)
 
+    # Format that parsed the last date, tried first on the next row
+    date_fmt = None
+    # Dates already parsed in this file; exports repeat the same day across many rows
+    parsed_dates: dict[str, date | None] = {}
+
     for row in reader:
         try:
             # Extract fields
@@ -49,7 +67,11 @@ def parse_coinbase_csv(contents: bytes, file_hash: str) -> list[Transaction]:
                 description = txn_type or "Coinbase Card Transaction"
 
             # Parse date
-            txn_date = _parse_date(date_str)
+            if date_str in parsed_dates:
+                txn_date = parsed_dates[date_str]
+            else:
+                txn_date, date_fmt = _parse_date(date_str, date_fmt)
+                parsed_dates[date_str] = txn_date
             if not txn_date:
                 continue
 
@@ -115,31 +137,37 @@ def _get_field(row: dict, header_map: dict[str, str], field: str) -> str:
     return ""
 
 
-def _parse_date(date_str: str) -> datetime | None:
-    """Parse date string in various formats."""
-    formats = [
-        "%Y-%m-%dT%H:%M:%SZ",  # ISO format
-        "%Y-%m-%d %H:%M:%S",  # Standard datetime
-        "%Y-%m-%d",  # Date only
-        "%m/%d/%Y",  # US format
-        "%m/%d/%y",  # Short year
-        "%d/%m/%Y",  # European format
-    ]
+def _parse_date(date_str: str, preferred_fmt: str | None = None) -> tuple[date | None, str | None]:
+    """
+    Parse date string in various formats.
 
-    for fmt in formats:
+    Rows in one export share a date format, so the format that parsed the previous row is tried
+    first. Returns the date and the format to prefer for the next row; only unambiguous formats
+    are carried over, so every date parses the same regardless of the rows before it.
+    """
+    if preferred_fmt:
+        try:
+            return datetime.strptime(date_str, preferred_fmt).date(), preferred_fmt
+        except ValueError:
+            pass
+
+    for fmt in DATE_FORMATS:
+        if fmt == preferred_fmt:
+            continue
         try:
-            return datetime.strptime(date_str, fmt).date()
+            txn_date = datetime.strptime(date_str, fmt).date()
         except ValueError:
             continue
+        return txn_date, fmt if fmt in _CARRY_FORWARD_FORMATS else preferred_fmt
 
     # Try parsing just the date part if there's a T separator
     if "T" in date_str:
         try:
-            return datetime.strptime(date_str.split("T")[0], "%Y-%m-%d").date()
+            return datetime.strptime(date_str.split("T")[0], "%Y-%m-%d").date(), preferred_fmt
         except ValueError:
             pass
 
-    return None
+    return None, preferred_fmt
 
 
 def _parse_amount(amount_str: str) -> float:
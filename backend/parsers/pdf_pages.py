@@ -0,0 +1,92 @@
+"""Per-page text and table extraction shared by the PDF statement parsers."""
+
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from itertools import repeat
+from typing import Any
+
+import pdfplumber
+from pdfplumber.page import Page
+
+# Documents with more pages than this are extracted in worker processes
+PARALLEL_PAGE_THRESHOLD = 4
+
+# One worker pool shared by every upload, created on first use, so concurrent uploads can't multiply
+# the process count. Workers come from a forkserver: the server runs parsers in threads, and forking
+# a multithreaded process can deadlock the child on locks held by other threads.
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def extract_page_texts(contents: bytes, pdf: pdfplumber.PDF) -> list[str]:
+    """Extract the text of every page, in page order ("" for pages without text)."""
+    return _extract_pages(contents, pdf, _page_text)
+
+
+def extract_page_tables(contents: bytes, pdf: pdfplumber.PDF) -> list[list[list[list[str | None]]]]:
+    """Extract the tables of every page, in page order."""
+    return _extract_pages(contents, pdf, _page_tables)
+
+
+def _extract_pages(contents: bytes, pdf: pdfplumber.PDF, extract: Callable[[Page], Any]) -> list[Any]:
+    """
+    Run extract on every page, in page order.
+
+    Extraction is CPU-bound and independent per page, so longer documents are
+    split into contiguous page ranges extracted in parallel worker processes.
+    Short documents stay in-process, where worker startup would cost more than it saves.
+    """
+    page_count = len(pdf.pages)
+    workers = min(os.cpu_count() or 1, page_count)
+    if page_count <= PARALLEL_PAGE_THRESHOLD or workers < 2:
+        return [extract(page) for page in pdf.pages]
+
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    try:
+        chunks = _get_pool().map(_extract_page_range, repeat(contents), bounds[:-1], bounds[1:], repeat(extract))
+        return [result for chunk in chunks for result in chunk]
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time and finish in-process
+        shutdown_pool()
+        return [extract(page) for page in pdf.pages]
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared worker pool; the next parallel extraction starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page_range(contents: bytes, start: int, stop: int, extract: Callable[[Page], Any]) -> list[Any]:
+    """Run extract on pages start to stop - 1; runs in a worker process."""
+    with pdfplumber.open(BytesIO(contents)) as pdf:
+        return [extract(page) for page in pdf.pages[start:stop]]
+
+
+def _page_text(page: Page) -> str:
+    """Extract the text of one page."""
+    return page.extract_text() or ""
+
+
+def _page_tables(page: Page) -> list[list[list[str | None]]]:
+    """Extract the tables of one page."""
+    return page.extract_tables()
@@ -1,14 +1,31 @@
 """Shared validation utilities for financial statement parsers."""
 
 import logging
+import math
 import re
 from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 from typing import Any
 
 # Configure logging for parsers
 logger = logging.getLogger("finalyzer.parsers")
 
+# Description fragments that mark a likely credit card payment rather than spending
+PAYMENT_INDICATORS = (
+    "payment - thank you",
+    "payment thank you",
+    "autopay payment",
+    "automatic payment",
+    "online payment",
+    "ach payment",
+    "mobile payment",
+    "payment received",
+    "bill pay",
+    "epay",
+    "check payment",
+)
+
 
 @dataclass
 class ParseResult:
@@ -112,11 +129,8 @@ def validate_amount(amount: float, min_val: float = -1_000_000, max_val: float =
     if amount is None:
         return False
 
-    # Check for NaN or infinity
-    if amount != amount or abs(amount) == float("inf"):
-        return False
-
-    return min_val <= amount <= max_val
+    # Reject NaN and infinity, then check the range
+    return math.isfinite(amount) and min_val <= amount <= max_val
 
 
 def validate_date(txn_date: date, min_year: int = 2000, max_year: int = 2100) -> bool:
@@ -137,6 +151,38 @@ def validate_date(txn_date: date, min_year: int = 2000, max_year: int = 2100) ->
     return min_year <= txn_date.year <= max_year
 
 
+def build_date(year: int, month: int, day: int) -> date | None:
+    """
+    Build a date from numeric parts.
+
+    Args:
+        year: Four-digit year
+        month: Month number
+        day: Day of the month
+
+    Returns:
+        The date, or None if the parts do not form a real calendar date
+    """
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def expand_two_digit_year(year: int) -> int:
+    """
+    Expand a two-digit year the same way strptime's %y does.
+
+    Args:
+        year: Year between 0 and 99
+
+    Returns:
+        1969-1999 for 69-99, 2000-2068 for 0-68
+    """
+    return year + 2000 if year <= 68 else year + 1900
+
+
+@lru_cache(maxsize=4096)
 def validate_description(description: str, min_length: int = 1, max_length: int = 500) -> bool:
     """
     Validate a transaction description.
@@ -259,30 +305,11 @@ def is_likely_payment(description: str, category: str = "") -> bool:
         True if likely a payment
     """
     description_lower = description.lower()
-    category_lower = category.lower() if category else ""
-
-    payment_indicators = [
-        "payment - thank you",
-        "payment thank you",
-        "autopay payment",
-        "automatic payment",
-        "online payment",
-        "ach payment",
-        "mobile payment",
-        "payment received",
-        "bill pay",
-        "epay",
-        "check payment",
-    ]
-
-    for indicator in payment_indicators:
+    for indicator in PAYMENT_INDICATORS:
         if indicator in description_lower:
             return True
 
-    if "payment" in category_lower:
-        return True
-
-    return False
+    return bool(category) and "payment" in category.lower()
 
 
 def log_parse_result(result: ParseResult, parser_name: str) -> None:
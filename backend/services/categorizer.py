@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -388,6 +389,33 @@ KNOWN_SUBSCRIPTIONS = [
 ]
 
 
+def _keyword_trie_pattern(keywords: list[str]) -> re.Pattern[str]:
+    """
+    Compile a pattern matching any of the keywords, factored into a trie.
+
+    Shared prefixes are tested once, so a search costs about one pass over the text
+    instead of one substring scan per keyword.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        # Any complete keyword is enough for a match, so longer keywords below it can be ignored
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + build(child) for char, child in node.items()]
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return re.compile(build(trie))
+
+
+_KNOWN_SUBSCRIPTION_PATTERN = _keyword_trie_pattern(KNOWN_SUBSCRIPTIONS)
+
+
 # Known merchants with their categories (for fast categorization without LLM)
 KNOWN_MERCHANT_CATEGORIES: dict[str, TransactionCategory] = {
     # Food & Dining - Fast Food
@@ -643,11 +671,8 @@ KNOWN_MERCHANT_CATEGORIES: dict[str, TransactionCategory] = {
 
 def _check_known_subscription(description: str) -> TransactionCategory | None:
     """Check if the transaction is a known subscription service."""
-    desc_lower = description.lower()
-
-    for subscription in KNOWN_SUBSCRIPTIONS:
-        if subscription in desc_lower:
-            return TransactionCategory.SUBSCRIPTIONS
+    if _KNOWN_SUBSCRIPTION_PATTERN.search(description.lower()):
+        return TransactionCategory.SUBSCRIPTIONS
 
     return None
 
@@ -696,9 +721,7 @@ async def schedule_llm_categorization(transaction_ids: list[str], file_hash: str
             await asyncio.wait_for(_categorize_batch(batch), timeout=30.0)
 
             # Update database with new categories
-            for txn in batch:
-                if txn.category:
-                    db.update_transaction_category(txn.id, txn.category)
+            db.update_categories_batch([txn for txn in batch if txn.category])
 
             processed_count += len(batch)
 
@@ -902,10 +925,8 @@ Only respond with the JSON array, nothing else."""
 def _parse_category(category_str: str) -> TransactionCategory:
     """Parse a category string to TransactionCategory enum."""
     # Try exact match first
-    try:
-        return TransactionCategory(category_str)
-    except ValueError:
-        pass
+    if category := TransactionCategory.try_from(category_str):
+        return category
 
     # Try case-insensitive match
     category_lower = category_str.lower()
@@ -1,7 +1,9 @@
 """Deduplication logic for Finalyzer."""
 
 import hashlib
+from collections.abc import Iterable
 from datetime import date
+from functools import cache
 
 from backend.models import TransactionSource
 
@@ -11,6 +13,12 @@ def compute_file_hash(contents: bytes) -> str:
     return hashlib.sha256(contents).hexdigest()
 
 
+@cache
+def _seeded_hasher(source: TransactionSource) -> "hashlib._Hash":
+    """SHA256 hasher that has already absorbed the source prefix; copy it before use."""
+    return hashlib.sha256(f"{source.value}|".encode())
+
+
 def compute_transaction_hash(
     source: TransactionSource,
     txn_date: date,
@@ -23,6 +31,26 @@ def compute_transaction_hash(
     This hash is used to detect duplicate transactions even across
     different file uploads.
     """
-    # Normalize the data for consistent hashing
-    normalized = f"{source.value}|{txn_date.isoformat()}|{description.strip().lower()}|{amount:.2f}"
-    return hashlib.sha256(normalized.encode()).hexdigest()
+    # Normalize the data for consistent hashing: source|date|description|amount
+    hasher = _seeded_hasher(source).copy()
+    hasher.update(f"{txn_date.isoformat()}|{description.strip().lower()}|{amount:.2f}".encode())
+    return hasher.hexdigest()
+
+
+def compute_transaction_hashes(
+    source: TransactionSource,
+    rows: Iterable[tuple[date, str, float]],
+) -> list[str]:
+    """
+    Compute transaction hashes for many (date, description, amount) rows from one source.
+
+    Produces the same hashes as calling compute_transaction_hash for each row,
+    without the per-call lookups.
+    """
+    copy = _seeded_hasher(source).copy
+    hashes = []
+    for txn_date, description, amount in rows:
+        hasher = copy()
+        hasher.update(f"{txn_date.isoformat()}|{description.strip().lower()}|{amount:.2f}".encode())
+        hashes.append(hasher.hexdigest())
+    return hashes
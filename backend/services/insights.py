@@ -1,8 +1,12 @@
 """Spending insights service for auto-generated financial analysis."""
 
+import functools
+import threading
 from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import date, timedelta
+from typing import Any, ParamSpec, TypeVar
 
 from backend.db.sqlite import db
 from backend.models import Transaction, TransactionCategory
@@ -41,6 +45,50 @@ class InsightsReport:
             self.monthly_trend = []
 
 
+# Reports computed for the current data version, keyed by (function, data version, today, arguments)
+_report_cache: dict[tuple, Any] = {}
+_report_cache_lock = threading.Lock()
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+def _cached_until_write(func: Callable[_P, _R]) -> Callable[_P, _R]:
+    """
+    Reuse a report until the database is written to.
+
+    Reports only change when transactions are added, recategorized or retagged, so
+    repeated GETs are served from memory. The key also includes today's date, since
+    open periods end today. Cached reports are shared and must not be modified.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        version = (db.get_data_version(), date.today())
+        key = (func.__name__, version, args, tuple(sorted(kwargs.items())))
+        with _report_cache_lock:
+            if key in _report_cache:
+                return _report_cache[key]
+
+        result = func(*args, **kwargs)
+
+        with _report_cache_lock:
+            # Reports for older data versions can never be hit again
+            for stale_key in [k for k in _report_cache if k[1] != version]:
+                del _report_cache[stale_key]
+            _report_cache[key] = result
+        return result
+
+    return wrapper
+
+
+def clear_report_cache() -> None:
+    """Drop all cached reports."""
+    with _report_cache_lock:
+        _report_cache.clear()
+
+
+@_cached_until_write
 def generate_insights(year: int | None = None, compare_to_previous: bool = True) -> InsightsReport:
     """
     Generate spending insights for a given period.
@@ -76,9 +124,13 @@ def generate_insights(year: int | None = None, compare_to_previous: bool = True)
 
     insights: list[SpendingInsight] = []
 
-    # Calculate totals
-    total_spending = sum(abs(t.amount) for t in transactions if t.amount < 0)
-    total_transactions = len([t for t in transactions if t.amount < 0])
+    # Calculate totals in one pass
+    total_spending = 0.0
+    total_transactions = 0
+    for t in transactions:
+        if t.amount < 0:
+            total_spending -= t.amount
+            total_transactions += 1
 
     # Generate various insights
     insights.extend(_compare_periods(transactions, start_date, end_date, compare_to_previous))
@@ -101,6 +153,7 @@ def generate_insights(year: int | None = None, compare_to_previous: bool = True)
     )
 
 
+@_cached_until_write
 def generate_monthly_insights(year: int, month: int) -> InsightsReport:
     """Generate insights for a specific month compared to previous month."""
     # Current month period
@@ -403,7 +456,7 @@ def _analyze_subscriptions(transactions: list[Transaction]) -> list[SpendingInsi
     merchant_txns: dict[str, list[Transaction]] = defaultdict(list)
     for t in subs:
         # Extract first meaningful word as merchant name
-        desc = t.description.lower()
+        desc = t.description_lower
         for word in desc.split():
             if len(word) > 3 and word.isalpha():
                 merchant_txns[word].append(t)
@@ -578,6 +631,7 @@ def _generate_spending_tips(transactions: list[Transaction], total_spending: flo
     return insights[:2]
 
 
+@_cached_until_write
 def get_quick_stats(year: int | None = None) -> dict:
     """Get quick spending statistics for the dashboard."""
     today = date.today()
@@ -601,33 +655,32 @@ def get_quick_stats(year: int | None = None) -> dict:
             "top_merchant": None,
         }
 
-    expenses = [t for t in transactions if t.amount < 0]
-    income = [t for t in transactions if t.amount > 0]
-
-    total_spending = sum(abs(t.amount) for t in expenses)
-    total_income = sum(t.amount for t in income)
-
-    # Find top category
+    # Totals, spending by category and spending by merchant in one pass
+    total_spending = 0.0
+    total_income = 0.0
+    expense_count = 0
     by_cat: dict[str, float] = defaultdict(float)
-    for t in expenses:
-        if t.category:
-            by_cat[t.category.value] += abs(t.amount)
-
-    top_category = max(by_cat.items(), key=lambda x: x[1])[0] if by_cat else None
-
-    # Find top merchant
     by_merchant: dict[str, float] = defaultdict(float)
-    for t in expenses:
-        merchant = t.description.split()[0] if t.description else "Unknown"
-        by_merchant[merchant] += abs(t.amount)
+    for t in transactions:
+        amount = t.amount
+        if amount > 0:
+            total_income += amount
+        elif amount < 0:
+            total_spending -= amount
+            expense_count += 1
+            if t.category:
+                by_cat[t.category.value] -= amount
+            merchant = t.description.split()[0] if t.description else "Unknown"
+            by_merchant[merchant] -= amount
 
+    top_category = max(by_cat.items(), key=lambda x: x[1])[0] if by_cat else None
     top_merchant = max(by_merchant.items(), key=lambda x: x[1])[0] if by_merchant else None
 
     return {
         "total_spending": total_spending,
         "total_income": total_income,
-        "transaction_count": len(expenses),
-        "avg_transaction": total_spending / len(expenses) if expenses else 0,
+        "transaction_count": expense_count,
+        "avg_transaction": total_spending / expense_count if expense_count else 0,
         "top_category": top_category,
         "top_merchant": top_merchant,
     }
@@ -3,14 +3,23 @@
 import hashlib
 import json
 import re
+from collections.abc import Sequence
 from datetime import date, timedelta
+from functools import lru_cache
+from uuid import UUID
 
 from litellm import acompletion
 
 from backend.config import settings
 from backend.db.sqlite import db
 from backend.db.vector import vector_store
-from backend.models import QueryResponse, Transaction, TransactionCategory
+from backend.models import (
+    CATEGORY_VALUES,
+    SOURCE_VALUES,
+    QueryResponse,
+    Transaction,
+    TransactionCategory,
+)
 
 
 def _get_model_name() -> str:
@@ -334,16 +343,11 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
             pass
 
     # Parse category
-    category = None
-    if intent.get("category"):
-        try:
-            category = TransactionCategory(intent["category"])
-        except ValueError:
-            pass
+    category = TransactionCategory.try_from(intent.get("category"))
 
     search_terms = intent.get("search_terms", [])
-    transactions = []
-    seen_ids = set()
+    # Keyed by id so each transaction is kept once, in the order it was found
+    found: dict[UUID, Transaction] = {}
 
     # Detect if this is a specific type query that needs tag filtering
     query_lower = query.lower()
@@ -358,11 +362,10 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
         for keyword in brand_keywords:
             matches = db.search_transactions(keyword, limit=1000)
             for txn in matches:
-                if str(txn.id) not in seen_ids:
+                if txn.id not in found:
                     # Verify the keyword is actually in the description
-                    if keyword.lower() in txn.description.lower():
-                        seen_ids.add(str(txn.id))
-                        transactions.append(txn)
+                    if keyword.lower() in txn.description_lower:
+                        found[txn.id] = txn
 
     # SECOND: ONLY use direct search for LLM search_terms if they look like specific merchants
     # (i.e., not generic category terms like "airlines", "restaurants", etc.)
@@ -412,17 +415,15 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
             for variant in search_variants:
                 matches = db.search_transactions(variant, limit=500)
                 for txn in matches:
-                    if str(txn.id) not in seen_ids:
+                    if txn.id not in found:
                         # For specific search terms, verify the term (or variant) is in the description
-                        if variant.lower() in txn.description.lower():
+                        if variant.lower() in txn.description_lower:
                             term_found_matches = True
                             if required_tags:
                                 if _has_required_tags(txn, required_tags):
-                                    seen_ids.add(str(txn.id))
-                                    transactions.append(txn)
+                                    found[txn.id] = txn
                             else:
-                                seen_ids.add(str(txn.id))
-                                transactions.append(txn)
+                                found[txn.id] = txn
 
             if term_found_matches:
                 search_terms_with_matches.append(term)
@@ -455,19 +456,17 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
             txn_ids = [result["id"] for result in search_results]
             semantic_matches = db.get_transactions_by_ids(txn_ids)
             for txn in semantic_matches:
-                if str(txn.id) not in seen_ids:
+                if txn.id not in found:
                     # If we have required tags, filter by them
                     if required_tags:
                         if _has_required_tags(txn, required_tags):
-                            seen_ids.add(str(txn.id))
-                            transactions.append(txn)
+                            found[txn.id] = txn
                     else:
-                        seen_ids.add(str(txn.id))
-                        transactions.append(txn)
+                        found[txn.id] = txn
 
     # FOURTH: If we have a category filter but few results and NO specific brand/merchant matches,
     # get more transactions by category. Skip this if we have brand/merchant matches.
-    if category and len(transactions) < 50 and not has_merchant_matches:
+    if category and len(found) < 50 and not has_merchant_matches:
         db_transactions = db.get_all_transactions(
             start_date=start_date,
             end_date=end_date,
@@ -475,14 +474,14 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
             limit=500,
         )
         for txn in db_transactions:
-            if str(txn.id) not in seen_ids:
+            if txn.id not in found:
                 if required_tags:
                     if _has_required_tags(txn, required_tags):
-                        seen_ids.add(str(txn.id))
-                        transactions.append(txn)
+                        found[txn.id] = txn
                 else:
-                    seen_ids.add(str(txn.id))
-                    transactions.append(txn)
+                    found[txn.id] = txn
+
+    transactions = list(found.values())
 
     # Apply date filters
     if start_date:
@@ -504,10 +503,12 @@ async def _get_relevant_transactions(query: str, intent: dict) -> list[Transacti
     return transactions[:200]
 
 
-def _extract_brand_keywords(query: str) -> list[str]:
+@lru_cache(maxsize=1024)
+def _extract_brand_keywords(query: str) -> tuple[str, ...]:
     """
     Extract specific brand/merchant names from the query for direct database search.
     Returns keywords that should be searched directly in transaction descriptions.
+    Results are cached per query, so they're returned as an immutable tuple.
     """
     # Known brands to look for in queries (expanded list)
     brands = [
@@ -614,19 +615,16 @@ def _extract_brand_keywords(query: str) -> list[str]:
         "xfinity",
     ]
 
-    found = []
     query_lower = query.lower()
-    for brand in brands:
-        if brand in query_lower:
-            found.append(brand)
-
-    return found
+    return tuple(brand for brand in brands if brand in query_lower)
 
 
-def _get_required_tags(query: str) -> list[str]:
+@lru_cache(maxsize=1024)
+def _get_required_tags(query: str) -> tuple[str, ...]:
     """
     Determine if the query requires specific tags to filter results.
     This prevents "airlines" from matching "uber" just because both are "travel".
+    Results are cached per query, so they're returned as an immutable tuple.
 
     For specific brand searches (uber, lyft, starbucks), we require the brand tag.
     For category searches (rideshare, airlines), we require the category tag.
@@ -661,7 +659,7 @@ def _get_required_tags(query: str) -> list[str]:
     # Check brand-specific tags first (exact brand match)
     for brand, tags in brand_tags.items():
         if brand in query:
-            return tags
+            return tuple(tags)
 
     # Category-level tags for broader queries
     category_tags = {
@@ -701,68 +699,79 @@ def _get_required_tags(query: str) -> list[str]:
 
     for keyword, tags in category_tags.items():
         if keyword in query:
-            return tags
+            return tuple(tags)
+
+    return ()
+
+
+# Description patterns that identify an airline charge. Tags alone are less reliable
+# because they can be incorrectly assigned.
+_AIRLINE_DESCRIPTION_PATTERN = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            [
+                # "AIRLINE" or "AIRLINES" or "AIRWAYS" or "AIR LINES" in description
+                "airline",
+                "airways",
+                " air lines",
+                # Specific airline name followed by " AIR" or " AI" (common in statements)
+                # e.g., "DELTA AIR LINES", "EMIRATES AI", "ALASKA AIR", "AIR-INDIA"
+                "delta air",
+                "united air",
+                "american air",
+                "southwest air",
+                "alaska air",
+                "emirates ai",
+                "etihad air",
+                "qatar air",
+                "air canada",
+                "air france",
+                "air india",
+                "air-india",
+                "air china",
+                "british air",
+                "virgin air",
+                "hawaiian air",
+                "spirit air",
+                "frontier air",
+                "norwegian air",
+                # Budget airlines with unique names
+                "jetblue",
+                "ryanair",
+                "easyjet",
+                "airasia",
+            ],
+        )
+    )
+)
+
 
-    return []
+@lru_cache(maxsize=256)
+def _required_tags_pattern(required_tags: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile the required tags into one pattern so a description is scanned once for all of them."""
+    return re.compile("|".join(re.escape(tag.lower()) for tag in required_tags))
 
 
-def _has_required_tags(txn: Transaction, required_tags: list[str]) -> bool:
+def _has_required_tags(txn: Transaction, required_tags: Sequence[str]) -> bool:
     """Check if transaction has at least one of the required tags or matches in description."""
     if not required_tags:
         return True
 
-    desc_lower = txn.description.lower()
-    txn_tags_lower = [t.lower() for t in txn.tags] if txn.tags else []
+    desc_lower = txn.description_lower
 
     # Special handling for airline queries - require airline-specific patterns
     # This is more reliable than trusting tags alone, which can be incorrectly assigned
     if "airline" in required_tags and "flight" in required_tags:
-        # Check for explicit airline indicators
-        # Pattern 1: "AIRLINE" or "AIRLINES" or "AIRWAYS" or "AIR LINES" in description
-        if any(term in desc_lower for term in ["airline", "airways", " air lines"]):
-            return True
-
-        # Pattern 2: Specific airline name followed by " AIR" or " AI" (common in statements)
-        # e.g., "DELTA AIR LINES", "EMIRATES AI", "ALASKA AIR", "AIR-INDIA"
-        airline_with_air = [
-            "delta air",
-            "united air",
-            "american air",
-            "southwest air",
-            "alaska air",
-            "emirates ai",
-            "etihad air",
-            "qatar air",
-            "air canada",
-            "air france",
-            "air india",
-            "air-india",
-            "air china",
-            "british air",
-            "virgin air",
-            "hawaiian air",
-            "spirit air",
-            "frontier air",
-            "norwegian air",
-        ]
-        if any(pattern in desc_lower for pattern in airline_with_air):
-            return True
-
-        # Pattern 3: Budget airlines with unique names
-        budget_airlines = ["jetblue", "ryanair", "easyjet", "airasia"]
-        if any(airline in desc_lower for airline in budget_airlines):
-            return True
-
-        return False
+        return _AIRLINE_DESCRIPTION_PATTERN.search(desc_lower) is not None
 
     # Check description for the required tag/brand
-    for tag in required_tags:
-        tag_lower = tag.lower()
-        if tag_lower in desc_lower:
-            return True
+    if _required_tags_pattern(tuple(required_tags)).search(desc_lower):
+        return True
 
     # Check tags - any match is sufficient
-    if txn_tags_lower:
+    if txn.tags:
+        txn_tags_lower = {t.lower() for t in txn.tags}
         if any(tag.lower() in txn_tags_lower for tag in required_tags):
             return True
 
@@ -774,50 +783,56 @@ def _calculate_stats(transactions: list[Transaction]) -> dict:
     if not transactions:
         return {}
 
-    total_spending = sum(abs(txn.amount) for txn in transactions if txn.amount < 0)
-    total_income = sum(txn.amount for txn in transactions if txn.amount > 0)
-
-    # Year breakdown
+    total_spending = 0.0
+    total_income = 0.0
     year_data: dict[int, dict] = {}
-    for txn in transactions:
-        year = txn.date.year
-        if year not in year_data:
-            year_data[year] = {"count": 0, "spending": 0.0, "income": 0.0}
-        year_data[year]["count"] += 1
-        if txn.amount < 0:
-            year_data[year]["spending"] += abs(txn.amount)
-        else:
-            year_data[year]["income"] += txn.amount
-
-    # Source breakdown
     source_data: dict[str, dict] = {}
-    for txn in transactions:
-        src = txn.source.value if txn.source else "unknown"
-        if src not in source_data:
-            source_data[src] = {"count": 0, "spending": 0.0}
-        source_data[src]["count"] += 1
-        if txn.amount < 0:
-            source_data[src]["spending"] += abs(txn.amount)
-
-    # Month breakdown (for current year)
     month_data: dict[str, dict] = {}
-    for txn in transactions:
-        month_key = txn.date.strftime("%Y-%m")
-        if month_key not in month_data:
-            month_data[month_key] = {"count": 0, "spending": 0.0}
-        month_data[month_key]["count"] += 1
-        if txn.amount < 0:
-            month_data[month_key]["spending"] += abs(txn.amount)
-
-    # Category breakdown
     category_data: dict[str, dict] = {}
+
+    # Single pass over the transactions, updating every breakdown at once
     for txn in transactions:
-        cat = txn.category.value if txn.category else "Uncategorized"
-        if cat not in category_data:
-            category_data[cat] = {"count": 0, "spending": 0.0}
-        category_data[cat]["count"] += 1
-        if txn.amount < 0:
-            category_data[cat]["spending"] += abs(txn.amount)
+        amount = txn.amount
+        spending = -amount if amount < 0 else 0.0
+        txn_date = txn.date
+
+        total_spending += spending
+        if amount > 0:
+            total_income += amount
+
+        # Year breakdown
+        year = year_data.get(txn_date.year)
+        if year is None:
+            year = year_data[txn_date.year] = {"count": 0, "spending": 0.0, "income": 0.0}
+        year["count"] += 1
+        if amount < 0:
+            year["spending"] += spending
+        else:
+            year["income"] += amount
+
+        # Source breakdown
+        src = SOURCE_VALUES.get(txn.source, "unknown")
+        source = source_data.get(src)
+        if source is None:
+            source = source_data[src] = {"count": 0, "spending": 0.0}
+        source["count"] += 1
+        source["spending"] += spending
+
+        # Month breakdown
+        month_key = f"{txn_date.year:04d}-{txn_date.month:02d}"
+        month = month_data.get(month_key)
+        if month is None:
+            month = month_data[month_key] = {"count": 0, "spending": 0.0}
+        month["count"] += 1
+        month["spending"] += spending
+
+        # Category breakdown
+        cat = CATEGORY_VALUES[txn.category] if txn.category else "Uncategorized"
+        category = category_data.get(cat)
+        if category is None:
+            category = category_data[cat] = {"count": 0, "spending": 0.0}
+        category["count"] += 1
+        category["spending"] += spending
 
     return {
         "total_count": len(transactions),
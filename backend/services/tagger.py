@@ -216,9 +216,7 @@ async def schedule_llm_tagging(transaction_ids: list[str], file_hash: str | None
             await asyncio.wait_for(_tag_batch(batch), timeout=30.0)
 
             # Update database with new tags
-            for txn in batch:
-                if txn.tags:
-                    db.update_transaction_tags(txn.id, txn.tags)
+            db.update_tags_batch([txn for txn in batch if txn.tags])
 
         except TimeoutError:
             print(f"  Batch {batch_num} timeout, skipping...")
@@ -93,10 +93,51 @@ def detect_source(filename: str, contents: bytes) -> TransactionSource:
     raise ValueError(f"Could not detect source for file: {filename}")
 
 
-async def process_upload(filename: str, contents: bytes) -> UploadResponse:
-    """Process an uploaded financial statement."""
+def _parse_with_source_parser(
+    filename: str, contents: bytes, file_hash: str
+) -> tuple[TransactionSource, list[Transaction]]:
+    """Detect the statement source and parse it with the matching format-specific parser."""
+    filename_lower = filename.lower()
+    source = detect_source(filename, contents)
+
+    if source == TransactionSource.CHASE_CREDIT:
+        if filename_lower.endswith(".csv"):
+            transactions = parse_chase_csv(contents, file_hash)
+        elif filename_lower.endswith(".pdf"):
+            # Check if it's a Spending Report PDF vs regular statement
+            if is_chase_spending_report(contents):
+                logger.info("Detected Chase Spending Report PDF")
+                transactions = parse_chase_report_pdf(contents, file_hash)
+            else:
+                transactions = parse_chase_pdf(contents, file_hash)
+        else:
+            transactions = parse_chase_pdf(contents, file_hash)
+    elif source == TransactionSource.AMEX:
+        if filename_lower.endswith(".pdf"):
+            logger.info("Detected Amex Year-End Summary PDF")
+            transactions = parse_amex_year_end_pdf(contents, file_hash)
+        else:
+            transactions = parse_amex_csv(contents, file_hash)
+    elif source == TransactionSource.COINBASE:
+        if filename_lower.endswith(".pdf"):
+            logger.info("Detected Coinbase Card PDF statement")
+            transactions = parse_coinbase_pdf(contents, file_hash)
+        else:
+            transactions = parse_coinbase_csv(contents, file_hash)
+    else:
+        raise ValueError(f"Unsupported source: {source}")
+
+    return source, transactions
+
+
+async def process_upload(filename: str, contents: bytes, file_hash: str | None = None) -> UploadResponse:
+    """
+    Process an uploaded financial statement.
+
+    file_hash may be passed when the caller already hashed the contents while reading them.
+    """
     # Check for duplicate file
-    file_hash = compute_file_hash(contents)
+    file_hash = file_hash or compute_file_hash(contents)
     if db.file_exists(file_hash):
         return UploadResponse(
             filename=filename,
@@ -108,8 +149,6 @@ async def process_upload(filename: str, contents: bytes) -> UploadResponse:
         )
 
     # Parse transactions using generic parser or format-specific parsers
-    filename_lower = filename.lower()
-
     if settings.use_generic_parser:
         # NEW: Use LLM-based generic parser (works for any PDF or CSV)
         logger.info(f"Using generic LLM parser for {filename}")
@@ -148,35 +187,9 @@ async def process_upload(filename: str, contents: bytes) -> UploadResponse:
             file_hash=file_hash,
         )
     else:
-        # OLD: Use format-specific parsers (backward compatible)
-        source = detect_source(filename, contents)
-
-        if source == TransactionSource.CHASE_CREDIT:
-            if filename_lower.endswith(".csv"):
-                transactions = parse_chase_csv(contents, file_hash)
-            elif filename_lower.endswith(".pdf"):
-                # Check if it's a Spending Report PDF vs regular statement
-                if is_chase_spending_report(contents):
-                    logger.info("Detected Chase Spending Report PDF")
-                    transactions = parse_chase_report_pdf(contents, file_hash)
-                else:
-                    transactions = parse_chase_pdf(contents, file_hash)
-            else:
-                transactions = parse_chase_pdf(contents, file_hash)
-        elif source == TransactionSource.AMEX:
-            if filename_lower.endswith(".pdf"):
-                logger.info("Detected Amex Year-End Summary PDF")
-                transactions = parse_amex_year_end_pdf(contents, file_hash)
-            else:
-                transactions = parse_amex_csv(contents, file_hash)
-        elif source == TransactionSource.COINBASE:
-            if filename_lower.endswith(".pdf"):
-                logger.info("Detected Coinbase Card PDF statement")
-                transactions = parse_coinbase_pdf(contents, file_hash)
-            else:
-                transactions = parse_coinbase_csv(contents, file_hash)
-        else:
-            raise ValueError(f"Unsupported source: {source}")
+        # OLD: Use format-specific parsers (backward compatible).
+        # pdfplumber parsing is CPU-bound, so run it in a worker thread to keep the event loop responsive.
+        source, transactions = await asyncio.to_thread(_parse_with_source_parser, filename, contents, file_hash)
 
     if not transactions:
         return UploadResponse(
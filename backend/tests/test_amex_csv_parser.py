@@ -218,6 +218,14 @@ class TestParseAmexCsv:
         transactions = parse_amex_csv(csv_content, "test-hash")
         assert len(transactions) == 0
 
+    def test_returns_nothing_without_required_headers(self):
+        """Should return no transactions when a required header is missing."""
+        csv_content = b"""Date,Description,Notes
+12/31/2024,Valid Transaction,100.00
+"""
+        transactions = parse_amex_csv(csv_content, "test-hash")
+        assert transactions == []
+
     def test_handles_malformed_rows(self):
         """Should skip malformed rows."""
         csv_content = b"""Date,Description,Amount
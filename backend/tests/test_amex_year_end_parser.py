@@ -3,9 +3,11 @@
 import pytest
 
 from backend.parsers.amex_year_end_pdf import (
+    CATEGORY_HEADERS,
+    _category_before,
     _clean_description,
-    _extract_category_from_context,
     _extract_year,
+    _index_category_headers,
     _is_header_or_label,
     _parse_amount,
     _parse_date,
@@ -169,7 +171,7 @@ class TestIsHeaderOrLabel:
         assert _is_header_or_label("UBER TRIP") is False
 
 
-class TestExtractCategoryFromContext:
+class TestCategoryBefore:
     """Test category extraction from surrounding text."""
 
     def test_extracts_airline_category(self):
@@ -183,7 +185,7 @@ class TestExtractCategoryFromContext:
         01/25/2025 February DELTA AIR LINES ATLANTA $401.97
         """
         position = text.find("01/25/2025")
-        category = _extract_category_from_context(text, position)
+        category = _category_before(_index_category_headers(text), position)
         assert category == "Airline"
 
     def test_extracts_restaurant_category(self):
@@ -194,7 +196,7 @@ class TestExtractCategoryFromContext:
         06/18/2025 July ApPay TST* HONOLULU $20.52
         """
         position = text.find("06/18/2025")
-        category = _extract_category_from_context(text, position)
+        category = _category_before(_index_category_headers(text), position)
         assert category == "Restaurant"
 
     def test_extracts_transportation_category(self):
@@ -207,9 +209,38 @@ class TestExtractCategoryFromContext:
         03/29/2025 April ApPay LYFT $67.14
         """
         position = text.find("03/29/2025")
-        category = _extract_category_from_context(text, position)
+        category = _category_before(_index_category_headers(text), position)
         assert category == "Taxis & Coach"
 
+    def test_returns_none_before_any_header(self):
+        """Should return None when no category header precedes the position."""
+        text = "01/25/2025 February DELTA AIR LINES $401.97\nAirline"
+        assert _category_before(_index_category_headers(text), 0) is None
+
+    def test_ignores_header_overlapping_position(self):
+        """Should only consider headers that end before the position."""
+        text = "Restaurant\nAirline"
+        assert _category_before(_index_category_headers(text), text.find("Airline") + 3) == "Restaurant"
+
+    def test_prefers_earlier_listed_header_at_same_offset(self):
+        """Should resolve headers starting at the same offset by list order."""
+        text = "Travel Agencies\n01/25/2025 February DELTA $1.00"
+        assert _category_before(_index_category_headers(text), text.find("01/25")) == "Travel"
+
+    def test_page_index_matches_backwards_search(self):
+        """Should give the same answer from a shared page index as searching back from each position."""
+        text = "Travel\nAirline\n01/25/2025 A $1.00\nRestaurant\n02/01/2025 B $2.00"
+        category_index = _index_category_headers(text)
+
+        for position in range(len(text) + 1):
+            found = [
+                (text.rfind(category, 0, position), -priority, category)
+                for priority, category in enumerate(CATEGORY_HEADERS)
+                if category in text[:position]
+            ]
+            expected = max(found)[2] if found else None
+            assert _category_before(category_index, position) == expected
+
 
 class TestAmexYearEndPdfIntegration:
     """Integration tests for the parser (requires actual PDF)."""
@@ -0,0 +1,46 @@
+"""Tests for the known subscription matching in the categorizer service."""
+
+from backend.models import TransactionCategory
+from backend.services.categorizer import (
+    KNOWN_SUBSCRIPTIONS,
+    _check_known_subscription,
+    _keyword_trie_pattern,
+)
+
+
+class TestKeywordTriePattern:
+    """Test the trie-factored keyword pattern."""
+
+    def test_matches_any_keyword(self):
+        """Should find each keyword anywhere in the text."""
+        pattern = _keyword_trie_pattern(["hbo", "hbo max", "hulu", "disney+"])
+
+        assert pattern.search("payment hbo max 123")
+        assert pattern.search("xxhuluxx")
+        assert pattern.search("disney+ monthly")
+
+    def test_ignores_partial_keywords(self):
+        """Should not match text containing only a prefix of a keyword."""
+        pattern = _keyword_trie_pattern(["hbo max", "hulu"])
+
+        assert pattern.search("hbo store") is None
+        assert pattern.search("hul") is None
+
+    def test_escapes_special_characters(self):
+        """Should treat regex metacharacters in keywords literally."""
+        pattern = _keyword_trie_pattern(["disney+"])
+
+        assert pattern.search("disneyyy") is None
+
+
+class TestCheckKnownSubscription:
+    """Test known subscription detection."""
+
+    def test_matches_every_known_subscription(self):
+        """Should detect each known subscription, case-insensitively."""
+        for subscription in KNOWN_SUBSCRIPTIONS:
+            assert _check_known_subscription(f"POS {subscription.upper()} 1234") == TransactionCategory.SUBSCRIPTIONS
+
+    def test_ignores_other_merchants(self):
+        """Should return None for merchants that are not subscriptions."""
+        assert _check_known_subscription("WHOLEFDS MKT 10234") is None
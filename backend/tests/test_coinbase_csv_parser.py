@@ -0,0 +1,56 @@
+"""Tests for the Coinbase CSV parser."""
+
+from datetime import date
+
+import pytest
+
+from backend.parsers.coinbase_csv import _parse_date, parse_coinbase_csv
+
+
+class TestParseDate:
+    """Test date parsing."""
+
+    def test_parses_iso_timestamp(self):
+        """Should parse ISO timestamps and prefer that format for the next row."""
+        assert _parse_date("2024-01-15T10:30:00Z") == (date(2024, 1, 15), "%Y-%m-%dT%H:%M:%SZ")
+
+    def test_prefers_month_first(self):
+        """Should read dates that fit both orders month first."""
+        txn_date, _ = _parse_date("01/02/2024")
+        assert txn_date == date(2024, 1, 2)
+
+    def test_does_not_carry_day_first_format(self):
+        """Should not prefer the day-first format for later rows."""
+        assert _parse_date("25/12/2024", "%Y-%m-%d") == (date(2024, 12, 25), "%Y-%m-%d")
+        assert _parse_date("25/12/2024") == (date(2024, 12, 25), None)
+
+    def test_invalid_date_returns_none(self):
+        """Should return None for invalid dates."""
+        assert _parse_date("invalid") == (None, None)
+
+
+class TestParseCoinbaseCsv:
+    """Integration tests for the full parser."""
+
+    def test_dates_do_not_depend_on_row_order(self):
+        """Should parse each date the same way wherever it appears in the file."""
+        rows = ["01/02/2024,Coffee,4.50", "25/12/2024,Gift,20.00", "03/04/2024,Lunch,12.00"]
+        forward = parse_coinbase_csv(("Date,Description,Amount\n" + "\n".join(rows)).encode(), "test-hash")
+        backward = parse_coinbase_csv(("Date,Description,Amount\n" + "\n".join(reversed(rows))).encode(), "test-hash")
+
+        assert [txn.date for txn in forward] == [date(2024, 1, 2), date(2024, 12, 25), date(2024, 3, 4)]
+        assert sorted(txn.transaction_hash for txn in forward) == sorted(txn.transaction_hash for txn in backward)
+
+    def test_negates_spending_and_keeps_rewards_positive(self):
+        """Should make purchases negative and rewards positive."""
+        csv_content = b"""Timestamp,Transaction Type,USD Amount,Description
+2024-01-15T10:30:00Z,Purchase,6.50,STARBUCKS
+2024-01-16T11:00:00Z,Reward,1.25,Crypto reward
+"""
+        transactions = parse_coinbase_csv(csv_content, "test-hash")
+
+        assert [txn.amount for txn in transactions] == [-6.50, 1.25]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+"""Tests for the deduplication hashing helpers."""
+
+import hashlib
+from datetime import date
+
+from backend.models import TransactionSource
+from backend.services.dedup import compute_transaction_hash, compute_transaction_hashes
+
+
+class TestComputeTransactionHash:
+    """Test single transaction hashing."""
+
+    def test_hashes_normalized_fields(self):
+        """Should hash source, date, lowered description and amount joined by pipes."""
+        txn_hash = compute_transaction_hash(TransactionSource.CHASE_CREDIT, date(2024, 1, 15), " Starbucks ", -4.5)
+
+        expected = hashlib.sha256(b"chase_credit|2024-01-15|starbucks|-4.50").hexdigest()
+        assert txn_hash == expected
+
+    def test_repeated_calls_match(self):
+        """Should return the same hash every time for the same transaction."""
+        args = (TransactionSource.AMEX, date(2024, 1, 15), "UBER TRIP", -12.5)
+
+        assert compute_transaction_hash(*args) == compute_transaction_hash(*args)
+
+
+class TestComputeTransactionHashes:
+    """Test batch transaction hashing."""
+
+    def test_matches_single_hashes(self):
+        """Should produce the same hash as compute_transaction_hash for each row."""
+        rows = [
+            (date(2024, 1, 15), "UBER TRIP", -12.5),
+            (date(2024, 1, 16), "  Starbucks ", -4.25),
+            (date(2024, 2, 1), "REFUND", 30.0),
+        ]
+
+        hashes = compute_transaction_hashes(TransactionSource.AMEX, rows)
+
+        assert hashes == [compute_transaction_hash(TransactionSource.AMEX, *row) for row in rows]
+
+    def test_empty_rows(self):
+        """Should return an empty list for no rows."""
+        assert compute_transaction_hashes(TransactionSource.AMEX, []) == []
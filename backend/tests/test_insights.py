@@ -10,12 +10,21 @@ from backend.models import Transaction, TransactionCategory, TransactionSource
 from backend.services.insights import (
     InsightsReport,
     SpendingInsight,
+    clear_report_cache,
     generate_insights,
     generate_monthly_insights,
     get_quick_stats,
 )
 
 
+@pytest.fixture(autouse=True)
+def empty_report_cache():
+    """Start and end every test with no cached reports."""
+    clear_report_cache()
+    yield
+    clear_report_cache()
+
+
 def create_mock_transaction(
     amount: float,
     txn_date: date,
@@ -254,5 +263,32 @@ class TestInsightsIntegration:
         assert report.total_spending == 450.0
 
 
+class TestReportCache:
+    """Test reuse of reports until the next database write."""
+
+    @patch("backend.services.insights.db")
+    def test_reuses_report_for_same_data_version(self, mock_db):
+        """Should not recompute while the data version is unchanged."""
+        mock_db.get_data_version.return_value = (1, 1)
+        mock_db.get_all_transactions.return_value = [create_mock_transaction(-100.0, date(2024, 1, 15))]
+
+        first = generate_insights(year=2024)
+        second = generate_insights(year=2024)
+
+        assert second is first
+
+    @patch("backend.services.insights.db")
+    def test_recomputes_after_write(self, mock_db):
+        """Should recompute once the data version changes."""
+        mock_db.get_data_version.return_value = (1, 1)
+        mock_db.get_all_transactions.return_value = [create_mock_transaction(-100.0, date(2024, 1, 15))]
+        generate_insights(year=2024)
+
+        mock_db.get_data_version.return_value = (2, 1)
+        mock_db.get_all_transactions.return_value = [create_mock_transaction(-250.0, date(2024, 1, 15))]
+
+        assert generate_insights(year=2024).total_spending == 250.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
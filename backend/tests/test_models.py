@@ -0,0 +1,57 @@
+"""Tests for the data models."""
+
+from datetime import date
+
+import pytest
+
+from backend.models import Transaction, TransactionSource
+
+
+def _transaction(description: str) -> Transaction:
+    """Build a transaction with the given description."""
+    return Transaction(
+        source=TransactionSource.AMEX,
+        source_file_hash="file-hash",
+        transaction_hash="txn-hash",
+        date=date(2024, 1, 15),
+        description=description,
+        amount=-4.5,
+    )
+
+
+class TestDescriptionLower:
+    """Test the cached lowercase description."""
+
+    def test_lowers_description(self):
+        """Should return the lowercased description."""
+        assert _transaction("STARBUCKS Coffee").description_lower == "starbucks coffee"
+
+    def test_follows_assigned_description(self):
+        """Should recompute after the description is reassigned."""
+        txn = _transaction("FOO")
+        assert txn.description_lower == "foo"
+
+        txn.description = "BAR"
+        assert txn.description_lower == "bar"
+
+    def test_follows_copied_description(self):
+        """Should recompute on a copy whose description was updated, leaving the original alone."""
+        txn = _transaction("FOO")
+        assert txn.description_lower == "foo"
+
+        copied = txn.model_copy(update={"description": "BAR"})
+        assert copied.description_lower == "bar"
+        assert txn.description_lower == "foo"
+        assert txn.model_copy().description_lower == "foo"
+
+    def test_left_out_of_serialization_and_equality(self):
+        """Should not be dumped or affect equality once computed."""
+        txn = _transaction("FOO")
+        assert txn.description_lower == "foo"
+
+        assert "description_lower" not in txn.model_dump()
+        assert txn == _transaction("FOO").model_copy(update={"id": txn.id})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+"""Tests for per-page PDF extraction."""
+
+from io import BytesIO
+
+import pdfplumber
+import pytest
+
+from backend.parsers import pdf_pages
+from backend.parsers.amex_year_end_pdf import parse_amex_year_end_pdf
+from backend.parsers.chase_pdf import parse_chase_pdf
+from backend.parsers.pdf_pages import extract_page_tables, extract_page_texts
+
+
+def _make_pdf(pages: list[list[str]]) -> bytes:
+    """Build a minimal PDF with one line of Helvetica text per entry on each page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 14 TL 40 780 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return out
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Force every multi-page document through the worker pool."""
+    monkeypatch.setattr(pdf_pages, "PARALLEL_PAGE_THRESHOLD", 1)
+    monkeypatch.setattr(pdf_pages.os, "cpu_count", lambda: 2)
+    yield
+    pdf_pages.shutdown_pool()
+
+
+CHASE_PAGES = [
+    [
+        "Statement Date: 01/15/2024",
+        f"0{page + 1}/1{page} COFFEE SHOP {page} 12.5{page}",
+        f"0{page + 1}/2{page} GROCERY 40.00",
+    ]
+    for page in range(3)
+]
+
+AMEX_PAGES = [
+    ["2024 Year-End Summary", "Restaurants", f"0{page + 1}/1{page}/2024 February CAFE NUMBER {page} $1{page}.50"]
+    for page in range(3)
+]
+
+
+def _without_ids(transactions):
+    """Dump transactions without their random ids, for comparing two parses."""
+    return [txn.model_dump(exclude={"id"}) for txn in transactions]
+
+
+class TestParallelExtraction:
+    """Test that worker-process extraction matches in-process extraction."""
+
+    def test_page_texts_match(self, parallel):
+        """Should return the same page texts, in page order."""
+        contents = _make_pdf(CHASE_PAGES)
+        with pdfplumber.open(BytesIO(contents)) as pdf:
+            expected = [page.extract_text() or "" for page in pdf.pages]
+            assert extract_page_texts(contents, pdf) == expected
+        assert pdf_pages._pool is not None
+
+    def test_page_tables_match(self, parallel):
+        """Should return the same page tables, in page order."""
+        contents = _make_pdf(CHASE_PAGES)
+        with pdfplumber.open(BytesIO(contents)) as pdf:
+            expected = [page.extract_tables() for page in pdf.pages]
+            assert extract_page_tables(contents, pdf) == expected
+        assert pdf_pages._pool is not None
+
+    def test_chase_statement_matches_in_process(self, monkeypatch):
+        """Should parse the same Chase transactions either way."""
+        contents = _make_pdf(CHASE_PAGES)
+        in_process = parse_chase_pdf(contents, "test-hash")
+
+        monkeypatch.setattr(pdf_pages, "PARALLEL_PAGE_THRESHOLD", 1)
+        monkeypatch.setattr(pdf_pages.os, "cpu_count", lambda: 2)
+        try:
+            in_workers = parse_chase_pdf(contents, "test-hash")
+            assert pdf_pages._pool is not None
+        finally:
+            pdf_pages.shutdown_pool()
+
+        assert len(in_process) == 6
+        assert _without_ids(in_workers) == _without_ids(in_process)
+
+    def test_amex_year_end_matches_in_process(self, monkeypatch):
+        """Should parse the same Amex year-end transactions either way."""
+        contents = _make_pdf(AMEX_PAGES)
+        in_process = parse_amex_year_end_pdf(contents, "test-hash")
+
+        monkeypatch.setattr(pdf_pages, "PARALLEL_PAGE_THRESHOLD", 1)
+        monkeypatch.setattr(pdf_pages.os, "cpu_count", lambda: 2)
+        try:
+            in_workers = parse_amex_year_end_pdf(contents, "test-hash")
+            assert pdf_pages._pool is not None
+        finally:
+            pdf_pages.shutdown_pool()
+
+        assert len(in_process) == 3
+        assert _without_ids(in_workers) == _without_ids(in_process)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
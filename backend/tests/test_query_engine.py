@@ -361,7 +361,7 @@ class TestExtractBrandKeywords:
     def test_no_brands(self):
         """Test query with no brand names."""
         keywords = _extract_brand_keywords("how much did i spend on food")
-        assert keywords == []
+        assert keywords == ()
 
     def test_extract_airlines(self):
         """Test extracting airline brands."""
@@ -443,7 +443,7 @@ class TestGetRequiredTags:
     def test_generic_query_no_required_tags(self):
         """Generic queries should not require specific tags."""
         tags = _get_required_tags("how much did i spend last month")
-        assert tags == []
+        assert tags == ()
 
 
 class TestHasRequiredTags:
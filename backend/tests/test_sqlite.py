@@ -0,0 +1,563 @@
+"""Tests for the SQLite database layer."""
+
+from datetime import date
+
+import pytest
+
+from backend.db.sqlite import Database
+from backend.models import Transaction, TransactionCategory, TransactionSource, UploadedFile
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Create a database backed by a temporary file."""
+    db = Database(tmp_path / "test.db")
+    yield db
+    db.close()
+
+
+def make_transaction(
+    description: str = "TEST MERCHANT",
+    amount: float = -10.0,
+    txn_date: date = date(2024, 1, 15),
+    category: TransactionCategory | None = TransactionCategory.SHOPPING,
+    tags: list[str] | None = None,
+    transaction_hash: str | None = None,
+) -> Transaction:
+    """Helper to create a test transaction."""
+    return Transaction(
+        source=TransactionSource.CHASE_CREDIT,
+        source_file_hash="file-hash",
+        transaction_hash=transaction_hash or f"{description}-{amount}-{txn_date}",
+        date=txn_date,
+        description=description,
+        amount=amount,
+        category=category,
+        tags=tags or [],
+    )
+
+
+class TestAddTransactionsBatch:
+    """Test batch insertion of transactions."""
+
+    def test_adds_all_new_transactions(self, database):
+        """Should insert every transaction when none are duplicates."""
+        transactions = [make_transaction(description=f"MERCHANT {i}") for i in range(5)]
+
+        added, skipped = database.add_transactions_batch(transactions)
+
+        assert (added, skipped) == (5, 0)
+        assert database.get_transaction_count() == 5
+
+    def test_skips_existing_duplicates(self, database):
+        """Should skip transactions whose hash already exists."""
+        database.add_transaction(make_transaction(transaction_hash="dup"))
+
+        added, skipped = database.add_transactions_batch(
+            [make_transaction(transaction_hash="dup"), make_transaction(transaction_hash="new")]
+        )
+
+        assert (added, skipped) == (1, 1)
+        assert database.get_transaction_count() == 2
+
+    def test_skips_duplicates_within_batch(self, database):
+        """Should skip repeated hashes inside the same batch."""
+        added, skipped = database.add_transactions_batch(
+            [make_transaction(transaction_hash="same"), make_transaction(transaction_hash="same")]
+        )
+
+        assert (added, skipped) == (1, 1)
+
+    def test_empty_batch(self, database):
+        """Should handle an empty batch without touching the database."""
+        assert database.add_transactions_batch([]) == (0, 0)
+
+    def test_round_trips_fields(self, database):
+        """Should store and read back all transaction fields."""
+        txn = make_transaction(tags=["food", "delivery"], category=TransactionCategory.FOOD_DINING)
+        database.add_transactions_batch([txn])
+
+        stored = database.get_transaction_by_id(txn.id)
+
+        assert stored == txn
+
+    def test_round_trips_tags_containing_commas(self, database):
+        """Should keep a tag containing a comma as a single tag."""
+        txn = make_transaction(tags=["food, drinks", "bar"])
+        database.add_transactions_batch([txn])
+
+        assert database.get_transaction_by_id(txn.id).tags == ["food, drinks", "bar"]
+        assert len(database.search_by_tags(["food, drinks"])) == 1
+
+
+class TestTransactionCount:
+    """Test the cached transaction count."""
+
+    def test_counts_existing_transactions(self, tmp_path):
+        """Should count transactions already in the database when first asked."""
+        path = tmp_path / "test.db"
+        first = Database(path)
+        first.add_transactions_batch([make_transaction(description=f"MERCHANT {i}") for i in range(3)])
+        first.close()
+
+        database = Database(path)
+
+        assert database.get_transaction_count() == 3
+        database.close()
+
+    def test_tracks_inserts_after_first_count(self, database):
+        """Should include only actually inserted transactions once the count is cached."""
+        assert database.get_transaction_count() == 0
+
+        database.add_transaction(make_transaction(transaction_hash="a"))
+        database.add_transaction(make_transaction(transaction_hash="a"))
+        database.add_transactions_batch(
+            [make_transaction(transaction_hash="a"), make_transaction(transaction_hash="b")]
+        )
+
+        assert database.get_transaction_count() == 2
+
+
+class TestGetTransactionsByIds:
+    """Test fetching transactions by ID."""
+
+    def test_returns_requested_transactions(self, database):
+        """Should return only the requested transactions, newest first."""
+        older = make_transaction("UBER TRIP", txn_date=date(2023, 1, 1))
+        newer = make_transaction("LYFT RIDE", txn_date=date(2024, 1, 1))
+        database.add_transactions_batch([older, newer, make_transaction("OTHER")])
+
+        results = database.get_transactions_by_ids([str(older.id), str(newer.id), "missing"])
+
+        assert [t.id for t in results] == [newer.id, older.id]
+
+    def test_filters_by_description(self, database):
+        """Should drop transactions whose description lacks the term, ignoring case."""
+        uber = make_transaction("UBER TRIP")
+        lyft = make_transaction("LYFT RIDE")
+        database.add_transactions_batch([uber, lyft])
+
+        results = database.get_transactions_by_ids([str(uber.id), str(lyft.id)], description_contains="uber")
+
+        assert [t.id for t in results] == [uber.id]
+
+    def test_handles_more_ids_than_parameter_limit(self, database):
+        """Should accept more IDs than SQLite allows bound parameters."""
+        txn = make_transaction()
+        database.add_transactions_batch([txn])
+
+        ids = [str(txn.id)] + [f"missing-{i}" for i in range(40_000)]
+
+        assert len(database.get_transactions_by_ids(ids)) == 1
+
+
+class TestUploadedFiles:
+    """Test uploaded file records."""
+
+    def test_ignores_duplicate_file_hash(self, database):
+        """Should record a file hash only once."""
+        uploaded = UploadedFile(
+            filename="statement.pdf",
+            file_hash="abc",
+            source=TransactionSource.CHASE_CREDIT,
+            transaction_count=3,
+            uploaded_at="2024-01-15T00:00:00",
+        )
+
+        assert database.add_uploaded_file(uploaded) is True
+        assert database.add_uploaded_file(uploaded.model_copy(update={"filename": "copy.pdf"})) is False
+        assert database.file_exists("abc")
+        assert [f.filename for f in database.get_uploaded_files()] == ["statement.pdf"]
+
+    def test_file_exists_for_unknown_hash(self, database):
+        """Should report unknown hashes as missing."""
+        assert database.file_exists("missing") is False
+
+
+class TestDatabaseInit:
+    """Test database bootstrap settings."""
+
+    def test_enables_wal_journal(self, database):
+        """Should switch the database to WAL journal mode."""
+        with database._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_records_schema_version(self, database):
+        """Should stamp the schema version so migrations are skipped on later starts."""
+        from backend.db.sqlite import SCHEMA_VERSION
+
+        with database._get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def test_migrates_database_without_tags_column(self, tmp_path):
+        """Should add the tags column to databases created before tagging existed."""
+        import sqlite3
+
+        path = tmp_path / "old.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            """
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, source TEXT NOT NULL, source_file_hash TEXT NOT NULL,
+                transaction_hash TEXT NOT NULL UNIQUE, date TEXT NOT NULL, description TEXT NOT NULL,
+                amount REAL NOT NULL, category TEXT, raw_category TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        database = Database(path)
+        txn = make_transaction(tags=["coffee"])
+        database.add_transactions_batch([txn])
+
+        assert database.get_transaction_by_id(txn.id).tags == ["coffee"]
+        database.close()
+
+
+class TestSearchTransactions:
+    """Test full-text search over descriptions and tags."""
+
+    def test_matches_substring_case_insensitive(self, database):
+        """Should match the term anywhere in the description, ignoring case."""
+        database.add_transactions_batch(
+            [make_transaction("UBER *TRIP HELP.UBER.COM"), make_transaction("SQ *SWEETGREEN")]
+        )
+
+        results = database.search_transactions("uber")
+
+        assert [t.description for t in results] == ["UBER *TRIP HELP.UBER.COM"]
+
+    def test_matches_tags(self, database):
+        """Should match terms found only in tags."""
+        database.add_transactions_batch([make_transaction("ACME CORP", tags=["rideshare"])])
+
+        assert len(database.search_transactions("ridesh")) == 1
+
+    def test_short_term_falls_back_to_scan(self, database):
+        """Should still find terms shorter than the trigram length."""
+        database.add_transactions_batch([make_transaction("BP GAS 1234"), make_transaction("SHELL OIL")])
+
+        results = database.search_transactions("bp")
+
+        assert [t.description for t in results] == ["BP GAS 1234"]
+
+    def test_reflects_tag_updates(self, database):
+        """Should search the latest tags after an update."""
+        txn = make_transaction("ACME CORP")
+        database.add_transactions_batch([txn])
+
+        database.update_transaction_tags(txn.id, ["coffee"])
+
+        assert len(database.search_transactions("coffee")) == 1
+
+    def test_orders_by_date_descending(self, database):
+        """Should return the newest matches first."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", txn_date=date(2023, 5, 1)),
+                make_transaction("UBER TRIP", txn_date=date(2024, 5, 1)),
+            ]
+        )
+
+        results = database.search_transactions("uber")
+
+        assert [t.date.year for t in results] == [2024, 2023]
+
+    def test_filters_by_category(self, database):
+        """Should only return matches in the requested category."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", category=TransactionCategory.TRANSPORTATION),
+                make_transaction("UBER EATS", category=TransactionCategory.FOOD_DINING),
+                make_transaction("BP GAS", category=TransactionCategory.TRANSPORTATION),
+            ]
+        )
+
+        results = database.search_transactions("uber", category=TransactionCategory.TRANSPORTATION)
+
+        assert [t.description for t in results] == ["UBER TRIP"]
+        assert len(database.search_transactions("bp", category=TransactionCategory.FOOD_DINING)) == 0
+
+
+class TestSearchTransactionsAny:
+    """Test searching for several terms at once."""
+
+    def test_matches_any_term_once(self, database):
+        """Should return each transaction matching any term exactly once, newest first."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", txn_date=date(2024, 1, 1)),
+                make_transaction("LYFT RIDE", txn_date=date(2024, 2, 1)),
+                make_transaction("UBER LYFT PROMO", txn_date=date(2024, 3, 1)),
+                make_transaction("BP GAS", txn_date=date(2024, 4, 1)),
+                make_transaction("SHELL OIL", txn_date=date(2024, 5, 1)),
+            ]
+        )
+
+        results = database.search_transactions_any(["uber", "lyft", "bp"])
+
+        assert [t.description for t in results] == ["BP GAS", "UBER LYFT PROMO", "LYFT RIDE", "UBER TRIP"]
+
+    def test_no_terms(self, database):
+        """Should return nothing when no terms are given."""
+        database.add_transactions_batch([make_transaction("UBER TRIP")])
+
+        assert database.search_transactions_any([]) == []
+
+
+class TestIterSearchTransactions:
+    """Test paged search iteration."""
+
+    def test_yields_all_matches_across_pages(self, database):
+        """Should yield every match once, newest first, regardless of page size."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", txn_date=date(2024, 1, 1 + i % 3), transaction_hash=str(i))
+                for i in range(7)
+            ]
+            + [make_transaction("LYFT RIDE")]
+        )
+
+        results = list(database.iter_search_transactions("uber", page_size=2))
+
+        assert len(results) == 7
+        assert len({t.id for t in results}) == 7
+        assert [t.date for t in results] == sorted((t.date for t in results), reverse=True)
+
+
+class TestSearchByTags:
+    """Test tag lookups through the tag table."""
+
+    def test_matches_exact_tags(self, database):
+        """Should return transactions having any of the tags."""
+        database.add_transactions_batch(
+            [
+                make_transaction("DELTA AIR", tags=["travel", "airline"]),
+                make_transaction("HAIR SALON", tags=["hair", "beauty"]),
+                make_transaction("UBER", tags=["rideshare"]),
+            ]
+        )
+
+        results = database.search_by_tags(["airline", "rideshare"])
+
+        assert sorted(t.description for t in results) == ["DELTA AIR", "UBER"]
+
+    def test_replaces_tags_on_update(self, database):
+        """Should drop old tags when a transaction is retagged."""
+        txn = make_transaction("ACME CORP", tags=["old"])
+        database.add_transactions_batch([txn])
+
+        database.update_transaction_tags(txn.id, ["new"])
+
+        assert database.search_by_tags(["old"]) == []
+        assert len(database.search_by_tags(["new"])) == 1
+
+    def test_replaces_tags_in_batch(self, database):
+        """Should rewrite the tags of every transaction in the batch."""
+        first = make_transaction("ACME CORP", tags=["old"])
+        second = make_transaction("OTHER CORP")
+        database.add_transactions_batch([first, second])
+
+        first.tags = ["new"]
+        second.tags = ["new", "other"]
+        database.update_tags_batch([first, second])
+
+        assert database.search_by_tags(["old"]) == []
+        assert len(database.search_by_tags(["new"])) == 2
+        assert database.get_transaction_by_id(second.id).tags == ["new", "other"]
+
+    def test_backfills_existing_database(self, tmp_path):
+        """Should index transactions written before the search tables existed."""
+        import sqlite3
+
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            """
+            CREATE TABLE transactions (
+                id TEXT PRIMARY KEY, source TEXT NOT NULL, source_file_hash TEXT NOT NULL,
+                transaction_hash TEXT NOT NULL UNIQUE, date TEXT NOT NULL, description TEXT NOT NULL,
+                amount REAL NOT NULL, category TEXT, raw_category TEXT, tags TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        txn = make_transaction("LEGACY UBER")
+        conn.execute(
+            "INSERT INTO transactions (id, source, source_file_hash, transaction_hash, date, description, amount, category, raw_category, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*Database._transaction_to_row(txn)[:-1], "rideshare,travel"),
+        )
+        conn.commit()
+        conn.close()
+
+        database = Database(path)
+
+        assert len(database.search_transactions("uber")) == 1
+        assert len(database.search_by_tags(["rideshare"])) == 1
+        assert database.get_transaction_by_id(txn.id).tags == ["rideshare", "travel"]
+        database.close()
+
+
+class TestSpendingSummary:
+    """Test spending totals by category."""
+
+    def test_sums_spending_by_category(self, database):
+        """Should total absolute spending per category, ignoring income."""
+        database.add_transactions_batch(
+            [
+                make_transaction("A", amount=-10.0, category=TransactionCategory.SHOPPING),
+                make_transaction("B", amount=-5.5, category=TransactionCategory.SHOPPING),
+                make_transaction("C", amount=-3.0, category=None),
+                make_transaction("D", amount=100.0, category=TransactionCategory.INCOME),
+            ]
+        )
+
+        assert database.get_spending_summary() == {"Shopping": 15.5, "Uncategorized": 3.0}
+
+    def test_reflects_category_batch_update(self, database):
+        """Should total spending under categories written in a batch."""
+        txn = make_transaction("A", amount=-10.0, category=None)
+        database.add_transactions_batch([txn])
+
+        txn.category = TransactionCategory.SUBSCRIPTIONS
+        database.update_categories_batch([txn])
+
+        assert database.get_spending_summary() == {"Subscriptions": 10.0}
+
+    def test_filters_by_date(self, database):
+        """Should only include spending inside the date range."""
+        database.add_transactions_batch(
+            [
+                make_transaction("A", amount=-10.0, txn_date=date(2023, 6, 1)),
+                make_transaction("B", amount=-20.0, txn_date=date(2024, 6, 1)),
+            ]
+        )
+
+        assert database.get_spending_summary(start_date=date(2024, 1, 1)) == {"Shopping": 20.0}
+
+
+class TestYearlySpendingByDescription:
+    """Test per-year spending for a description search."""
+
+    def test_groups_matching_spending_by_year(self, database):
+        """Should count matches per year and total only their negative amounts."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", amount=-20.0, txn_date=date(2023, 3, 1)),
+                make_transaction("UBER TRIP", amount=-5.0, txn_date=date(2024, 3, 1)),
+                make_transaction("UBER REFUND", amount=7.0, txn_date=date(2024, 4, 1)),
+                make_transaction("LYFT RIDE", amount=-9.0, txn_date=date(2024, 5, 1)),
+                make_transaction("ACME", amount=-1.0, txn_date=date(2024, 6, 1), tags=["uber"]),
+            ]
+        )
+
+        assert database.get_yearly_spending_by_description("uber") == [(2023, 1, 20.0), (2024, 2, 5.0)]
+
+    def test_short_term_falls_back_to_scan(self, database):
+        """Should still group terms shorter than the trigram length."""
+        database.add_transactions_batch([make_transaction("BP GAS", amount=-30.0)])
+
+        assert database.get_yearly_spending_by_description("bp") == [(2024, 1, 30.0)]
+
+
+class TestDescriptionSamples:
+    """Test head and tail samples for a description search."""
+
+    def test_returns_newest_and_oldest_matches(self, database):
+        """Should return the newest and oldest matches, each newest first."""
+        database.add_transactions_batch(
+            [make_transaction("UBER TRIP", txn_date=date(2024, 1, day)) for day in range(1, 8)]
+            + [make_transaction("LYFT RIDE", txn_date=date(2024, 1, 31))]
+        )
+
+        newest, oldest = database.get_description_samples("uber", n=2)
+
+        assert [t.date.day for t in newest] == [7, 6]
+        assert [t.date.day for t in oldest] == [2, 1]
+
+
+class TestCategoryCountsByDescription:
+    """Test per-category counts for a description search."""
+
+    def test_counts_matches_by_category(self, database):
+        """Should count description matches per category, labelling missing categories."""
+        database.add_transactions_batch(
+            [
+                make_transaction("UBER TRIP", transaction_hash="1", category=TransactionCategory.TRANSPORTATION),
+                make_transaction("UBER TRIP", transaction_hash="2", category=TransactionCategory.TRANSPORTATION),
+                make_transaction("UBER EATS", category=TransactionCategory.FOOD_DINING),
+                make_transaction("UBER ONE", category=None),
+                make_transaction("ACME", tags=["uber"]),
+            ]
+        )
+
+        assert database.get_category_counts_by_description("uber") == {
+            "Food & Dining": 1,
+            "Transportation": 2,
+            "Uncategorized": 1,
+        }
+
+
+class TestDashboardAggregates:
+    """Test the dashboard aggregation queries."""
+
+    @pytest.fixture
+    def populated(self, database):
+        """Add spending and income across two years."""
+        database.add_transactions_batch(
+            [
+                make_transaction("A", amount=-10.0, txn_date=date(2023, 12, 31), category=TransactionCategory.SHOPPING),
+                make_transaction("B", amount=-20.0, txn_date=date(2024, 1, 5), category=TransactionCategory.SHOPPING),
+                make_transaction("C", amount=-5.0, txn_date=date(2024, 1, 5), category=None),
+                make_transaction("D", amount=100.0, txn_date=date(2024, 2, 1), category=TransactionCategory.INCOME),
+            ]
+        )
+        return database
+
+    def test_overview_stats(self, populated):
+        """Should total spending and income and report the covered dates."""
+        stats = populated.get_overview_stats(start_date=date(2024, 1, 1), end_date=date(2024, 12, 31))
+
+        assert stats == (3, 25.0, 100.0, "2024-01-05", "2024-02-01", 3, 1)
+
+    def test_overview_stats_without_transactions(self, database):
+        """Should report a zero count when nothing matches."""
+        assert database.get_overview_stats()[0] == 0
+
+    def test_monthly_totals(self, populated):
+        """Should total each month, oldest first."""
+        assert populated.get_monthly_totals(start_date=date(2024, 1, 1)) == [
+            ("2024-01", 25.0, 0.0, 2),
+            ("2024-02", 0.0, 100.0, 1),
+        ]
+
+    def test_monthly_spending_by_category(self, populated):
+        """Should only include spending, grouped by month and category."""
+        assert sorted(populated.get_monthly_spending_by_category()) == [
+            ("2023-12", "Shopping", 10.0),
+            ("2024-01", "Shopping", 20.0),
+            ("2024-01", "Uncategorized", 5.0),
+        ]
+
+    def test_yearly_totals(self, populated):
+        """Should total each year, newest first."""
+        assert populated.get_yearly_totals() == [(2024, 25.0, 100.0, 3), (2023, 10.0, 0.0, 1)]
+
+    def test_spending_by_source(self, populated):
+        """Should total spending per source."""
+        assert populated.get_spending_by_source() == [("chase_credit", 35.0, 3)]
+
+    def test_daily_spending(self, populated):
+        """Should total spending per day in the range."""
+        assert populated.get_daily_spending(start_date=date(2024, 1, 1)) == {"2024-01-05": 25.0}
+
+    def test_spending_by_description(self, populated):
+        """Should total spending per distinct description."""
+        populated.add_transactions_batch([make_transaction("B", amount=-2.5, txn_date=date(2024, 3, 1))])
+
+        assert sorted(populated.get_spending_by_description(start_date=date(2024, 1, 1))) == [
+            ("B", 22.5, 2),
+            ("C", 5.0, 1),
+        ]
@@ -7,7 +7,9 @@ import pytest
 from backend.parsers.validation import (
     ParseResult,
     ValidationError,
+    build_date,
     clean_amount_string,
+    expand_two_digit_year,
     is_likely_payment,
     normalize_description,
     parse_amount_safe,
@@ -113,6 +115,31 @@ class TestValidateDate:
         assert validate_date(date(2101, 1, 1)) is False
 
 
+class TestBuildDate:
+    """Test building dates from numeric parts."""
+
+    def test_builds_valid_date(self):
+        """Should return the date for valid parts."""
+        assert build_date(2024, 2, 29) == date(2024, 2, 29)
+
+    def test_rejects_impossible_date(self):
+        """Should return None instead of raising for impossible dates."""
+        assert build_date(2023, 2, 29) is None
+        assert build_date(2024, 13, 1) is None
+        assert build_date(2024, 0, 1) is None
+
+
+class TestExpandTwoDigitYear:
+    """Test two-digit year expansion."""
+
+    def test_matches_strptime_pivot(self):
+        """Should map 00-68 to the 2000s and 69-99 to the 1900s."""
+        assert expand_two_digit_year(24) == 2024
+        assert expand_two_digit_year(68) == 2068
+        assert expand_two_digit_year(69) == 1969
+        assert expand_two_digit_year(99) == 1999
+
+
 class TestValidateDescription:
     """Test description validation."""
 
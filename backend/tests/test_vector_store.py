@@ -0,0 +1,128 @@
+"""Tests for vector store embedding batching and caching."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from backend.db import vector
+from backend.db.sqlite import Database
+from backend.db.vector import VectorStore
+from backend.models import Transaction, TransactionSource
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a vector store with a temporary embedding cache and a fake embedder."""
+    database = Database(tmp_path / "test.db")
+    # Skip __init__ so no ChromaDB client is created
+    vector_store = VectorStore.__new__(VectorStore)
+    vector_store.requests = []
+
+    async def fake_embed_texts(texts: list[str]) -> np.ndarray:
+        vector_store.requests.append(list(texts))
+        return np.asarray([[float(len(text)), 0.5] for text in texts], dtype=np.float32)
+
+    vector_store._embed_texts = fake_embed_texts
+    with patch.object(vector, "db", database):
+        yield vector_store
+    database.close()
+
+
+def make_transaction(description: str) -> Transaction:
+    """Helper to create a test transaction."""
+    return Transaction(
+        source=TransactionSource.AMEX,
+        source_file_hash="file-hash",
+        transaction_hash=f"hash-{description}",
+        date=date(2024, 1, 15),
+        description=description,
+        amount=-10.0,
+    )
+
+
+class TestGetEmbeddingsBatch:
+    """Test batched embedding generation."""
+
+    async def test_returns_embeddings_in_input_order(self, store):
+        """Should return one embedding per text, in order."""
+        embeddings = await store._get_embeddings_batch(["a", "bbb", "cc"])
+
+        assert [e.tolist() for e in embeddings] == [[1.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+
+    async def test_returns_float32_vectors(self, store):
+        """Should return each embedding as a float32 array."""
+        embeddings = await store._get_embeddings_batch(["a", "bb"])
+
+        assert all(e.dtype == np.float32 and e.shape == (2,) for e in embeddings)
+
+    async def test_splits_large_batches_into_chunks(self, store):
+        """Should send at most EMBEDDING_BATCH_SIZE texts per request."""
+        texts = [f"text {i}" for i in range(vector.EMBEDDING_BATCH_SIZE * 2 + 1)]
+
+        embeddings = await store._get_embeddings_batch(texts)
+
+        assert len(embeddings) == len(texts)
+        assert [len(r) for r in store.requests] == [vector.EMBEDDING_BATCH_SIZE, vector.EMBEDDING_BATCH_SIZE, 1]
+
+    async def test_embeds_duplicate_texts_once(self, store):
+        """Should only request each distinct text once per batch."""
+        await store._get_embeddings_batch(["STARBUCKS", "STARBUCKS", "UBER"])
+
+        assert store.requests == [["STARBUCKS", "UBER"]]
+
+    async def test_reuses_cached_embeddings(self, store):
+        """Should not re-embed texts that are already cached."""
+        await store._get_embeddings_batch(["STARBUCKS"])
+
+        embeddings = await store._get_embeddings_batch(["STARBUCKS", "UBER"])
+
+        assert store.requests == [["STARBUCKS"], ["UBER"]]
+        assert [e.tolist() for e in embeddings] == [[9.0, 0.5], [4.0, 0.5]]
+
+    async def test_returns_none_on_embedding_failure(self, store):
+        """Should return None entries if the embedding API fails."""
+
+        async def failing_embed(texts: list[str]) -> np.ndarray:
+            raise RuntimeError("connection refused")
+
+        store._embed_texts = failing_embed
+
+        assert await store._get_embeddings_batch(["UBER"]) == [None]
+
+    async def test_keeps_successful_chunks_when_one_fails(self, store):
+        """Should return embeddings for chunks that succeeded and None for the failed chunk."""
+        original_embed = store._embed_texts
+
+        async def flaky_embed(texts: list[str]) -> np.ndarray:
+            if "bad" in texts:
+                raise RuntimeError("timeout")
+            return await original_embed(texts)
+
+        store._embed_texts = flaky_embed
+        texts = [f"text {i}" for i in range(vector.EMBEDDING_BATCH_SIZE)] + ["bad"]
+
+        embeddings = await store._get_embeddings_batch(texts)
+
+        assert all(e is not None for e in embeddings[:-1])
+        assert embeddings[-1] is None
+
+
+class TestAddTransactionsBatch:
+    """Test storing transactions in the collection."""
+
+    async def test_stores_only_embedded_transactions(self, store):
+        """Should upsert the transactions that were embedded and report how many."""
+        store._collection = MagicMock()
+        good, bad = make_transaction("GOOD"), make_transaction("BAD")
+
+        async def partial_embeddings(texts: list[str]) -> list[np.ndarray | None]:
+            return [np.zeros(2, dtype=np.float32) if text.startswith("GOOD") else None for text in texts]
+
+        store._get_embeddings_batch = partial_embeddings
+
+        stored = await store.add_transactions_batch([good, bad])
+
+        assert stored == 1
+        assert store._collection.upsert.call_args.kwargs["ids"] == [str(good.id)]